@@ -0,0 +1,277 @@
+# path: admission.py
+"""
+요청 수용 제어(admission control) / 우선순위별 부하 차단(load shedding).
+
+과부하 때 모든 라우트가 같은 스레드풀 앞에 똑같이 줄을 서면, 비싼 요청
+(/token, /users/ 의 argon2 ~200ms) 이 몰릴 때 /health 나 피드 같은 싼 읽기까지 같이 느려진다.
+이 미들웨어는 라우트를 클래스로 나눠서 클래스마다 동시 처리 수와 대기열을 따로 둔다.
+
+1) 라우트 클래스 (우선순위 높은 순)
+   - health : /health*, /metrics → 항상 통과 (제한 / 대기 없음)
+   - read   : GET / HEAD / OPTIONS
+   - write  : 그 밖의 쓰기 (게시글 / 댓글 / 프로필 ...)
+   - auth   : POST /token, POST /users/ (argon2)
+   우선순위는 한도로 표현한다. 비싼 auth 는 동시 처리를 작게 잡아서
+   몰려도 CPU / 스레드풀을 다 차지하지 못하고, 먼저 차단된다.
+
+2) 수용 / 차단
+   - 동시 처리 한도 미만이면 바로 처리
+   - 아니면 대기열에 들어가서 자리가 나면 순서대로 (끝난 요청이 다음 대기자에게 자리를 넘긴다)
+   - 바로 503 + Retry-After 로 돌려보내는 경우
+     - queue_full : 대기열이 꽉 참
+     - estimate   : 예상 대기 시간 (앞선 대기자 수 x 평균 처리 시간 / 한도) 이 마감을 넘음
+                    → 마감까지 기다렸다가 실패하지 않고 들어오자마자 돌려보낸다
+     - deadline   : 대기열에서 마감(초)까지 자리가 나지 않음
+   - 처리 시간 평균은 클래스별 지수 이동 평균 (EWMA_ALPHA)
+
+3) 지표 (GET /metrics, metrics.registry 수집기)
+   admission_in_flight / admission_queue_depth (gauge),
+   admission_admitted_total / admission_shed_total{reason} / admission_queue_wait_seconds_total
+
+환경 변수:
+    ADMISSION_ENABLED=1
+    ADMISSION_LIMITS="read=16:128:1.0,write=8:32:2.0,auth=2:16:2.0"
+        (클래스=동시 처리:대기열 길이:대기 마감 초, 일부만 적으면 나머지는 기본값)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+
+import orjson
+
+import metrics
+
+ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+
+DEFAULT_LIMITS = "read=16:128:1.0,write=8:32:2.0,auth=2:16:2.0"
+
+# 처리 시간 이동 평균 가중치
+EWMA_ALPHA = 0.2
+
+HEALTH_PREFIXES = ("/health", "/metrics")
+AUTH_ROUTES = {("POST", "/token"), ("POST", "/users/")}
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+SHED_REASONS = ("queue_full", "estimate", "deadline")
+
+# (이름, 종류, 설명) — admission_shed_total 은 reason 라벨이 붙어서 따로 쓴다
+_METRICS = [
+    ("admission_in_flight", "gauge", "처리 중 요청"),
+    ("admission_queue_depth", "gauge", "대기열 길이"),
+    ("admission_admitted_total", "counter", "수용한 요청"),
+    ("admission_queue_wait_seconds_total", "counter", "대기열에서 기다린 시간"),
+]
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """요청 → 라우트 클래스. 항상 통과(health)면 None"""
+    if path.startswith(HEALTH_PREFIXES):
+        return None
+    if (method, path) in AUTH_ROUTES:
+        return "auth"
+    if method in READ_METHODS:
+        return "read"
+    return "write"
+
+
+@dataclass(frozen=True)
+class ClassLimit:
+    concurrency: int
+    queue: int
+    deadline: float  # 초
+
+
+def parse_limits(spec: str) -> Dict[str, ClassLimit]:
+    limits = {}
+    for part in f"{DEFAULT_LIMITS},{spec}".split(","):
+        if not part.strip():
+            continue
+        name, _, values = part.partition("=")
+        concurrency, queue, deadline = values.split(":")
+        limits[name.strip()] = ClassLimit(int(concurrency), int(queue), float(deadline))
+    return limits
+
+
+# ============================================================
+# 클래스별 제한기
+# ============================================================
+
+
+class Shed(Exception):
+    def __init__(self, reason: str, retry_after: int) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RouteClassLimiter:
+    """
+    이벤트 루프 안에서만 쓴다 (락 없음).
+    자리를 받은 요청은 반드시 release() 를 불러야 한다.
+    """
+
+    def __init__(self, name: str, limit: ClassLimit) -> None:
+        self.name = name
+        self.limit = limit
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.service_seconds = 0.0  # EWMA
+        self.admitted = 0
+        self.shed: Dict[str, int] = {reason: 0 for reason in SHED_REASONS}
+        self.queue_wait_seconds = 0.0
+
+    def estimated_wait(self) -> float:
+        return (len(self.waiters) + 1) * self.service_seconds / self.limit.concurrency
+
+    def _shed(self, reason: str) -> Shed:
+        self.shed[reason] += 1
+        wait = self.estimated_wait() or self.limit.deadline
+        return Shed(reason, max(1, math.ceil(wait)))
+
+    async def acquire(self) -> None:
+        """자리를 받을 때까지 기다린다. 차단이면 Shed"""
+        if self.in_flight < self.limit.concurrency and not self.waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if len(self.waiters) >= self.limit.queue:
+            raise self._shed("queue_full")
+        if self.estimated_wait() > self.limit.deadline:
+            raise self._shed("estimate")
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(future, self.limit.deadline)
+        except asyncio.TimeoutError:
+            raise self._shed("deadline") from None
+        except asyncio.CancelledError:
+            # 자리를 넘겨받은 직후 취소(클라이언트 끊김)됐으면 자리를 돌려준다
+            if future.done() and not future.cancelled():
+                self.release(0.0)
+            raise
+        finally:
+            self.queue_wait_seconds += time.perf_counter() - started
+            if not future.done() or future.cancelled():
+                try:
+                    self.waiters.remove(future)
+                except ValueError:
+                    pass
+        self.admitted += 1
+
+    def release(self, service_seconds: float) -> None:
+        if service_seconds:
+            self.service_seconds += EWMA_ALPHA * (
+                service_seconds - self.service_seconds
+            )
+        # 자리를 줄이지 않고 다음 대기자에게 바로 넘긴다
+        while self.waiters:
+            future = self.waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+
+class AdmissionController:
+    def __init__(self, spec: Optional[str] = None) -> None:
+        self.limiters = {
+            name: RouteClassLimiter(name, limit)
+            for name, limit in parse_limits(
+                spec or os.getenv("ADMISSION_LIMITS", "")
+            ).items()
+        }
+
+    def render_metrics(self) -> List[str]:
+        """Prometheus 텍스트 줄 (metrics.registry 수집기)"""
+        values = {
+            name: {
+                "admission_in_flight": limiter.in_flight,
+                "admission_queue_depth": len(limiter.waiters),
+                "admission_admitted_total": limiter.admitted,
+                "admission_queue_wait_seconds_total": limiter.queue_wait_seconds,
+            }
+            for name, limiter in sorted(self.limiters.items())
+        }
+        lines = []
+        for metric, kind, help_text in _METRICS:
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+            for name, row in values.items():
+                lines.append(f'{metric}{{class="{name}"}} {row[metric]}')
+        lines += [
+            "# HELP admission_shed_total 차단(503)한 요청",
+            "# TYPE admission_shed_total counter",
+        ]
+        for name, limiter in sorted(self.limiters.items()):
+            for reason, count in limiter.shed.items():
+                labels = f'class="{name}",reason="{reason}"'
+                lines.append(f"admission_shed_total{{{labels}}} {count}")
+        return lines
+
+
+controller = AdmissionController()
+metrics.registry.add_collector(lambda: controller.render_metrics())
+
+
+# ============================================================
+# ASGI 미들웨어
+# ============================================================
+
+
+class AdmissionMiddleware:
+    """metrics.MetricsMiddleware 안쪽에 둔다 (대기 시간 / 503 도 요청 지표에 잡히도록)"""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not ENABLED:
+            await self.app(scope, receive, send)
+            return
+        route_class = classify(scope["method"], scope["path"])
+        limiter = controller.limiters.get(route_class) if route_class else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except Shed as shed:
+            await _send_shed(send, route_class, shed)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - started)
+
+
+async def _send_shed(send, route_class: str, shed: Shed) -> None:
+    body = orjson.dumps(
+        {
+            "detail": "요청이 많아 잠시 후 다시 시도해 주세요.",
+            "class": route_class,
+            "reason": shed.reason,
+        }
+    )
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(shed.retry_after).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
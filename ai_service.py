@@ -1,13 +1,132 @@
 # ai_service.py
+import importlib
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Protocol, Sequence
 
+import moderation
+import tracing
+from verdict_cache import VerdictCache
+
+# "keyword"(기본, 로컬 CPU) 또는 "패키지.모듈:클래스" 경로
+CLASSIFIER_SPEC = os.getenv("MODERATION_CLASSIFIER", "keyword")
+
+# 정규화 내용 해시 기반 판정 캐시 / MinHash LSH 근사 중복 인덱스 사용 여부
+VERDICT_CACHE_ENABLED = os.getenv("MODERATION_VERDICT_CACHE", "1") == "1"
+NEAR_DUPLICATE_ENABLED = os.getenv("MODERATION_NEAR_DUPLICATES", "0") == "1"
+
+
+@tracing.traced("moderation")
 def check_text_safety(content: str):
     """
-    (임시) 텍스트 유해성을 검사합니다.
+    텍스트 유해성을 검사합니다.
+    기본 분류기(판정 캐시 포함)로 한 건만 분류합니다.
     """
-    forbidden_words = ["바보", "멍청이"]
-    
-    for word in forbidden_words:
-        if word in content:
-            return False, f"부적절한 단어('{word}')가 포함되어 있습니다."
-            
-    return True, "안전한 콘텐츠입니다."
\ No newline at end of file
+    verdict = get_default_classifier().classify_batch([content])[0]
+    if not verdict.is_safe:
+        return False, f"부적절한 단어('{verdict.reason}')가 포함되어 있습니다."
+
+    return True, "안전한 콘텐츠입니다."
+
+
+# ============================================================
+# 게시글 심사용 분류기 (moderation_worker 가 배치 단위로 호출)
+# ============================================================
+
+
+@dataclass(frozen=True)
+class Verdict:
+    is_safe: bool
+    label: str  # 'safe' 또는 위반 분류
+    reason: Optional[str] = None
+
+
+class TextClassifier(Protocol):
+    name: str
+
+    def classify_batch(self, texts: Sequence[str]) -> List[Verdict]:
+        """texts 와 같은 순서/길이의 판정 목록"""
+        ...
+
+
+class KeywordClassifier:
+    """
+    로컬 CPU 분류기 (금칙어 사전). 외부 모델 없이 개발/테스트에 쓴다.
+    실제 모델 분류기도 같은 classify_batch 인터페이스만 맞추면 된다.
+    """
+
+    name = "keyword"
+
+    @tracing.traced("moderation.classify")
+    def classify_batch(self, texts: Sequence[str]) -> List[Verdict]:
+        verdicts = []
+        for text in texts:
+            matches = moderation.scan(text)
+            if matches:
+                verdicts.append(Verdict(False, matches[0].category, matches[0].term))
+            else:
+                verdicts.append(Verdict(True, "safe"))
+        return verdicts
+
+
+class CachedClassifier:
+    """
+    판정 캐시를 앞에 둔 분류기.
+    캐시에 없는 글만 (배치 안 중복은 한 번만) 안쪽 분류기로 보낸다.
+    """
+
+    def __init__(self, inner: TextClassifier, cache: VerdictCache) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.name = f"{inner.name}+cache"
+        # 마지막 classify_batch 에서 실제로 안쪽 분류기에 보낸 건수
+        self.last_classified = 0
+
+    @tracing.traced("moderation.classify")
+    def classify_batch(self, texts: Sequence[str]) -> List[Verdict]:
+        self.cache.check_version()
+        found = [self.cache.lookup(text) for text in texts]
+        verdicts: List[Optional[Verdict]] = [verdict for verdict, _ in found]
+
+        misses: Dict[bytes, List[int]] = {}
+        for i, (verdict, fingerprint) in enumerate(found):
+            if verdict is None:
+                misses.setdefault(fingerprint[0], []).append(i)
+        if misses:
+            positions = list(misses.values())
+            results = self.inner.classify_batch([texts[p[0]] for p in positions])
+            for same_text, verdict in zip(positions, results):
+                for i in same_text:
+                    self.cache.put(found[i][1], verdict)
+                    verdicts[i] = verdict
+
+        self.last_classified = len(misses)
+        return verdicts
+
+
+def load_classifier(spec: Optional[str] = None) -> TextClassifier:
+    spec = spec or CLASSIFIER_SPEC
+    if spec == "keyword":
+        classifier: TextClassifier = KeywordClassifier()
+    else:
+        module_name, _, class_name = spec.partition(":")
+        classifier = getattr(importlib.import_module(module_name), class_name)()
+
+    if VERDICT_CACHE_ENABLED:
+        # 금칙어 분류기의 판정은 사전에 달려 있으므로 사전이 바뀌면 캐시를 비운다
+        cache = VerdictCache(
+            near_duplicates=NEAR_DUPLICATE_ENABLED,
+            version=moderation.dictionary_version if spec == "keyword" else None,
+        )
+        classifier = CachedClassifier(classifier, cache)
+    return classifier
+
+
+_default_classifier: Optional[TextClassifier] = None
+
+
+def get_default_classifier() -> TextClassifier:
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = load_classifier()
+    return _default_classifier
@@ -0,0 +1,76 @@
+# path: backfill_communities.py
+"""
+기존 학교 앵커 → 커뮤니티 자동 배정 백필 스크립트.
+
+- 역할:
+    user_school_anchors 전체를 id 범위 배치로 나눠서
+    crud.assign_communities_for_anchors 를 실행한다.
+    (배치당 INSERT ... SELECT 조인 1회씩, 유저별 루프 없음)
+
+- 없는 커뮤니티는 새로 만들고, community_members 에 등록한다.
+- ON CONFLICT DO NOTHING 기반이라 여러 번 실행해도 안전하다.
+- 배치마다 commit 하므로 중간에 끊겨도 다시 돌리면 이어서 채워진다.
+
+사용법:
+    python backfill_communities.py [--batch-size 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+import crud
+from database import SessionLocal
+from models import UserSchoolAnchor
+
+
+def backfill_communities(db: Session, batch_size: int = 5000) -> int:
+    """
+    앵커 id 범위를 batch_size 단위로 잘라 커뮤니티/멤버를 채운다.
+    반환값: 새로 추가된 community_members 행 수
+    """
+    min_id, max_id = db.query(
+        func.min(UserSchoolAnchor.id), func.max(UserSchoolAnchor.id)
+    ).one()
+    if min_id is None:
+        print("[backfill_communities] 처리할 앵커가 없습니다.")
+        return 0
+
+    total_added = 0
+    for start in range(min_id, max_id + 1, batch_size):
+        end = min(start + batch_size - 1, max_id)
+        added = crud.assign_communities_for_anchors(
+            db, anchor_id_from=start, anchor_id_to=end
+        )
+        db.commit()
+        total_added += added
+        print(f"[backfill_communities] 앵커 {start}~{end}: 멤버 {added}건 추가")
+
+    print(f"[backfill_communities] 완료: 멤버 총 {total_added}건 추가")
+    return total_added
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="학교 앵커 기반 커뮤니티 백필")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    db: Session | None = None
+    try:
+        db = SessionLocal()
+        backfill_communities(db, batch_size=args.batch_size)
+    except Exception as e:
+        if db is not None:
+            db.rollback()
+        print("[backfill_communities] 오류 발생:", repr(e))
+        raise
+    finally:
+        if db is not None:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
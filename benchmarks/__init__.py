@@ -0,0 +1,11 @@
+# path: benchmarks/__init__.py
+"""
+성능 측정 스크립트 모음.
+
+레포 루트에서 모듈로 실행한다. 예)
+    python -m benchmarks.bench_matches --users 1000000
+
+회귀 점검용 (결과 JSON 을 benchmarks/baselines/ 기준선과 비교, 회귀면 종료 코드 1):
+    python -m benchmarks.bench_workload    # 혼합 부하 (signup/login/search/post/feed)
+    python -m benchmarks.bench_micro       # crud / security / ai_service
+"""
@@ -0,0 +1,156 @@
+# path: benchmarks/bench_admission.py
+"""
+수용 제어(admission) 벤치마크: 로그인 폭주 중 읽기 지연.
+
+- bench_workload 와 같은 시드 ('benchwl') 를 깔고 ASGI 앱에 두 종류의 가상 사용자를 돌린다.
+  - 폭주 : --flood 명이 쉬지 않고 POST /token (argon2 검증)
+           503 을 받으면 --flood-backoff 초 뒤 다시 보낸다 (같은 프로세스라
+           바로 재시도하면 서버가 아니라 벤치마크 자신의 CPU 를 재게 된다)
+  - 읽기 : --readers 명이 --think 초 간격으로 GET /communities/{id}/posts?limit=50, GET /health
+- admission 꺼짐 / 켜짐 (--limits) 을 --seconds 초씩 번갈아 재서
+  읽기 / health 의 p50 / p99, 폭주 요청의 처리 수와 503 비율을 비교한다.
+
+사용법:
+    python -m benchmarks.bench_admission --flood 32 --readers 8 --seconds 10
+    python -m benchmarks.bench_admission --limits "auth=2:8:1.0" --output admission.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+import httpx
+
+import admission
+import main as app_main
+import metrics
+import security
+from benchmarks import bench_workload
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 2)
+
+
+class Run:
+    def __init__(self, args, community_ids: list[int]) -> None:
+        self.args = args
+        self.community_ids = community_ids
+        self.stop_at = 0.0
+        # 종류 → [(지연 ms, 상태 코드)]
+        self.samples: dict[str, list[tuple[float, int]]] = defaultdict(list)
+
+    async def timed(self, kind: str, client, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        elapsed = (time.perf_counter() - started) * 1000
+        self.samples[kind].append((elapsed, response.status_code))
+        return response
+
+    async def flooder(self, client, index: int) -> None:
+        rng = random.Random(self.args.seed * 1000 + index)
+        while time.perf_counter() < self.stop_at:
+            form = {
+                "username": f"benchwl_{rng.randrange(self.args.users)}",
+                "password": bench_workload.PASSWORD,
+            }
+            response = await self.timed("login", client, "POST", "/token", data=form)
+            if response.status_code == 503:
+                await asyncio.sleep(self.args.flood_backoff)
+
+    async def reader(self, client, index: int) -> None:
+        rng = random.Random(self.args.seed * 2000 + index)
+        token = security.create_access_token({"sub": f"benchwl_{index}"})
+        auth = {"Authorization": f"Bearer {token}"}
+        while time.perf_counter() < self.stop_at:
+            url = f"/communities/{rng.choice(self.community_ids)}/posts"
+            await self.timed(
+                "feed", client, "GET", url, params={"limit": 50}, headers=auth
+            )
+            await self.timed("health", client, "GET", "/health")
+            await asyncio.sleep(self.args.think)
+
+    async def run(self) -> None:
+        transport = httpx.ASGITransport(app=app_main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=120
+        ) as client:
+            self.stop_at = time.perf_counter() + self.args.seconds
+            await asyncio.gather(
+                *(self.flooder(client, i) for i in range(self.args.flood)),
+                *(self.reader(client, i) for i in range(self.args.readers)),
+            )
+
+    def summary(self) -> dict:
+        rows = {}
+        for kind, samples in sorted(self.samples.items()):
+            latencies = [ms for ms, status in samples if status != 503]
+            shed = sum(status == 503 for _, status in samples)
+            rows[kind] = {
+                "count": len(samples),
+                "served": len(latencies),
+                "shed_rate": round(shed / len(samples), 4),
+                "p50_ms": _percentile(latencies, 0.50),
+                "p99_ms": _percentile(latencies, 0.99),
+            }
+        return rows
+
+
+def measure(enabled: bool, args, community_ids: list[int]) -> dict:
+    admission.ENABLED = enabled
+    admission.controller = admission.AdmissionController(args.limits)
+    run = Run(args, community_ids)
+    asyncio.run(run.run())
+    return run.summary()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="로그인 폭주 중 읽기 지연")
+    parser.add_argument("--flood", type=int, default=32)
+    parser.add_argument("--flood-backoff", type=float, default=0.05)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--think", type=float, default=0.02)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--limits", default="", help="ADMISSION_LIMITS 형식")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--institutions", type=int, default=50)
+    parser.add_argument("--communities", type=int, default=10)
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="시드 데이터를 남긴다")
+    parser.add_argument("--output", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    # 느린 요청 로그는 끈다 (폭주 중 로그인 대부분이 찍힌다)
+    metrics.SLOW_REQUEST_MS = float("inf")
+    community_ids = bench_workload.seed(args)
+    summary = {}
+    try:
+        for label, enabled in (("off", False), ("on", True)):
+            summary[label] = measure(enabled, args, community_ids)
+            for kind, row in summary[label].items():
+                print(
+                    f"  admission {label:3s} {kind:6s} {row['count']:6d}건  "
+                    f"처리 {row['served']:6d}  503 {row['shed_rate']:6.1%}  "
+                    f"p50 {row['p50_ms']:8.1f}ms  p99 {row['p99_ms']:8.1f}ms"
+                )
+    finally:
+        if not args.keep:
+            bench_workload.drop()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "metrics": summary}, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
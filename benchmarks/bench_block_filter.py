@@ -0,0 +1,64 @@
+# path: benchmarks/bench_block_filter.py
+"""
+block_filter 페이지당 필터 비용 벤치마크.
+
+- DB 없이 측정한다. (캐시에 차단 목록을 직접 채워 넣음)
+- 페이지(게시글 --page 개)마다 작성자 id 를 차단 목록과 비교하는 비용을
+  np.isin(정렬 배열) / 파이썬 set 두 방식으로 비교한다.
+
+사용법:
+    python -m benchmarks.bench_block_filter --page 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from block_filter import BlockCache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="차단 필터 비용 벤치마크")
+    parser.add_argument("--page", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument(
+        "--blocked", type=int, nargs="+", default=[0, 10, 100, 1000, 10000]
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    posts = [
+        SimpleNamespace(author_user_id=int(a))
+        for a in rng.integers(1, 1_000_000, args.page)
+    ]
+
+    print(f"[bench_block_filter] page={args.page} pages={args.pages}")
+    for n_blocked in args.blocked:
+        blocked = np.unique(rng.integers(1, 1_000_000, n_blocked)).astype(np.int64)
+        cache = BlockCache()
+        cache._entries[1] = (time.monotonic(), None, blocked)
+        blocked_set = set(blocked.tolist())
+
+        started = time.perf_counter()
+        for _ in range(args.pages):
+            cache.filter(None, 1, posts, key=lambda p: p.author_user_id)
+        numpy_us = (time.perf_counter() - started) * 1e6 / args.pages
+
+        started = time.perf_counter()
+        for _ in range(args.pages):
+            [p for p in posts if p.author_user_id not in blocked_set]
+        set_us = (time.perf_counter() - started) * 1e6 / args.pages
+
+        print(
+            f"  차단 {n_blocked:>6}명: block_cache.filter {numpy_us:7.1f}us/page "
+            f"(python set {set_us:6.1f}us/page, "
+            f"캐시 {blocked.nbytes / 1024:.1f}KB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
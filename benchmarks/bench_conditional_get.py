@@ -0,0 +1,235 @@
+# path: benchmarks/bench_conditional_get.py
+"""
+조건부 GET(ETag) 벤치마크: 같은 트래픽 기록을 두 번 재생해서 비교한다.
+
+- 'benchcg_' 유저 --users 명 (키워드 10개, 앵커 3개), 'benchcg' 커뮤니티 하나(글 200개)
+- 트래픽 기록: 앱 시작/화면 전환을 흉내 낸 GET
+  (/users/me/bootstrap, /users/me/school-anchors, /users/me/keywords,
+   /communities/{id}/posts) 사이사이에 --write-ratio 비율로 쓰기
+  (키워드 weight 변경, 게시글 작성)
+- 재생 1: 항상 전체 응답 / 재생 2: URL 별로 마지막 ETag 를 If-None-Match 로 보냄
+- 응답 바이트, 요청당 CPU(time.process_time), SQL 문장 수, 304 비율을 출력한다.
+  재생은 httpx.AsyncClient + ASGITransport 로 한다
+  (TestClient 는 요청마다 스레드 포털을 열어서 그 비용이 CPU 차이를 가린다).
+
+사용법:
+    python -m benchmarks.bench_conditional_get --users 50 --events 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+import main as app_main
+from benchmarks.bench_write_statements import StatementCounter
+from database import engine
+
+GET_WEIGHTS = {
+    "/users/me/bootstrap": 2,
+    "/users/me/school-anchors": 2,
+    "/users/me/keywords": 2,
+    "posts": 5,
+}
+
+SEED_SQL = [
+    """
+    INSERT INTO institutions (external_source, external_id, name, institution_type)
+    SELECT 'benchcg', g::text, '벤치조건부학교' || g, 'school'
+    FROM generate_series(1, 3) g
+    """,
+    """
+    INSERT INTO communities (institution_id, school_level, entry_year, name)
+    SELECT min(id), 'high', 2006, 'benchcg'
+    FROM institutions WHERE external_source = 'benchcg'
+    """,
+]
+
+POSTS_SQL = """
+    INSERT INTO community_posts (community_id, author_user_id, content, status)
+    SELECT c.id, :author, repeat('벤치 조건부 GET 게시글 ', 8) || g, 'active'
+    FROM generate_series(1, 200) g
+    CROSS JOIN (SELECT id FROM communities WHERE name = 'benchcg') c
+"""
+
+DROP_SQL = [
+    "DELETE FROM community_posts WHERE community_id IN "
+    "(SELECT id FROM communities WHERE name = 'benchcg')",
+    "DELETE FROM users WHERE login_id LIKE 'benchcg\\_%'",
+    "DELETE FROM communities WHERE institution_id IN "
+    "(SELECT id FROM institutions WHERE external_source = 'benchcg')",
+    "DELETE FROM institutions WHERE external_source = 'benchcg'",
+]
+
+
+def seed(client: TestClient, users: int) -> tuple[list[dict], int]:
+    with engine.begin() as conn:
+        for sql in DROP_SQL + SEED_SQL:
+            conn.execute(text(sql))
+        institution_ids = list(
+            conn.execute(
+                text("SELECT id FROM institutions WHERE external_source = 'benchcg'")
+            ).scalars()
+        )
+        community_id = conn.execute(
+            text("SELECT id FROM communities WHERE name = 'benchcg'")
+        ).scalar_one()
+
+    headers = []
+    for i in range(users):
+        login_id = f"benchcg_{i}"
+        user = client.post(
+            "/users/",
+            json={
+                "login_id": login_id,
+                "password": "pw",
+                "real_name": "벤치",
+                "nickname": login_id,
+                "birth_year": 1990,
+            },
+        ).json()
+        token = client.post(
+            "/token", data={"username": login_id, "password": "pw"}
+        ).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+        client.post(
+            "/users/me/keywords/bulk",
+            json=[{"keyword": f"조건부{k}", "weight": 1} for k in range(10)],
+            headers=auth,
+        )
+        client.post(
+            "/users/me/school-anchors/bulk",
+            json=[
+                {
+                    "institution_id": institution_id,
+                    "school_level": level,
+                    "entry_year": year,
+                }
+                for institution_id, level, year in zip(
+                    institution_ids,
+                    ("elementary", "middle", "high"),
+                    (1997, 2003, 2006),
+                )
+            ],
+            headers=auth,
+        )
+        if i == 0:
+            with engine.begin() as conn:
+                conn.execute(text(POSTS_SQL), {"author": user["id"]})
+        headers.append(auth)
+    return headers, community_id
+
+
+def make_trace(users: int, events: int, write_ratio: float, rng: random.Random):
+    kinds = list(GET_WEIGHTS)
+    weights = list(GET_WEIGHTS.values())
+    trace = []
+    for _ in range(events):
+        user = rng.randrange(users)
+        if rng.random() < write_ratio:
+            trace.append((user, rng.choice(["keyword", "post"]), rng.randint(1, 5)))
+        else:
+            trace.append((user, rng.choices(kinds, weights)[0], None))
+    return trace
+
+
+async def replay(client, counter, headers, community_id, trace, conditional: bool):
+    posts_url = f"/communities/{community_id}/posts"
+    etags: dict[tuple[int, str], str] = {}
+    total_bytes = not_modified = gets = statements = 0
+    cpu = 0.0
+    for user, kind, value in trace:
+        auth = headers[user]
+        if kind == "keyword":
+            await client.post(
+                "/users/me/keywords",
+                json={"keyword": "조건부0", "weight": value},
+                headers=auth,
+            )
+            continue
+        if kind == "post":
+            await client.post(
+                posts_url,
+                json={"community_id": community_id, "content": f"벤치 새 글 {value}"},
+                headers=auth,
+            )
+            continue
+
+        url = posts_url if kind == "posts" else kind
+        request_headers = dict(auth)
+        if conditional and (user, url) in etags:
+            request_headers["If-None-Match"] = etags[(user, url)]
+        counter.reset()
+        started = time.process_time()
+        response = await client.get(url, headers=request_headers)
+        cpu += time.process_time() - started
+        statements += counter.statements
+
+        gets += 1
+        total_bytes += len(response.content)
+        if response.status_code == 304:
+            not_modified += 1
+        elif "etag" in response.headers:
+            etags[(user, url)] = response.headers["etag"]
+    return {
+        "bytes": total_bytes,
+        "cpu_ms": cpu * 1000 / gets,
+        "sql": statements / gets,
+        "not_modified": not_modified / gets,
+    }
+
+
+async def _replay_asgi(counter, headers, community_id, trace, conditional: bool):
+    transport = httpx.ASGITransport(app=app_main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        return await replay(client, counter, headers, community_id, trace, conditional)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="조건부 GET(ETag) 재생 벤치마크")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--events", type=int, default=3000)
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    headers, community_id = seed(TestClient(app_main.app), args.users)
+    trace = make_trace(args.users, args.events, args.write_ratio, random.Random(42))
+    counter = StatementCounter()
+
+    try:
+        print(
+            f"[bench_conditional_get] users={args.users} events={args.events} "
+            f"write_ratio={args.write_ratio}"
+        )
+        results = {}
+        for label, conditional in [("전체 응답", False), ("If-None-Match", True)]:
+            result = asyncio.run(
+                _replay_asgi(counter, headers, community_id, trace, conditional)
+            )
+            results[label] = result
+            print(
+                f"  {label:13s}: {result['bytes'] / 1024:8.1f}KB  "
+                f"요청당 CPU {result['cpu_ms']:5.2f}ms  SQL {result['sql']:4.2f}  "
+                f"304 {result['not_modified']:.0%}"
+            )
+        plain, cond = results["전체 응답"], results["If-None-Match"]
+        print(
+            f"  바이트 -{1 - cond['bytes'] / plain['bytes']:.0%}  "
+            f"CPU -{1 - cond['cpu_ms'] / plain['cpu_ms']:.0%}"
+        )
+    finally:
+        with engine.begin() as conn:
+            for sql in DROP_SQL:
+                conn.execute(text(sql))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# path: benchmarks/bench_friend_graph.py
+"""
+friend_graph (CSR 인접 배열) 벤치마크.
+
+- DB 없이 합성 그래프로 측정한다.
+  유저 --users 명, 간선 --edges 개 (한쪽 끝은 멱법칙 분포 → 인기 유저가 생김)
+- CSR 빌드 시간 / 메모리, 공통 친구 수 / 친구의 친구 추천 지연 시간
+
+사용법:
+    python -m benchmarks.bench_friend_graph --users 1000000 --edges 50000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from friend_graph import FriendGraph
+
+
+def percentiles(timings: list[float]) -> str:
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return f"p50={p50:.3f}ms p95={p95:.3f}ms p99={p99:.3f}ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="친구 그래프 벤치마크")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--edges", type=int, default=50_000_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    started = time.perf_counter()
+    src = rng.integers(1, args.users + 1, args.edges, dtype=np.int32)
+    dst = (rng.pareto(1.5, args.edges) * args.users / 50).astype(np.int64)
+    dst = (dst % args.users + 1).astype(np.int32)
+    print(
+        f"[bench_friend_graph] users={args.users} edges={args.edges} "
+        f"(생성 {time.perf_counter() - started:.1f}s)"
+    )
+
+    graph = FriendGraph()
+    started = time.perf_counter()
+    graph.load_edges(src, dst)
+    del src, dst
+    nbytes = graph.indptr.nbytes + graph.indices.nbytes
+    print(
+        f"  CSR 빌드 {time.perf_counter() - started:.1f}s, "
+        f"방향 간선 {len(graph.indices)}개, 메모리 {nbytes / 1e6:.0f}MB"
+    )
+
+    users = rng.integers(1, args.users + 1, (args.queries, 2))
+
+    timings = []
+    for a, b in users:
+        t = time.perf_counter()
+        graph.mutual_count(int(a), int(b))
+        timings.append((time.perf_counter() - t) * 1000)
+    print(f"  공통 친구 수       : {percentiles(timings)}")
+
+    timings = []
+    for a, _ in users:
+        t = time.perf_counter()
+        graph.suggestions(int(a), limit=20)
+        timings.append((time.perf_counter() - t) * 1000)
+    print(f"  친구의 친구 추천   : {percentiles(timings)}")
+
+    started = time.perf_counter()
+    for a, b in users:
+        graph.add_edge(int(a), int(b))
+    add_ms = (time.perf_counter() - started) * 1000 / len(users)
+    timings = []
+    for a, _ in users:
+        t = time.perf_counter()
+        graph.suggestions(int(a), limit=20)
+        timings.append((time.perf_counter() - t) * 1000)
+    print(f"  간선 추가 {add_ms:.4f}ms/건, 추가 후 추천: {percentiles(timings)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# path: benchmarks/bench_keyword_affinity.py
+"""
+keyword_affinity (NumPy CSR 일괄 계산) vs 순수 파이썬 쌍별 루프 벤치마크.
+
+- DB 없이 합성 데이터로 측정한다.
+- 유저 --users 명, 유저당 키워드 3~15개 (Zipf 분포 어휘 --vocab 개)
+- 기준 유저 --queries 명 각각에 대해 후보 --candidates 명과의 TF-IDF 코사인 계산
+
+사용법:
+    python -m benchmarks.bench_keyword_affinity --users 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+
+import numpy as np
+
+from keyword_affinity import KeywordAffinityIndex
+
+
+def make_rows(users: int, vocab: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for user_id in range(1, users + 1):
+        n = int(rng.integers(3, 16))
+        # (user_id, keyword_id) 는 유니크
+        keyword_ids = np.unique(np.minimum(rng.zipf(1.3, n), vocab))
+        for keyword_id in keyword_ids:
+            rows.append((user_id, int(keyword_id), int(rng.integers(1, 6))))
+    return rows
+
+
+def python_scores(vectors, doc_freq, n_users, user_id, candidate_ids):
+    """비교용: dict 기반 쌍별 코사인 루프."""
+
+    def tfidf(vector):
+        return {
+            k: w * (math.log((n_users + 1) / (doc_freq[k] + 1)) + 1.0)
+            for k, w in vector.items()
+        }
+
+    query = tfidf(vectors.get(user_id, {}))
+    query_norm = math.sqrt(sum(v * v for v in query.values()))
+    result = []
+    for candidate_id in candidate_ids:
+        other = tfidf(vectors.get(candidate_id, {}))
+        dot = sum(v * other.get(k, 0.0) for k, v in query.items())
+        norm = math.sqrt(sum(v * v for v in other.values()))
+        result.append(dot / (norm * query_norm) if norm and query_norm else 0.0)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="키워드 유사도 벤치마크")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--vocab", type=int, default=5000)
+    parser.add_argument("--candidates", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = make_rows(args.users, args.vocab)
+    print(f"[bench_keyword_affinity] users={args.users} keyword rows={len(rows)}")
+
+    index = KeywordAffinityIndex()
+    started = time.perf_counter()
+    index.load_rows(rows)
+    print(f"  CSR 적재: {time.perf_counter() - started:.2f}s")
+
+    # 파이썬 루프용 dict
+    vectors: dict[int, dict[int, float]] = {}
+    doc_freq: dict[int, int] = {}
+    for user_id, keyword_id, weight in rows:
+        vector = vectors.setdefault(user_id, {})
+        if keyword_id not in vector:
+            doc_freq[keyword_id] = doc_freq.get(keyword_id, 0) + 1
+        vector[keyword_id] = float(weight)
+
+    rng = random.Random(42)
+    queries = [
+        (rng.randint(1, args.users), rng.sample(range(1, args.users + 1), args.candidates))
+        for _ in range(args.queries)
+    ]
+
+    started = time.perf_counter()
+    for user_id, candidates in queries:
+        expected = python_scores(vectors, doc_freq, args.users, user_id, candidates)
+    python_ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+    started = time.perf_counter()
+    for user_id, candidates in queries:
+        actual = index.scores(user_id, candidates)
+    numpy_ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+    assert np.allclose(expected, actual, atol=1e-4)
+    print(f"  후보 {args.candidates}명 / 쿼리당")
+    print(f"    python loop: {python_ms:.2f}ms")
+    print(f"    numpy CSR  : {numpy_ms:.2f}ms  (x{python_ms / numpy_ms:.1f})")
+
+    # 증분 갱신 비용
+    started = time.perf_counter()
+    for i in range(1000):
+        index.add(rng.randint(1, args.users), f"kw{rng.randint(1, args.vocab)}", 1)
+    index.scores(1, [2])
+    print(
+        f"  키워드 1000건 추가 + 재반영: {(time.perf_counter() - started) * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# path: benchmarks/bench_keyword_dictionary.py
+"""
+keyword_dictionary 조회 지연 벤치마크.
+
+- keywords 에 'benchdict' 접두사 키워드 --keywords 개를 넣고 (user_count 는 Zipf 분포)
+  1) intern: 캐시 적중 / 캐시 미스(SELECT 1회) 지연
+  2) 자동완성: 메모리 스냅샷(bisect) vs SQL (LIKE 'prefix%' ORDER BY user_count)
+  를 비교한다. 끝나면 넣은 키워드는 지운다.
+
+사용법:
+    python -m benchmarks.bench_keyword_dictionary --keywords 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from sqlalchemy import text
+
+from database import SessionLocal, engine
+from keyword_dictionary import KeywordDictionary
+
+SEED_SQL = """
+    INSERT INTO keywords (keyword, keyword_normalized, user_count)
+    SELECT 'benchdict' || g, 'benchdict' || g, (1000000 / g)::int
+    FROM generate_series(1, :keywords) g
+    ON CONFLICT DO NOTHING
+"""
+
+DROP_SQL = "DELETE FROM keywords WHERE keyword_normalized LIKE 'benchdict%'"
+
+AUTOCOMPLETE_SQL = text(
+    """
+    SELECT id, keyword, user_count FROM keywords
+    WHERE keyword_normalized LIKE :prefix || '%'
+    ORDER BY user_count DESC
+    LIMIT 10
+    """
+)
+
+
+def _per_call_us(fn, args_list) -> float:
+    started = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - started) * 1e6 / len(args_list)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="키워드 사전 벤치마크")
+    parser.add_argument("--keywords", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        conn.execute(text(SEED_SQL), {"keywords": args.keywords})
+        conn.execute(text("ANALYZE keywords"))
+
+    rng = random.Random(42)
+    names = [f"benchdict{rng.randint(1, args.keywords)}" for _ in range(args.queries)]
+    prefixes = [f"benchdict{rng.randint(1, 999)}" for _ in range(args.queries)]
+
+    db = SessionLocal()
+    try:
+        dictionary = KeywordDictionary()
+        print(f"[bench_keyword_dictionary] keywords={args.keywords}")
+
+        miss_us = _per_call_us(
+            lambda n: dictionary.intern(db, n), [(n,) for n in names]
+        )
+        hit_us = _per_call_us(lambda n: dictionary.intern(db, n), [(n,) for n in names])
+        print(f"  intern 캐시 미스: {miss_us:8.1f}us")
+        print(f"  intern 캐시 적중: {hit_us:8.1f}us")
+
+        started = time.perf_counter()
+        dictionary.load_autocomplete(db)
+        print(f"  자동완성 스냅샷 적재: {(time.perf_counter() - started) * 1000:.0f}ms")
+
+        memory_us = _per_call_us(
+            lambda p: dictionary.autocomplete(db, p), [(p,) for p in prefixes]
+        )
+        sql_us = _per_call_us(
+            lambda p: db.execute(AUTOCOMPLETE_SQL, {"prefix": p}).all(),
+            [(p,) for p in prefixes],
+        )
+        print(f"  자동완성 (메모리): {memory_us:8.1f}us")
+        print(f"  자동완성 (SQL)   : {sql_us:8.1f}us")
+    finally:
+        db.rollback()
+        db.close()
+        with engine.begin() as conn:
+            conn.execute(text(DROP_SQL))
+
+
+if __name__ == "__main__":
+    main()
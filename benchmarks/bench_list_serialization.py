@@ -0,0 +1,171 @@
+# path: benchmarks/bench_list_serialization.py
+"""
+목록 응답 직렬화 벤치마크: 요청당 CPU 시간 (time.process_time).
+
+- 기존 경로: ORM 객체 조회 → response_model(pydantic) 검증 → jsonable_encoder → json
+- 새 경로: 스키마 필드 컬럼만 튜플로 조회 → orjson (main._rows_response)
+- 같은 DB 세션 의존성을 쓰는 작은 FastAPI 앱에 두 경로를 나란히 올리고
+  TestClient 로 번갈아 호출한다. (인증/차단 필터는 빼고 직렬화 차이만 본다)
+- 대상: GET /communities/{id}/posts (limit 100), GET /institutions/search (limit 100)
+- 'benchlist' 접두사 데이터를 만들고 재사용한다. (삭제는 --drop)
+
+사용법:
+    python -m benchmarks.bench_list_serialization --requests 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import crud
+import main as app_main
+import models
+import schemas
+from database import engine
+
+SEED_SQL = [
+    """
+    INSERT INTO institutions
+        (external_source, external_id, name, institution_type,
+         region_city, region_district, address)
+    SELECT 'benchlist', g::text, '벤치목록학교' || g, 'school',
+           '서울특별시', '강동구', '서울특별시 강동구 벤치로 ' || g
+    FROM generate_series(1, 2000) g
+    """,
+    """
+    INSERT INTO users (login_id, password_hash, real_name, nickname, birth_year)
+    VALUES ('benchlist_author', 'x', '벤치', 'benchlist', 1990)
+    """,
+    """
+    INSERT INTO communities (institution_id, school_level, entry_year, name)
+    SELECT min(id), 'elementary', 1997, 'benchlist'
+    FROM institutions WHERE external_source = 'benchlist'
+    """,
+    """
+    INSERT INTO community_posts (community_id, author_user_id, content, status)
+    SELECT c.id, u.id, repeat('벤치 게시글 본문 ', 10) || g, 'active'
+    FROM generate_series(1, 500) g
+    CROSS JOIN (SELECT id FROM communities WHERE name = 'benchlist') c
+    CROSS JOIN (SELECT id FROM users WHERE login_id = 'benchlist_author') u
+    """,
+    "ANALYZE",
+]
+
+DROP_SQL = [
+    "DELETE FROM community_posts WHERE community_id IN "
+    "(SELECT id FROM communities WHERE name = 'benchlist')",
+    "DELETE FROM communities WHERE name = 'benchlist'",
+    "DELETE FROM users WHERE login_id = 'benchlist_author'",
+    "DELETE FROM institutions WHERE external_source = 'benchlist'",
+]
+
+
+def seed() -> int:
+    with engine.begin() as conn:
+        community_id = conn.execute(
+            text("SELECT id FROM communities WHERE name = 'benchlist'")
+        ).scalar()
+        if community_id is None:
+            for sql in SEED_SQL:
+                conn.execute(text(sql))
+            community_id = conn.execute(
+                text("SELECT id FROM communities WHERE name = 'benchlist'")
+            ).scalar()
+    return community_id
+
+
+def drop() -> None:
+    with engine.begin() as conn:
+        for sql in DROP_SQL:
+            conn.execute(text(sql))
+    print("[bench_list_serialization] 벤치 데이터 삭제 완료")
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    get_db = app_main.get_db_session
+
+    @app.get("/before/posts/{community_id}", response_model=List[schemas.CommunityPost])
+    def before_posts(community_id: int, db: Session = Depends(get_db)):
+        post = models.CommunityPost
+        return (
+            db.query(post)
+            .filter(post.community_id == community_id, post.status == "active")
+            .order_by(post.created_at.desc())
+            .limit(100)
+            .all()
+        )
+
+    @app.get("/after/posts/{community_id}", response_model=List[schemas.CommunityPost])
+    def after_posts(community_id: int, db: Session = Depends(get_db)):
+        rows = crud.list_community_posts(db, community_id, viewer_user_id=0, limit=100)
+        return app_main._rows_response(rows, crud.COMMUNITY_POST_FIELDS)
+
+    @app.get("/before/institutions", response_model=List[schemas.Institution])
+    def before_institutions(db: Session = Depends(get_db)):
+        inst = models.Institution
+        return (
+            db.query(inst)
+            .filter(inst.is_active.is_(True), inst.name.ilike("%벤치목록%"))
+            .order_by(inst.name)
+            .limit(100)
+            .all()
+        )
+
+    @app.get("/after/institutions", response_model=List[schemas.Institution])
+    def after_institutions(db: Session = Depends(get_db)):
+        rows = crud.search_institutions(db, q="벤치목록", limit=100)
+        return app_main._rows_response(rows, crud.INSTITUTION_FIELDS)
+
+    return app
+
+
+def cpu_per_request(client: TestClient, url: str, requests: int) -> float:
+    for _ in range(20):  # 워밍업
+        client.get(url)
+    started = time.process_time()
+    for _ in range(requests):
+        client.get(url)
+    return (time.process_time() - started) * 1000 / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="목록 응답 직렬화 CPU 벤치마크")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--drop", action="store_true", help="벤치 데이터 삭제 후 종료")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    if args.drop:
+        drop()
+        return
+
+    community_id = seed()
+    client = TestClient(build_app())
+    print(f"[bench_list_serialization] requests={args.requests} (항목 100개씩)")
+
+    for name, before_url, after_url in [
+        ("posts", f"/before/posts/{community_id}", f"/after/posts/{community_id}"),
+        ("institutions", "/before/institutions", "/after/institutions"),
+    ]:
+        before, after = client.get(before_url), client.get(after_url)
+        assert before.json() == after.json(), f"{name}: 응답 모양이 다름"
+
+        before_ms = cpu_per_request(client, before_url, args.requests)
+        after_ms = cpu_per_request(client, after_url, args.requests)
+        print(
+            f"  {name:13s}: ORM+pydantic {before_ms:6.2f}ms  "
+            f"컬럼+orjson {after_ms:6.2f}ms  x{before_ms / after_ms:.2f} "
+            f"({len(after.content)} bytes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
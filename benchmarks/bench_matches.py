@@ -0,0 +1,166 @@
+# path: benchmarks/bench_matches.py
+"""
+/users/me/matches (matching.find_matches) 지연 시간 벤치마크.
+
+- .env 에 설정된 DB 에 'bench_' 접두사 유저를 generate_series 로 만든다.
+  (이미 있으면 재사용. 삭제는 --drop 으로)
+- 유저당 초/중/고 앵커 3개, 키워드 3개, 거주지(시/도)를 랜덤 배정
+- 무작위 유저 --samples 명에 대해 find_matches 를 호출해 p50/p95/p99 를 출력
+
+사용법:
+    python -m benchmarks.bench_matches --users 1000000 --institutions 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+
+import matching
+from database import SessionLocal, engine
+import models
+
+
+SEED_SQL = [
+    "SELECT setseed(0.42)",
+    """
+    INSERT INTO institutions (external_source, external_id, name, institution_type)
+    SELECT 'bench', g::text, '벤치학교' || g, 'school'
+    FROM generate_series(1, :institutions) g
+    """,
+    """
+    INSERT INTO users (login_id, password_hash, real_name, nickname, birth_year)
+    SELECT 'bench_' || g, 'x', '벤치', 'bench' || g, 1980 + g % 20
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO user_profiles (user_id, residence_city)
+    SELECT id, '시도' || (id % 17) FROM users WHERE login_id LIKE 'bench\\_%'
+    """,
+    """
+    INSERT INTO user_school_anchors (user_id, institution_id, school_level, entry_year)
+    SELECT
+        u.id,
+        i.min_id + floor(random() * :institutions)::int,
+        l.level,
+        u.birth_year + l.age
+    FROM users u
+    CROSS JOIN (VALUES ('elementary', 7), ('middle', 13), ('high', 16)) l(level, age)
+    CROSS JOIN (
+        SELECT min(id) AS min_id FROM institutions WHERE external_source = 'bench'
+    ) i
+    WHERE u.login_id LIKE 'bench\\_%'
+    """,
+    """
+    INSERT INTO keywords (keyword, keyword_normalized)
+    SELECT 'benchkw' || n, 'benchkw' || n FROM generate_series(0, 299) n
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO user_keywords (user_id, keyword_id)
+    SELECT u.id, k.id
+    FROM users u
+    CROSS JOIN generate_series(1, 3)
+    JOIN keywords k
+      ON k.keyword_normalized = 'benchkw' || floor(power(random(), 2) * 300)::int
+    WHERE u.login_id LIKE 'bench\\_%'
+    ON CONFLICT DO NOTHING
+    """,
+    "ANALYZE",
+]
+
+DROP_SQL = [
+    "DELETE FROM users WHERE login_id LIKE 'bench\\_%'",
+    "DELETE FROM institutions WHERE external_source = 'bench'",
+    "DELETE FROM keywords WHERE keyword_normalized LIKE 'benchkw%'",
+]
+
+
+def seed(users: int, institutions: int) -> None:
+    with engine.begin() as conn:
+        existing = conn.execute(
+            text("SELECT count(*) FROM users WHERE login_id LIKE 'bench\\_%'")
+        ).scalar()
+        if existing:
+            print(f"[bench_matches] 기존 벤치 유저 {existing}명 재사용")
+            return
+
+        started = time.perf_counter()
+        for sql in SEED_SQL:
+            conn.execute(text(sql), {"users": users, "institutions": institutions})
+        print(
+            f"[bench_matches] 유저 {users}명 시드 완료 "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+
+
+def drop() -> None:
+    with engine.begin() as conn:
+        for sql in DROP_SQL:
+            conn.execute(text(sql))
+    print("[bench_matches] 벤치 데이터 삭제 완료")
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def run(samples: int, year_tolerance: int) -> None:
+    db = SessionLocal()
+    try:
+        ids = [
+            row[0]
+            for row in db.execute(
+                text("SELECT id FROM users WHERE login_id LIKE 'bench\\_%'")
+            )
+        ]
+        rng = random.Random(42)
+        targets = rng.sample(ids, min(samples, len(ids)))
+
+        # 워밍업
+        for user_id in targets[:10]:
+            matching.find_matches(db, user_id=user_id, year_tolerance=year_tolerance)
+
+        timings = []
+        for user_id in targets:
+            started = time.perf_counter()
+            matching.find_matches(db, user_id=user_id, year_tolerance=year_tolerance)
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        db.close()
+
+    print(f"[bench_matches] users={len(ids)} samples={len(timings)}")
+    print(
+        f"  mean={statistics.mean(timings):.2f}ms "
+        f"p50={percentile(timings, 0.50):.2f}ms "
+        f"p95={percentile(timings, 0.95):.2f}ms "
+        f"p99={percentile(timings, 0.99):.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="find_matches 지연 시간 벤치마크")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--institutions", type=int, default=5000)
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--year-tolerance", type=int, default=1)
+    parser.add_argument("--drop", action="store_true", help="벤치 데이터 삭제 후 종료")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+
+    if args.drop:
+        drop()
+        return
+
+    seed(args.users, args.institutions)
+    run(args.samples, args.year_tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# path: benchmarks/bench_metrics_overhead.py
+"""
+계측 오버헤드 벤치마크: metrics.ENABLED 를 켜고 끄면서 요청당 CPU 시간을 비교한다.
+
+- 대상: GET /health (SQL 없음), GET /users/me/bootstrap (SQL 5회),
+  GET /communities/{id}/posts (글 100개)
+- 'benchmo_' 유저 하나 / 'benchmetrics' 커뮤니티(글 100개)를 만들고 끝나면 지운다.
+- 켜기/끄기를 --rounds 번 번갈아 돌려서 라운드별 요청당 CPU(time.process_time)의
+  중앙값을 비교한다. (번갈아 돌려야 캐시/GC 상태 차이가 한쪽에 몰리지 않는다)
+- httpx.AsyncClient + ASGITransport 로 호출한다 (TestClient 포털 비용 제외).
+- 느린 요청 로그가 섞이지 않도록 SLOW_REQUEST_MS 를 크게 잡고 돌린다.
+
+사용법:
+    python -m benchmarks.bench_metrics_overhead --requests 200 --rounds 21
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+import main as app_main
+import metrics
+from database import engine
+
+SEED_SQL = [
+    """
+    INSERT INTO institutions (external_source, external_id, name, institution_type)
+    VALUES ('benchmetrics', '1', '벤치계측학교', 'school')
+    """,
+    """
+    INSERT INTO communities (institution_id, school_level, entry_year, name)
+    SELECT id, 'high', 2006, 'benchmetrics'
+    FROM institutions WHERE external_source = 'benchmetrics'
+    """,
+]
+
+POSTS_SQL = """
+    INSERT INTO community_posts (community_id, author_user_id, content, status)
+    SELECT c.id, :author, repeat('벤치 계측 게시글 ', 8) || g, 'active'
+    FROM generate_series(1, 100) g
+    CROSS JOIN (SELECT id FROM communities WHERE name = 'benchmetrics') c
+"""
+
+DROP_SQL = [
+    "DELETE FROM community_posts WHERE community_id IN "
+    "(SELECT id FROM communities WHERE name = 'benchmetrics')",
+    "DELETE FROM users WHERE login_id LIKE 'benchmo\\_%'",
+    "DELETE FROM communities WHERE name = 'benchmetrics'",
+    "DELETE FROM institutions WHERE external_source = 'benchmetrics'",
+]
+
+
+def seed(client: TestClient) -> tuple[dict, int]:
+    with engine.begin() as conn:
+        for sql in DROP_SQL + SEED_SQL:
+            conn.execute(text(sql))
+        community_id = conn.execute(
+            text("SELECT id FROM communities WHERE name = 'benchmetrics'")
+        ).scalar_one()
+
+    user = client.post(
+        "/users/",
+        json={
+            "login_id": "benchmo_user",
+            "password": "pw",
+            "real_name": "벤치",
+            "nickname": "benchmo",
+            "birth_year": 1990,
+        },
+    ).json()
+    token = client.post(
+        "/token", data={"username": "benchmo_user", "password": "pw"}
+    ).json()["access_token"]
+    with engine.begin() as conn:
+        conn.execute(text(POSTS_SQL), {"author": user["id"]})
+    return {"Authorization": f"Bearer {token}"}, community_id
+
+
+async def cpu_per_request(client, url: str, headers: dict, requests: int) -> float:
+    started = time.process_time()
+    for _ in range(requests):
+        response = await client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+    return (time.process_time() - started) * 1000 / requests
+
+
+async def measure(urls, headers, requests: int, rounds: int) -> dict:
+    transport = httpx.ASGITransport(app=app_main.app)
+    samples = {(url, enabled): [] for url in urls for enabled in (False, True)}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for url in urls:  # 워밍업
+            await cpu_per_request(client, url, headers, 20)
+        for _ in range(rounds):
+            for enabled in (False, True):
+                metrics.ENABLED = enabled
+                for url in urls:
+                    samples[(url, enabled)].append(
+                        await cpu_per_request(client, url, headers, requests)
+                    )
+    return {key: statistics.median(values) for key, values in samples.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="계측 미들웨어/SQL 훅 오버헤드")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=21)
+    args = parser.parse_args()
+
+    metrics.SLOW_REQUEST_MS = float("inf")
+    headers, community_id = seed(TestClient(app_main.app))
+    urls = ["/health", "/users/me/bootstrap", f"/communities/{community_id}/posts"]
+
+    try:
+        results = asyncio.run(measure(urls, headers, args.requests, args.rounds))
+    finally:
+        metrics.ENABLED = True
+        with engine.begin() as conn:
+            for sql in DROP_SQL:
+                conn.execute(text(sql))
+
+    print(
+        f"[bench_metrics_overhead] requests={args.requests} x rounds={args.rounds} "
+        "(요청당 CPU 중앙값)"
+    )
+    for url in urls:
+        off, on = results[(url, False)], results[(url, True)]
+        print(
+            f"  {url:32s} 끔 {off:5.2f}ms  켬 {on:5.2f}ms  "
+            f"오버헤드 {(on / off - 1) * 100:+5.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# path: benchmarks/bench_micro.py
+"""
+마이크로 벤치마크: crud 조회 함수, security (argon2 / JWT), ai_service (심사 분류기).
+
+- crud 는 bench_workload 와 같은 시드('benchwl')를 작게 깔고 세션 하나로 호출한다.
+  호출마다 expunge_all() 로 identity map 을 비워서 매번 ORM 객체를 새로 만든다.
+- 항목마다 --rounds 라운드, 라운드마다 --round-ms 이상(최소 1회) 반복해서
+  라운드별 호출당 시간(µs)의 최솟값을 best_us 로 남긴다.
+  (timeit 과 같은 이유: 느린 라운드는 대개 다른 프로세스/GC 탓이라 최솟값이 가장 안정적)
+- benchmarks/baselines/micro.json 과 비교해서 회귀면 종료 코드 1 (benchmarks.results).
+
+사용법:
+    python -m benchmarks.bench_micro
+    python -m benchmarks.bench_micro --only security --rounds 3
+    python -m benchmarks.bench_micro --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, Dict
+
+import ai_service
+import crud
+import security
+from benchmarks import bench_workload, results
+from database import SessionLocal
+from verdict_cache import VerdictCache
+
+GROUPS = ("crud", "security", "ai_service")
+
+
+def measure(func: Callable[[], object], rounds: int, round_ms: float) -> float:
+    """라운드별 호출당 µs 의 최솟값"""
+    func()  # 워밍업
+    per_call = []
+    for _ in range(rounds):
+        calls = 0
+        started = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - started
+            if elapsed * 1000 >= round_ms:
+                break
+        per_call.append(elapsed * 1e6 / calls)
+    return min(per_call)
+
+
+def security_cases() -> Dict[str, Callable[[], object]]:
+    password_hash = security.get_password_hash("benchpw")
+    token = security.create_access_token({"sub": "benchwl_0"})
+    return {
+        "security.get_password_hash": lambda: security.get_password_hash("benchpw"),
+        "security.verify_password": lambda: security.verify_password(
+            "benchpw", password_hash
+        ),
+        "security.create_access_token": lambda: security.create_access_token(
+            {"sub": "benchwl_0"}
+        ),
+        "security.verify_token": lambda: security.verify_token(token, ValueError()),
+    }
+
+
+def ai_service_cases() -> Dict[str, Callable[[], object]]:
+    rng = random.Random(7)
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(400)]
+    texts = [
+        " ".join(
+            "".join(rng.choice(syllables) for _ in range(rng.randint(2, 5)))
+            for _ in range(40)
+        )
+        for _ in range(64)
+    ]
+    keyword = ai_service.KeywordClassifier()
+    cached = ai_service.CachedClassifier(keyword, VerdictCache())
+    cached.classify_batch(texts)  # 캐시 채우기
+    return {
+        "ai_service.keyword_batch64": lambda: keyword.classify_batch(texts),
+        "ai_service.cached_hit_batch64": lambda: cached.classify_batch(texts),
+        "ai_service.check_text_safety": lambda: ai_service.check_text_safety(texts[0]),
+    }
+
+
+def crud_cases(db, community_ids: list[int]) -> Dict[str, Callable[[], object]]:
+    user_id = crud.get_user_by_login_id(db, "benchwl_0").id
+    author_ids = [
+        row.author_user_id
+        for row in crud.list_community_posts(db, community_ids[0], user_id, limit=50)
+    ]
+
+    def call(func, *args, **kwargs):
+        def run():
+            result = func(db, *args, **kwargs)
+            db.expunge_all()
+            return result
+
+        return run
+
+    return {
+        "crud.get_user_by_login_id": call(crud.get_user_by_login_id, "benchwl_1"),
+        "crud.search_institutions": call(
+            crud.search_institutions, q="벤치부하학교1", city="서울특별시", limit=20
+        ),
+        "crud.list_community_posts": call(
+            crud.list_community_posts, community_ids[0], user_id, limit=50
+        ),
+        "crud.get_user_bootstrap": call(crud.get_user_bootstrap, user_id),
+        "crud.get_nicknames": call(crud.get_nicknames, author_ids),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="crud / security / ai_service 마이크로"
+    )
+    parser.add_argument("--only", choices=GROUPS, help="이 묶음만")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--round-ms", type=float, default=200)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--institutions", type=int, default=500)
+    parser.add_argument("--communities", type=int, default=5)
+    parser.add_argument("--posts", type=int, default=200, help="커뮤니티당 글 수")
+    results.add_arguments(parser, "micro", tolerance=0.5)
+    args = parser.parse_args()
+
+    groups = [args.only] if args.only else list(GROUPS)
+    db = SessionLocal()
+    summary = {}
+    try:
+        cases: Dict[str, Callable[[], object]] = {}
+        if "crud" in groups:
+            community_ids = bench_workload.seed(args)
+            cases.update(crud_cases(db, community_ids))
+        if "security" in groups:
+            cases.update(security_cases())
+        if "ai_service" in groups:
+            cases.update(ai_service_cases())
+
+        print(f"[bench_micro] rounds={args.rounds} x {args.round_ms:.0f}ms (최솟값)")
+        for name, func in cases.items():
+            best_us = measure(func, args.rounds, args.round_ms)
+            summary[name] = {"best_us": round(best_us, 2)}
+            print(f"  {name:32s} {best_us:12.1f}µs")
+    finally:
+        db.close()
+        if "crud" in groups:
+            bench_workload.drop()
+
+    config = {
+        "groups": groups,
+        "users": args.users,
+        "institutions": args.institutions,
+        "communities": args.communities,
+        "posts": args.posts,
+    }
+    results.finish({"name": "micro", "config": config, "metrics": summary}, args)
+
+
+if __name__ == "__main__":
+    main()
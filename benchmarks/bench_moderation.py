@@ -0,0 +1,111 @@
+# path: benchmarks/bench_moderation.py
+"""
+moderation (Aho-Corasick) vs 기존 방식(단어마다 `word in content`) 벤치마크.
+
+- 한글 음절 2~4개짜리 임의 단어 --terms 개로 사전을 만들고,
+  UTF-8 --post-kb KB 짜리 본문(일부 단어는 공백/기호/반복을 끼워 넣음)을 검사한다.
+- 기존 방식은 정규화가 없으므로 변형된 단어는 찾지 못한다 (속도 비교용).
+- 사전 파일 교체(hot swap) 시 오토마톤 재빌드 시간도 잰다.
+
+사용법:
+    python -m benchmarks.bench_moderation --terms 50000 --post-kb 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import moderation
+
+
+def make_terms(n: int, rng: random.Random) -> list[str]:
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(600)]
+    terms = set()
+    while len(terms) < n:
+        terms.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(terms)
+
+
+def make_post(terms: list[str], kb: int, rng: random.Random) -> str:
+    filler = [chr(0xAC00 + rng.randrange(11172)) for _ in range(2000)]
+    parts: list[str] = []
+    size = 0
+    while size < kb * 1024:
+        if rng.random() < 0.02:
+            term = rng.choice(terms)
+            # 공백 / 기호 / 반복 끼워 넣기
+            noise = rng.choice([" ", ".", "*", term[0]])
+            part = term[0] + noise + term[1:]
+        else:
+            part = "".join(rng.choice(filler) for _ in range(rng.randint(1, 6))) + " "
+        parts.append(part)
+        size += len(part.encode())
+    return "".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="금칙어 검사 벤치마크")
+    parser.add_argument("--terms", type=int, default=50_000)
+    parser.add_argument("--post-kb", type=int, default=10)
+    parser.add_argument("--posts", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    terms = make_terms(args.terms, rng)
+    posts = [make_post(terms, args.post_kb, rng) for _ in range(args.posts)]
+    print(
+        f"[bench_moderation] terms={len(terms)} "
+        f"post={len(posts[0].encode()) / 1024:.1f}KB ({len(posts[0])}자)"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "terms.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(terms))
+
+        engine = moderation.ModerationEngine(path)
+        started = time.perf_counter()
+        engine.reload_if_changed()
+        build_ms = (time.perf_counter() - started) * 1000
+        automaton = engine.automaton
+        print(f"  오토마톤 빌드: {build_ms:.0f}ms (state {automaton.n_states}개)")
+
+        started = time.perf_counter()
+        found = [automaton.scan(post) for post in posts]
+        ac_ms = (time.perf_counter() - started) * 1000 / len(posts)
+
+        started = time.perf_counter()
+        naive = [[w for w in terms if w in post] for post in posts]
+        naive_ms = (time.perf_counter() - started) * 1000 / len(posts)
+
+        print(
+            f"  본문당 Aho-Corasick : {ac_ms:8.2f}ms  (매칭 평균 {_avg(found):.1f}건)"
+        )
+        print(
+            f"  본문당 word in text : {naive_ms:8.2f}ms  (매칭 평균 {_avg(naive):.1f}건)"
+        )
+        print(f"  x{naive_ms / ac_ms:.1f}")
+
+        # hot swap: 파일 교체 후 다음 검사부터 새 사전
+        with open(path + ".new", "w", encoding="utf-8") as f:
+            f.write("\n".join(terms[: len(terms) // 2]))
+        os.replace(path + ".new", path)
+        os.utime(path, (time.time() + 1, time.time() + 1))
+        started = time.perf_counter()
+        engine.reload_if_changed()
+        print(
+            f"  사전 교체: {(time.perf_counter() - started) * 1000:.0f}ms "
+            f"(단어 {len(engine.automaton)}개)"
+        )
+
+
+def _avg(results) -> float:
+    return sum(len(r) for r in results) / len(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# path: benchmarks/bench_onboarding.py
+"""
+온보딩 벤치마크: 키워드 / 학교 앵커 --items 건을 한 건씩 POST vs bulk 한 번.
+
+- 라운드마다 새 유저('benchob_' 접두사)로 가입해서
+  - 한 건씩: POST /users/me/keywords, POST /users/me/school-anchors 를 --items 번씩
+  - bulk: POST /users/me/keywords/bulk, POST /users/me/school-anchors/bulk 한 번씩
+  를 TestClient 로 호출하고 전체 시간(wall)과 SQL 문장 / commit 수를 잰다.
+- 학교는 'benchonboarding' 학교 --items 개를 만들어 쓴다. 끝나면 지운다.
+
+사용법:
+    python -m benchmarks.bench_onboarding --items 30 --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+import main as app_main
+from benchmarks.bench_write_statements import StatementCounter
+from database import engine
+
+SEED_SQL = """
+    INSERT INTO institutions (external_source, external_id, name, institution_type)
+    SELECT 'benchonboarding', g::text, '벤치온보딩학교' || g, 'school'
+    FROM generate_series(1, :items) g
+    RETURNING id
+"""
+
+DROP_SQL = [
+    "DELETE FROM users WHERE login_id LIKE 'benchob\\_%'",
+    "DELETE FROM communities WHERE institution_id IN "
+    "(SELECT id FROM institutions WHERE external_source = 'benchonboarding')",
+    "DELETE FROM institutions WHERE external_source = 'benchonboarding'",
+]
+
+LEVELS = ("elementary", "middle", "high")
+
+
+def signup(client: TestClient, login_id: str) -> dict:
+    client.post(
+        "/users/",
+        json={
+            "login_id": login_id,
+            "password": "pw",
+            "real_name": "벤치",
+            "nickname": login_id,
+            "birth_year": 1990,
+        },
+    )
+    token = client.post("/token", data={"username": login_id, "password": "pw"}).json()[
+        "access_token"
+    ]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def payloads(institution_ids: list[int], items: int, tag: str):
+    keywords = [{"keyword": f"온보딩{tag}키워드{i}", "weight": 1} for i in range(items)]
+    anchors = [
+        {
+            "institution_id": institution_ids[i % len(institution_ids)],
+            "school_level": LEVELS[i % 3],
+            "entry_year": 1997 + i % 3 * 6,
+            "is_primary": i == items - 1,
+        }
+        for i in range(items)
+    ]
+    return keywords, anchors
+
+
+def run_round(client, counter, institution_ids, items, bulk: bool):
+    tag = uuid.uuid4().hex[:8]
+    headers = signup(client, f"benchob_{tag}")
+    keywords, anchors = payloads(institution_ids, items, tag)
+
+    counter.reset()
+    started = time.perf_counter()
+    if bulk:
+        for url, body in [
+            ("/users/me/keywords/bulk", keywords),
+            ("/users/me/school-anchors/bulk", anchors),
+        ]:
+            response = client.post(url, json=body, headers=headers)
+            assert response.status_code == 200, response.text
+    else:
+        for url, bodies in [
+            ("/users/me/keywords", keywords),
+            ("/users/me/school-anchors", anchors),
+        ]:
+            for body in bodies:
+                response = client.post(url, json=body, headers=headers)
+                assert response.status_code == 200, response.text
+    elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, counter.statements, counter.commits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="온보딩 bulk vs 한 건씩 벤치마크")
+    parser.add_argument("--items", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    client = TestClient(app_main.app)
+    with engine.begin() as conn:
+        institution_ids = list(
+            conn.execute(text(SEED_SQL), {"items": args.items}).scalars()
+        )
+
+    counter = StatementCounter()
+    try:
+        print(
+            f"[bench_onboarding] 키워드 {args.items}건 + 앵커 {args.items}건, "
+            f"rounds={args.rounds}"
+        )
+        for label, bulk in [("한 건씩", False), ("bulk", True)]:
+            results = [
+                run_round(client, counter, institution_ids, args.items, bulk)
+                for _ in range(args.rounds)
+            ]
+            _, statements, commits = results[-1]
+            print(
+                f"  {label:6s}: median {statistics.median(r[0] for r in results):7.1f}ms"
+                f"  SQL {statements:4d}  commit {commits:3d}"
+            )
+    finally:
+        with engine.begin() as conn:
+            for sql in DROP_SQL:
+                conn.execute(text(sql))
+
+
+if __name__ == "__main__":
+    main()
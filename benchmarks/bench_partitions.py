@@ -0,0 +1,205 @@
+# path: benchmarks/bench_partitions.py
+"""
+파티션 벤치마크: 일반 테이블 vs 월 단위 파티션 테이블 (partitions.py).
+
+- 임시 스키마 bench_partitions 에 community_posts 와 같은 모양의 테이블 두 개를 만든다.
+  - plain : 파티션 없음, PK (id)
+  - part  : created_at 월 단위 range 파티션, PK (id, created_at)
+  둘 다 (community_id, created_at) 인덱스 + 같은 데이터 (--rows 행을 --months 개월에 고르게)
+- 측정
+  - feed    : community_id = ? AND status = 'active' ORDER BY created_at DESC LIMIT 50
+              --queries 번, p50 / p99
+  - cleanup : 가장 오래된 --expire 개월 정리
+              plain 은 DELETE + VACUUM, part 는 DETACH ... CONCURRENTLY + DROP
+- 끝나면 스키마를 지운다.
+
+사용법:
+    python -m benchmarks.bench_partitions --rows 1000000 --months 24 --expire 6
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+import partitions
+from database import engine
+
+SCHEMA = "bench_partitions"
+
+COLUMNS = """
+    id BIGSERIAL,
+    community_id BIGINT NOT NULL,
+    author_user_id BIGINT NOT NULL,
+    content TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'active',
+    is_deleted BOOLEAN NOT NULL DEFAULT false,
+    created_at TIMESTAMPTZ NOT NULL
+"""
+
+FEED_SQL = """
+    SELECT id, author_user_id, content, created_at FROM {table}
+    WHERE community_id = :community_id AND status = 'active'
+    ORDER BY created_at DESC LIMIT 50
+"""
+
+
+def _connect(autocommit: bool = False):
+    conn = engine.connect()
+    if autocommit:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+    conn.execute(text(f"SET search_path TO {SCHEMA}"))
+    return conn
+
+
+def setup(args, first_month: datetime) -> None:
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(text(f"SET LOCAL search_path TO {SCHEMA}"))
+        conn.execute(text(f"CREATE TABLE plain ({COLUMNS}, PRIMARY KEY (id))"))
+        conn.execute(
+            text(
+                f"CREATE TABLE part ({COLUMNS}, PRIMARY KEY (id, created_at)) "
+                "PARTITION BY RANGE (created_at)"
+            )
+        )
+        last_month = partitions.add_months(first_month, args.months - 1)
+        partitions.ensure_partitions(conn, "part", first_month, last_month)
+
+        # 행 번호 순서대로 시각이 흐른다 (실제 테이블처럼 최근 글이 뒤쪽 블록에)
+        span = (partitions.add_months(last_month, 1) - first_month).total_seconds()
+        conn.execute(
+            text(
+                """
+                INSERT INTO plain (community_id, author_user_id, content, status,
+                                   is_deleted, created_at)
+                SELECT 1 + (g::bigint * 7919) % :communities, 1 + g % 100000,
+                       repeat('벤치 파티션 게시글 ', 6) || g,
+                       CASE WHEN g % 20 = 0 THEN 'hidden' ELSE 'active' END,
+                       g % 10 = 0,
+                       :first + make_interval(secs => :span * g / :rows)
+                FROM generate_series(0, :rows - 1) g
+                """
+            ),
+            {
+                "communities": args.communities,
+                "rows": args.rows,
+                "first": first_month,
+                "span": span,
+            },
+        )
+        conn.execute(text("INSERT INTO part SELECT * FROM plain"))
+        for table in ("plain", "part"):
+            conn.execute(
+                text(f"CREATE INDEX ON {table} (community_id, created_at)")
+            )
+    with _connect(autocommit=True) as conn:
+        conn.execute(text("VACUUM ANALYZE plain, part"))
+    print(
+        f"[bench_partitions] 준비 {time.perf_counter() - started:.1f}s "
+        f"({args.rows:,}행, {args.months}개월, 커뮤니티 {args.communities})"
+    )
+
+
+def feed(table: str, args) -> dict:
+    rng = random.Random(args.seed)
+    sql = text(FEED_SQL.format(table=table))
+    latencies = []
+    with _connect() as conn:
+        for _ in range(args.queries):
+            params = {"community_id": rng.randint(1, args.communities)}
+            started = time.perf_counter()
+            conn.execute(sql, params).all()
+            latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)], 3),
+    }
+
+
+def cleanup_plain(cutoff: datetime) -> dict:
+    with _connect(autocommit=True) as conn:
+        started = time.perf_counter()
+        deleted = conn.execute(
+            text("DELETE FROM plain WHERE created_at < :cutoff"), {"cutoff": cutoff}
+        ).rowcount
+        delete_seconds = time.perf_counter() - started
+        conn.execute(text("VACUUM plain"))
+        total = time.perf_counter() - started
+    return {
+        "rows": deleted,
+        "delete_s": round(delete_seconds, 3),
+        "total_s": round(total, 3),
+    }
+
+
+def cleanup_part(cutoff: datetime) -> dict:
+    with _connect(autocommit=True) as conn:
+        expired = [
+            name
+            for name, month, _ in partitions.list_partitions(conn, "part")
+            if partitions.add_months(month, 1) <= cutoff
+        ]
+        rows = conn.execute(
+            text("SELECT count(*) FROM part WHERE created_at < :cutoff"),
+            {"cutoff": cutoff},
+        ).scalar()
+        started = time.perf_counter()
+        for name in expired:
+            partitions.detach_partition(conn, "part", name, drop=True)
+        total = time.perf_counter() - started
+    return {"rows": rows, "partitions": len(expired), "total_s": round(total, 3)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="일반 테이블 vs 월 단위 파티션")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--expire", type=int, default=6, help="정리할 오래된 개월 수")
+    parser.add_argument("--communities", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="임시 스키마를 남긴다")
+    parser.add_argument("--output", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    first_month = partitions.add_months(
+        partitions.month_floor(now), -(args.months - 1)
+    )
+    cutoff = partitions.add_months(first_month, args.expire)
+
+    summary = {}
+    setup(args, first_month)
+    try:
+        for table in ("plain", "part"):
+            summary[f"feed_{table}"] = feed(table, args)
+        summary["cleanup_plain"] = cleanup_plain(cutoff)
+        summary["cleanup_part"] = cleanup_part(cutoff)
+        for table in ("plain", "part"):
+            summary[f"feed_{table}_after_cleanup"] = feed(table, args)
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    for name, row in summary.items():
+        values = "  ".join(f"{key} {value}" for key, value in row.items())
+        print(f"  {name:26s} {values}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "metrics": summary}, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
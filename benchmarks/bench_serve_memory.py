@@ -0,0 +1,166 @@
+# path: benchmarks/bench_serve_memory.py
+"""
+멀티 워커 서버 메모리 비교: 워커별 RSS / PSS / USS.
+
+- 방식 (--modes, 기본 셋 다)
+  - uvicorn       : uvicorn main:app --workers N  (워커마다 따로 import, 기존 운영 방식)
+  - serve-nosnap  : serve.py --no-snapshots      (pre-fork 만, 읽기 전용 데이터는 워커마다)
+  - serve         : serve.py                     (pre-fork + 공유 스냅샷)
+- 방식마다 서버를 띄우고 --requests 건을 동시에 보내서 (학교 검색 / 키워드 자동완성)
+  모든 워커가 자동완성 목록 등을 한 번씩 올리게 한 뒤 /proc/<pid>/smaps_rollup 을 읽는다.
+- RSS 는 공유 페이지를 워커마다 중복으로 센다. 서버 전체 비용은 PSS 합계(마스터 + 워커)로 본다.
+- 데이터가 있어야 의미가 있다 (예: python generate_dataset.py --users 20000 --truncate).
+
+사용법:
+    python -m benchmarks.bench_serve_memory --workers 4
+    python -m benchmarks.bench_serve_memory --modes uvicorn,serve --output mem.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from serve import process_memory
+
+PREFIXES = "축구 야구 등산 캠핑 여행 요리 게임 독서 음악 코딩".split()
+SCHOOL_QUERIES = "서울 부산 경기 초등 중학교 고등 강남 수원 1 2".split()
+
+
+def command(mode: str, args) -> list[str]:
+    if mode == "uvicorn":
+        return [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--port", str(args.port), "--workers", str(args.workers),
+            "--log-level", "warning",
+        ]  # fmt: skip
+    cmd = [
+        sys.executable, "serve.py",
+        "--port", str(args.port), "--workers", str(args.workers),
+        "--snapshot-dir", args.snapshot_dir, "--log-level", "warning",
+    ]  # fmt: skip
+    if mode == "serve-nosnap":
+        cmd.append("--no-snapshots")
+    return cmd
+
+
+def children(pid: int) -> list[int]:
+    """pid 의 자식 프로세스 (multiprocessing resource_tracker 는 뺀다)"""
+    found = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                cmdline = f.read()
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+        if ppid == pid and b"resource_tracker" not in cmdline:
+            found.append(int(entry))
+    return sorted(found)
+
+
+def wait_ready(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    raise SystemExit(f"서버가 {timeout:.0f}초 안에 뜨지 않았습니다: {base_url}")
+
+
+def warm(base_url: str, requests: int, seed: int) -> int:
+    rng = random.Random(seed)
+    urls = []
+    for _ in range(requests):
+        if rng.random() < 0.5:
+            params = {"q": rng.choice(PREFIXES)[: rng.randint(1, 2)], "limit": 10}
+            urls.append(("/keywords/autocomplete", params))
+        else:
+            params = {"q": rng.choice(SCHOOL_QUERIES), "limit": 20}
+            urls.append(("/institutions/search", params))
+
+    # 요청마다 새 연결 → 커널이 여러 워커에 나눠 준다
+    def send(item):
+        path, params = item
+        return httpx.get(f"{base_url}{path}", params=params, timeout=30).status_code
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = list(pool.map(send, urls))
+    return sum(status >= 400 for status in statuses)
+
+
+def measure(mode: str, args) -> dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    # 느린 요청 로그는 끈다 (워커마다 첫 자동완성 로드가 느린 요청으로 찍힌다)
+    env = {**os.environ, "SLOW_REQUEST_MS": "inf"}
+    process = subprocess.Popen(command(mode, args), env=env, start_new_session=True)
+    try:
+        wait_ready(base_url)
+        errors = warm(base_url, args.requests, args.seed)
+        time.sleep(1.0)
+        workers = [process_memory(pid) for pid in children(process.pid)]
+        master = process_memory(process.pid)
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=60)
+
+    def mb(values, count=1):
+        return round(sum(values) / 1024 / max(count, 1), 1)
+
+    n = len(workers)
+    return {
+        "workers": n,
+        "errors": errors,
+        "worker_rss_mb": mb((w["rss"] for w in workers), n),
+        "worker_pss_mb": mb((w["pss"] for w in workers), n),
+        "worker_uss_mb": mb((w["uss"] for w in workers), n),
+        "master_pss_mb": mb([master["pss"]]),
+        "total_pss_mb": mb([master["pss"]] + [w["pss"] for w in workers]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="멀티 워커 서버 메모리 비교")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--modes", default="uvicorn,serve-nosnap,serve")
+    parser.add_argument("--snapshot-dir", default="snapshots")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    summary = {}
+    for mode in args.modes.split(","):
+        summary[mode] = measure(mode, args)
+        row = summary[mode]
+        print(
+            f"  {mode:13s} 워커 {row['workers']}개  "
+            f"워커당 RSS {row['worker_rss_mb']:6.1f}  PSS {row['worker_pss_mb']:6.1f}  "
+            f"USS {row['worker_uss_mb']:6.1f}MB  "
+            f"전체 PSS {row['total_pss_mb']:6.1f}MB  오류 {row['errors']}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "metrics": summary}, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
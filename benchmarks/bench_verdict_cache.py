@@ -0,0 +1,113 @@
+# path: benchmarks/bench_verdict_cache.py
+"""
+판정 캐시(verdict_cache) 벤치마크: 스팸 물결 시나리오.
+
+- 원본 스팸 --templates 개를 여러 커뮤니티에 반복 게시한다고 가정하고
+  글 --posts 개를 만든다. (정상 글 --normal-ratio, 나머지는 스팸 복사본)
+  - 복사본 절반은 공백/기호/반복만 다른 사본 (정확 캐시 대상)
+  - 나머지 절반은 단어 1~2개를 바꾼 사본 (근사 중복 대상)
+- 분류기는 모델 호출을 흉내 내서 배치당 --batch-ms + 글당 --item-ms 만큼 잠든다.
+- 캐시 없음 / 정확 캐시 / 정확 + MinHash 근사 중복 세 가지를 비교한다.
+
+사용법:
+    python -m benchmarks.bench_verdict_cache --posts 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List, Sequence
+
+import ai_service
+from verdict_cache import VerdictCache
+
+WORDS = (
+    "오늘 한정 특가 이벤트 무료 쿠폰 지급 링크 클릭 가입 즉시 포인트 "
+    "대박 수익 보장 부업 재택 상담 문의 카톡 친추 선착순 마감 임박"
+).split()
+
+
+class SlowModelClassifier:
+    """모델 호출 지연을 흉내 내는 분류기 (판정은 금칙어 사전)"""
+
+    name = "slow-model"
+
+    def __init__(self, batch_ms: float, item_ms: float) -> None:
+        self.batch_ms = batch_ms
+        self.item_ms = item_ms
+        self.calls = 0
+        self.items = 0
+        self._inner = ai_service.KeywordClassifier()
+
+    def classify_batch(self, texts: Sequence[str]) -> List[ai_service.Verdict]:
+        self.calls += 1
+        self.items += len(texts)
+        time.sleep((self.batch_ms + self.item_ms * len(texts)) / 1000)
+        return self._inner.classify_batch(texts)
+
+
+def make_posts(n: int, templates: int, normal_ratio: float, rng: random.Random):
+    spam = [
+        " ".join(rng.choice(WORDS) for _ in range(30)) + " 바보"
+        for _ in range(templates)
+    ]
+    posts = []
+    for _ in range(n):
+        if rng.random() < normal_ratio:
+            posts.append(
+                " ".join(rng.choice(WORDS) for _ in range(20)) + f" {rng.random()}"
+            )
+            continue
+        words = rng.choice(spam).split()
+        if rng.random() < 0.5:
+            # 공백/기호/반복만 다른 사본
+            posts.append(rng.choice(["  ", " . ", " ~ "]).join(words) + "!!!")
+        else:
+            # 단어 1~2개 교체
+            for _ in range(rng.randint(1, 2)):
+                words[rng.randrange(len(words) - 1)] = rng.choice(WORDS)
+            posts.append(" ".join(words))
+    return posts
+
+
+def run(posts, classifier, batch_size: int) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(posts), batch_size):
+        classifier.classify_batch(posts[start : start + batch_size])
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="판정 캐시 벤치마크")
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--templates", type=int, default=50)
+    parser.add_argument("--normal-ratio", type=float, default=0.3)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--batch-ms", type=float, default=20.0)
+    parser.add_argument("--item-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts, args.templates, args.normal_ratio, random.Random(42))
+    print(f"[bench_verdict_cache] posts={len(posts)} templates={args.templates}")
+
+    for label, cache in [
+        ("캐시 없음", None),
+        ("정확 캐시", VerdictCache()),
+        ("정확 + 근사 중복", VerdictCache(near_duplicates=True)),
+    ]:
+        model = SlowModelClassifier(args.batch_ms, args.item_ms)
+        classifier = (
+            model if cache is None else ai_service.CachedClassifier(model, cache)
+        )
+        elapsed = run(posts, classifier, args.batch_size)
+        hit_ratio = cache.stats()["hit_ratio"] if cache else 0.0
+        print(
+            f"  {label:12s}: {elapsed:6.2f}s  모델 호출 {model.items:5d}건 "
+            f"hit_ratio={hit_ratio:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
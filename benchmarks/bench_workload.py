@@ -0,0 +1,288 @@
+# path: benchmarks/bench_workload.py
+"""
+혼합 부하 벤치마크: 로컬 Postgres 에 시드를 깔고 ASGI 앱에 고정 동시성으로 요청을 보낸다.
+
+- 시드 ('benchwl' 접두사, 실행마다 지우고 다시 만든다)
+  - 학교 --institutions 개 (시/도 몇 개에 나눔)
+  - 유저 --users 명 (비밀번호 해시는 한 번만 계산해서 모두 같은 값)
+  - 커뮤니티 --communities 개, 커뮤니티마다 활성 글 --posts 개
+- 작업 비율 (--mix, 기본 signup 5 / login 10 / search 25 / post 10 / feed 50)
+  - signup : POST /users/                    (새 login_id)
+  - login  : POST /token                     (시드 유저, argon2 검증)
+  - search : GET  /institutions/search       (학교명 부분 일치 + 시/도)
+  - post   : POST /communities/{id}/posts
+  - feed   : GET  /communities/{id}/posts?limit=50
+- --concurrency 개의 가상 사용자가 전체 --requests 건을 나눠 보낸다.
+  httpx.AsyncClient + ASGITransport 라 네트워크 없이 앱 + DB 비용만 잰다.
+  가상 사용자마다 시드가 고정된 난수로 작업을 고르므로 같은 설정이면 같은 요청 목록이 된다.
+- 엔드포인트별 처리량(rps), 지연 p50/p95/p99, 요청당 SQL 문장 수, 오류율을 JSON 으로 남긴다.
+  SQL 수는 metrics 미들웨어의 X-Query-Count 디버그 헤더로 요청마다 받는다.
+- benchmarks/baselines/workload.json 과 비교해서 회귀면 종료 코드 1 (benchmarks.results).
+
+사용법:
+    python -m benchmarks.bench_workload --requests 1000 --concurrency 8
+    python -m benchmarks.bench_workload --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+from sqlalchemy import text
+
+import main as app_main
+import metrics
+import security
+from benchmarks import results
+from database import engine
+
+PASSWORD = "benchpw"
+CITIES = ["서울특별시", "부산광역시", "대구광역시", "인천광역시", "경기도"]
+DEFAULT_MIX = "signup=5,login=10,search=25,post=10,feed=50"
+
+SEED_SQL = [
+    """
+    INSERT INTO institutions
+        (external_source, external_id, name, institution_type, region_city)
+    SELECT 'benchwl', g::text, '벤치부하학교' || g, 'school',
+           (CAST(:cities AS text[]))[1 + g % cardinality(CAST(:cities AS text[]))]
+    FROM generate_series(1, :institutions) g
+    """,
+    """
+    INSERT INTO users (login_id, password_hash, real_name, nickname, birth_year)
+    SELECT 'benchwl_' || g, :password_hash, '벤치', 'benchwl' || g, 1980 + g % 20
+    FROM generate_series(0, :users - 1) g
+    """,
+    """
+    INSERT INTO communities (institution_id, school_level, entry_year, name)
+    SELECT i.id, 'high', 2000 + i.rn % 10, 'benchwl'
+    FROM (
+        SELECT id, row_number() OVER (ORDER BY id) AS rn
+        FROM institutions WHERE external_source = 'benchwl'
+    ) i
+    WHERE i.rn <= :communities
+    """,
+    """
+    INSERT INTO community_posts (community_id, author_user_id, content, status)
+    SELECT c.id, u.ids[1 + (g * 7919 + c.id) % cardinality(u.ids)],
+           repeat('벤치 부하 게시글 ', 6) || g, 'active'
+    FROM (SELECT id FROM communities WHERE name = 'benchwl') c
+    CROSS JOIN generate_series(1, :posts) g
+    CROSS JOIN (
+        SELECT array_agg(id) AS ids FROM users WHERE login_id LIKE 'benchwl\\_%'
+    ) u
+    """,
+    "ANALYZE institutions, users, communities, community_posts",
+]
+
+DROP_SQL = [
+    "DELETE FROM community_posts WHERE community_id IN "
+    "(SELECT id FROM communities WHERE name = 'benchwl')",
+    "DELETE FROM communities WHERE name = 'benchwl'",
+    "DELETE FROM users WHERE login_id LIKE 'benchwl\\_%'",
+    "DELETE FROM institutions WHERE external_source = 'benchwl'",
+]
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight)
+    unknown = set(mix) - {"signup", "login", "search", "post", "feed"}
+    if unknown:
+        raise SystemExit(f"알 수 없는 작업: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def seed(args) -> list[int]:
+    started = time.perf_counter()
+    password_hash = security.get_password_hash(PASSWORD)
+    params = {
+        "cities": CITIES,
+        "institutions": args.institutions,
+        "users": args.users,
+        "communities": args.communities,
+        "posts": args.posts,
+        "password_hash": password_hash,
+    }
+    with engine.begin() as conn:
+        for sql in DROP_SQL + SEED_SQL:
+            conn.execute(text(sql), params)
+        community_ids = list(
+            conn.execute(
+                text("SELECT id FROM communities WHERE name = 'benchwl' ORDER BY id")
+            ).scalars()
+        )
+    print(
+        f"[bench_workload] 시드 완료 {time.perf_counter() - started:.1f}s "
+        f"(유저 {args.users}, 학교 {args.institutions}, "
+        f"커뮤니티 {len(community_ids)} x 글 {args.posts})"
+    )
+    return community_ids
+
+
+def drop() -> None:
+    with engine.begin() as conn:
+        for sql in DROP_SQL:
+            conn.execute(text(sql))
+
+
+class Workload:
+    def __init__(self, args, community_ids: list[int]) -> None:
+        self.args = args
+        self.community_ids = community_ids
+        self.mix = parse_mix(args.mix)
+        self.remaining = args.requests
+        self.signups = 0
+        # 작업 → [(지연 ms, SQL 수, 성공 여부)]
+        self.samples: dict[str, list[tuple[float, int, bool]]] = defaultdict(list)
+
+    def request_for(self, kind: str, rng: random.Random, auth: dict):
+        if kind == "signup":
+            self.signups += 1
+            login_id = f"benchwl_new{self.signups}_{rng.randrange(10**9)}"
+            body = {
+                "login_id": login_id,
+                "password": PASSWORD,
+                "real_name": "벤치",
+                "nickname": login_id,
+                "birth_year": 1990,
+            }
+            return "POST", "/users/", {"json": body}
+        if kind == "login":
+            login_id = f"benchwl_{rng.randrange(self.args.users)}"
+            form = {"username": login_id, "password": PASSWORD}
+            return "POST", "/token", {"data": form}
+        if kind == "search":
+            params = {
+                "q": f"벤치부하학교{rng.randrange(1, 100)}",
+                "city": rng.choice(CITIES),
+                "limit": 20,
+            }
+            return "GET", "/institutions/search", {"params": params}
+        community_id = rng.choice(self.community_ids)
+        url = f"/communities/{community_id}/posts"
+        if kind == "post":
+            body = {"community_id": community_id, "content": "벤치 부하 새 글"}
+            return "POST", url, {"json": body, "headers": auth}
+        return "GET", url, {"params": {"limit": 50}, "headers": auth}
+
+    async def virtual_user(self, client: httpx.AsyncClient, index: int) -> None:
+        rng = random.Random(self.args.seed * 1000 + index)
+        token = security.create_access_token({"sub": f"benchwl_{index}"})
+        auth = {"Authorization": f"Bearer {token}"}
+        kinds, weights = list(self.mix), list(self.mix.values())
+        while self.remaining > 0:
+            self.remaining -= 1
+            kind = rng.choices(kinds, weights)[0]
+            method, url, kwargs = self.request_for(kind, rng, auth)
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            elapsed = (time.perf_counter() - started) * 1000
+            sql = int(response.headers.get("x-query-count", 0))
+            self.samples[kind].append((elapsed, sql, response.status_code < 400))
+
+    async def run(self) -> float:
+        transport = httpx.ASGITransport(app=app_main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        ) as client:
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(self.virtual_user(client, i) for i in range(self.args.concurrency))
+            )
+            return time.perf_counter() - started
+
+
+def _percentiles(latencies: list[float]) -> dict[str, float]:
+    if len(latencies) == 1:
+        return {f"p{q}_ms": round(latencies[0], 2) for q in (50, 95, 99)}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {f"p{q}_ms": round(cuts[q - 1], 2) for q in (50, 95, 99)}
+
+
+def summarize(samples: dict, wall: float) -> dict:
+    summary = {}
+    every = []
+    for kind, rows in sorted(samples.items()):
+        every.extend(rows)
+        latencies = [row[0] for row in rows]
+        summary[kind] = {
+            "count": len(rows),
+            "throughput_rps": round(len(rows) / wall, 2),
+            **_percentiles(latencies),
+            "sql_per_request": round(sum(row[1] for row in rows) / len(rows), 2),
+            "error_rate": round(sum(not row[2] for row in rows) / len(rows), 4),
+        }
+    summary["total"] = {
+        "count": len(every),
+        "throughput_rps": round(len(every) / wall, 2),
+        **_percentiles([row[0] for row in every]),
+        "sql_per_request": round(sum(row[1] for row in every) / len(every), 2),
+        "error_rate": round(sum(not row[2] for row in every) / len(every), 4),
+    }
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="혼합 부하 벤치마크 (고정 동시성)")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--institutions", type=int, default=1000)
+    parser.add_argument("--communities", type=int, default=20)
+    parser.add_argument("--posts", type=int, default=200, help="커뮤니티당 글 수")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="끝나고 시드를 지우지 않음")
+    results.add_arguments(parser, "workload", tolerance=0.5)
+    args = parser.parse_args()
+
+    metrics.DEBUG_HEADER = True
+    metrics.SLOW_REQUEST_MS = float("inf")
+    community_ids = seed(args)
+    workload = Workload(args, community_ids)
+    try:
+        wall = asyncio.run(workload.run())
+    finally:
+        if not args.keep:
+            drop()
+
+    summary = summarize(workload.samples, wall)
+    print(
+        f"[bench_workload] requests={args.requests} concurrency={args.concurrency} "
+        f"{wall:.1f}s"
+    )
+    for kind, row in summary.items():
+        print(
+            f"  {kind:7s} {row['count']:5d}건 {row['throughput_rps']:7.1f} rps  "
+            f"p50 {row['p50_ms']:7.1f}  p95 {row['p95_ms']:7.1f}  "
+            f"p99 {row['p99_ms']:7.1f}ms  "
+            f"SQL {row['sql_per_request']:4.1f}  오류 {row['error_rate']:.1%}"
+        )
+
+    config = {
+        key: getattr(args, key)
+        for key in (
+            "users",
+            "institutions",
+            "communities",
+            "posts",
+            "requests",
+            "concurrency",
+            "mix",
+            "seed",
+        )
+    }
+    results.finish({"name": "workload", "config": config, "metrics": summary}, args)
+
+
+if __name__ == "__main__":
+    main()
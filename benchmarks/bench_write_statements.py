@@ -0,0 +1,199 @@
+# path: benchmarks/bench_write_statements.py
+"""
+쓰기 엔드포인트별 SQL 문장 수 / 트랜잭션(commit) 수 점검.
+
+- engine 의 before_cursor_execute / commit 이벤트로 요청 하나가 보낸
+  SQL 문장 수와 commit 수를 센다. (인증 유저 조회 SELECT 1회 포함)
+- TestClient 로 main.app 의 쓰기 엔드포인트를 차례로 호출한다.
+  'benchw_' 접두사 유저 / 'benchwrite' 학교를 만들고 끝나면 지운다.
+- --check: EXPECTED 상한을 넘는 엔드포인트가 있으면 종료 코드 1
+  (commit → refresh 왕복이 다시 생기면 여기서 걸린다)
+
+사용법:
+    python -m benchmarks.bench_write_statements --check
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+import main as app_main
+from database import engine
+
+# 엔드포인트 → (SQL 문장 수 상한, commit 수 상한)
+# (유저/커뮤니티 ETag 버전 올리기 UPDATE 1회 포함)
+EXPECTED = {
+    "POST /users/": (3, 1),
+    "PUT /users/me/profile": (4, 1),
+    "POST /users/me/school-anchors": (7, 1),
+    "POST /users/me/keywords": (6, 1),
+    "POST /users/{id}/friend-request": (6, 1),
+    "POST /users/{id}/friend-accept": (4, 1),
+    "POST /communities/": (3, 1),
+    "POST /communities/{id}/posts": (3, 1),
+}
+
+DROP_SQL = [
+    "DELETE FROM users WHERE login_id LIKE 'benchw\\_%'",
+    "DELETE FROM institutions WHERE external_source = 'benchwrite'",
+    "DELETE FROM keywords WHERE keyword_normalized LIKE '벤치키워드%'",
+]
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.statements = 0
+        self.commits = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+
+    def _on_execute(self, *args) -> None:
+        self.statements += 1
+
+    def _on_commit(self, *args) -> None:
+        self.commits += 1
+
+    def reset(self) -> None:
+        self.statements = 0
+        self.commits = 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="쓰기 엔드포인트 SQL 문장 수 점검")
+    parser.add_argument("--check", action="store_true", help="상한 초과 시 실패")
+    args = parser.parse_args()
+
+    client = TestClient(app_main.app)
+    suffix = uuid.uuid4().hex[:8]
+    with engine.begin() as conn:
+        institution_id = conn.execute(
+            text(
+                "INSERT INTO institutions (external_source, external_id, name, "
+                "institution_type) VALUES ('benchwrite', :suffix, '벤치쓰기학교', "
+                "'school') RETURNING id"
+            ),
+            {"suffix": suffix},
+        ).scalar_one()
+
+    counter = StatementCounter()
+    results = {}
+
+    def call(name: str, method: str, url: str, headers=None, **kwargs):
+        counter.reset()
+        response = client.request(method, url, headers=headers, **kwargs)
+        assert response.status_code < 300, f"{name}: {response.text}"
+        results[name] = (counter.statements, counter.commits)
+        return response
+
+    def signup(login_id: str) -> tuple[int, dict]:
+        user = call(
+            "POST /users/",
+            "POST",
+            "/users/",
+            json={
+                "login_id": login_id,
+                "password": "pw",
+                "real_name": "벤치",
+                "nickname": login_id,
+                "birth_year": 1990,
+            },
+        ).json()
+        token = client.post(
+            "/token", data={"username": login_id, "password": "pw"}
+        ).json()["access_token"]
+        return user["id"], {"Authorization": f"Bearer {token}"}
+
+    try:
+        user_a, auth_a = signup(f"benchw_a{suffix}")
+        user_b, auth_b = signup(f"benchw_b{suffix}")
+
+        call(
+            "PUT /users/me/profile",
+            "PUT",
+            "/users/me/profile",
+            auth_a,
+            json={"residence_city": "서울특별시"},
+        )
+        call(
+            "POST /users/me/school-anchors",
+            "POST",
+            "/users/me/school-anchors",
+            auth_a,
+            json={
+                "institution_id": institution_id,
+                "school_level": "high",
+                "entry_year": 2006,
+            },
+        )
+        call(
+            "POST /users/me/keywords",
+            "POST",
+            "/users/me/keywords",
+            auth_a,
+            # 매번 새 키워드 → 사전 조회 + 사전 INSERT 까지 포함한 상한
+            json={"keyword": f"벤치키워드{suffix}", "weight": 1},
+        )
+        call(
+            "POST /users/{id}/friend-request",
+            "POST",
+            f"/users/{user_b}/friend-request",
+            auth_a,
+        )
+        call(
+            "POST /users/{id}/friend-accept",
+            "POST",
+            f"/users/{user_a}/friend-accept",
+            auth_b,
+        )
+        community = call(
+            "POST /communities/",
+            "POST",
+            "/communities/",
+            auth_a,
+            json={
+                "institution_id": institution_id,
+                "school_level": "high",
+                "entry_year": 1990,
+                "name": "벤치쓰기",
+            },
+        ).json()
+        call(
+            "POST /communities/{id}/posts",
+            "POST",
+            f"/communities/{community['id']}/posts",
+            auth_a,
+            json={"community_id": community["id"], "content": "벤치 글"},
+        )
+    finally:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "DELETE FROM communities WHERE institution_id IN (SELECT id "
+                    "FROM institutions WHERE external_source = 'benchwrite')"
+                )
+            )
+            for sql in DROP_SQL:
+                conn.execute(text(sql))
+
+    failed = False
+    print("[bench_write_statements] 엔드포인트별 SQL 문장 수 / commit 수")
+    for name, (statements, commits) in results.items():
+        max_statements, max_commits = EXPECTED[name]
+        over = statements > max_statements or commits > max_commits
+        failed |= over
+        print(
+            f"  {name:34s} SQL {statements:2d} (상한 {max_statements})  "
+            f"commit {commits} (상한 {max_commits}){'  ← 초과' if over else ''}"
+        )
+
+    if args.check and failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# path: benchmarks/results.py
+"""
+벤치마크 결과 JSON 저장 / 기준선(baseline) 비교 (bench_workload, bench_micro 공용).
+
+- 결과는 {"name", "config", "metrics": {항목: {지표: 값}}} 모양의 JSON.
+- 기준선은 benchmarks/baselines/<name>.json (--update-baseline 으로 갱신).
+  같은 기계/설정에서 잰 값끼리만 의미가 있으므로 config 가 다르면 경고만 하고 비교한다.
+- 지표 이름으로 방향을 정한다.
+  - *_ms, *_us        : 클수록 나쁨, 기준선 x (1 + tolerance) 초과면 회귀
+  - *_rps             : 작을수록 나쁨, 기준선 x (1 - tolerance) 미만이면 회귀
+  - sql_per_request   : 기준선 + 0.5 초과면 회귀 (시간과 달리 기계를 타지 않음)
+  - error_rate        : 기준선 + 0.01 초과면 회귀
+- 회귀가 하나라도 있으면 종료 코드 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from typing import List
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+SQL_SLACK = 0.5
+ERROR_RATE_SLACK = 0.01
+
+
+def add_arguments(
+    parser: argparse.ArgumentParser, name: str, tolerance: float = 0.3
+) -> None:
+    parser.add_argument("--output", help="결과 JSON 경로")
+    parser.add_argument(
+        "--baseline",
+        default=os.path.join(BASELINE_DIR, f"{name}.json"),
+        help="비교할 기준선 JSON",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="이번 결과로 기준선 덮어쓰기"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=tolerance,
+        help="시간/처리량 지표 허용 비율 (조용한 기계면 더 좁혀도 된다)",
+    )
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """기준선 대비 나빠진 지표 목록 (사람이 읽는 문장)"""
+    regressions = []
+    for item, base_metrics in baseline["metrics"].items():
+        now_metrics = current["metrics"].get(item)
+        if now_metrics is None:
+            continue
+        for metric, base in base_metrics.items():
+            now = now_metrics.get(metric)
+            if now is None:
+                continue
+            if metric.endswith(("_ms", "_us")):
+                worse = now > base * (1 + tolerance)
+            elif metric.endswith("_rps"):
+                worse = now < base * (1 - tolerance)
+            elif metric == "sql_per_request":
+                worse = now > base + SQL_SLACK
+            elif metric == "error_rate":
+                worse = now > base + ERROR_RATE_SLACK
+            else:
+                continue
+            if worse:
+                regressions.append(f"{item} {metric}: {base:g} → {now:g}")
+    return regressions
+
+
+def finish(result: dict, args: argparse.Namespace) -> None:
+    """결과 저장 → 기준선 비교(또는 갱신) → 회귀가 있으면 exit 1"""
+    if args.output:
+        _write(args.output, result)
+        print(f"[{result['name']}] 결과 저장: {args.output}")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        _write(args.baseline, result)
+        print(f"[{result['name']}] 기준선 갱신: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"[{result['name']}] 기준선 없음 ({args.baseline}) → 비교 생략")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("config") != result.get("config"):
+        print(
+            f"[{result['name']}] 경고: 기준선과 설정이 다릅니다 {baseline.get('config')}"
+        )
+
+    regressions = compare(result, baseline, args.tolerance)
+    if regressions:
+        print(
+            f"[{result['name']}] 회귀 {len(regressions)}건 (허용 {args.tolerance:.0%})"
+        )
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print(f"[{result['name']}] 기준선 대비 회귀 없음 (허용 {args.tolerance:.0%})")
+
+
+def _write(path: str, result: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
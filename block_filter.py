@@ -0,0 +1,123 @@
+# path: block_filter.py
+"""
+차단(user_blocks) 기반 필터.
+
+- 유저별 "차단한 + 나를 차단한" 유저 id 를 정렬된 int64 배열로 캐시한다 (LRU + TTL).
+- 피드 / 추천 결과는 DB anti-join 대신 메모리에서 이진 탐색(np.searchsorted)으로 걸러낸다.
+- 캐시는 워커(프로세스)마다 따로다. 차단/해제 시 crud 가 부르는 invalidate 는 그 워커에만 닿는다.
+  그래서 항목에 읽을 때의 users.data_version 을 같이 저장하고, 요청한 유저의 data_version 과
+  다르면 다시 읽는다. 차단/해제는 양쪽 유저의 data_version 을 올리므로 (crud.block_user)
+  다른 워커도 다음 요청에서 바로 새 목록을 본다. version 없이 부르면 TTL 로만 갱신.
+- 읽는 도중 invalidate 가 끼어들면 (세대 번호가 바뀜) 읽은 값을 캐시에 넣지 않는다.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+import numpy as np
+from sqlalchemy import select, union
+from sqlalchemy.orm import Session
+
+import models
+
+T = TypeVar("T")
+
+CACHE_MAX_USERS = 100_000
+CACHE_TTL_SECONDS = 60.0
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+class BlockCache:
+    def __init__(
+        self, max_users: int = CACHE_MAX_USERS, ttl_seconds: float = CACHE_TTL_SECONDS
+    ) -> None:
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        # user_id → (읽은 시각, data_version, 차단 id 배열)
+        self._entries: "OrderedDict[int, tuple[float, Optional[int], np.ndarray]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        # invalidate 마다 +1
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, db: Session, user_id: int) -> np.ndarray:
+        blocked = select(models.UserBlock.blocked_user_id).where(
+            models.UserBlock.blocker_user_id == user_id
+        )
+        blocked_by = select(models.UserBlock.blocker_user_id).where(
+            models.UserBlock.blocked_user_id == user_id
+        )
+        ids = db.execute(union(blocked, blocked_by)).scalars().all()
+        if not ids:
+            return _EMPTY
+        return np.unique(np.array(ids, dtype=np.int64))
+
+    def get(
+        self, db: Session, user_id: int, version: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        user_id 와 서로 보이면 안 되는 유저 id (정렬된 배열).
+        version: 요청한 유저의 data_version (다르면 캐시를 버리고 다시 읽는다)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if (
+                entry is not None
+                and now - entry[0] < self.ttl_seconds
+                and (version is None or entry[1] == version)
+            ):
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            generation = self._generation
+
+        ids = self._load(db, user_id)
+        with self._lock:
+            if generation != self._generation:
+                # 읽는 사이 차단/해제가 있었다 → 이번 값은 캐시하지 않는다
+                return ids
+            self._entries[user_id] = (now, version, ids)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return ids
+
+    def invalidate(self, *user_ids: int) -> None:
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def filter(
+        self,
+        db: Session,
+        user_id: int,
+        items: Sequence[T],
+        key: Callable[[T], int],
+        version: Optional[int] = None,
+    ) -> List[T]:
+        """items 중 key(item) 이 차단 관계인 것을 뺀다 (순서 유지)."""
+        blocked = self.get(db, user_id, version)
+        if len(blocked) == 0 or not items:
+            return list(items)
+
+        # 정렬 배열 이진 탐색: 페이지 크기 x log(차단 수)
+        keys = np.fromiter((key(item) for item in items), np.int64, len(items))
+        positions = np.searchsorted(blocked, keys)
+        hit = blocked[np.minimum(positions, len(blocked) - 1)] == keys
+        return [
+            item for item, blocked_hit in zip(items, hit.tolist()) if not blocked_hit
+        ]
+
+
+block_cache = BlockCache()
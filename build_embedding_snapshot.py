@@ -0,0 +1,44 @@
+# path: build_embedding_snapshot.py
+"""
+프로필 임베딩 IVF 스냅샷 빌드 스크립트.
+
+- user_profiles.matching_embedding 전체를 읽어 IVF 인덱스를 만들고
+  EMBEDDING_SNAPSHOT_PATH (기본: embedding_index.snapshot) 에 원자적으로 교체 저장한다.
+- 실행 중인 서버 워커들은 다음 검색 때 새 파일을 memmap 으로 다시 연다.
+
+사용법:
+    python build_embedding_snapshot.py [--path embedding_index.snapshot]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from sqlalchemy.orm import Session
+
+import embedding_index
+from database import SessionLocal
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="임베딩 IVF 스냅샷 빌드")
+    parser.add_argument("--path", default=embedding_index.SNAPSHOT_PATH)
+    args = parser.parse_args()
+
+    db: Session | None = None
+    try:
+        db = SessionLocal()
+        started = time.perf_counter()
+        count = embedding_index.build_snapshot_from_db(db, path=args.path)
+        print(
+            f"[build_embedding_snapshot] 벡터 {count}개 → {args.path} "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+    finally:
+        if db is not None:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# path: build_snapshots.py
+"""
+공유 스냅샷 빌드 스크립트 (shared_snapshot).
+
+- SNAPSHOT_DIR (기본: snapshots/) 아래에 세 파일을 원자적으로 교체 저장한다.
+  - institution_codebook.snapshot  : 활성 학교 코드북 (/institutions/search)
+  - keyword_autocomplete.snapshot  : 인기 키워드 자동완성 목록 (/keywords/autocomplete)
+  - moderation_automaton.snapshot  : 금칙어 오토마톤 (moderation_terms.txt 컴파일 결과)
+- 내용이 같으면 파일을 건드리지 않는다. 바뀌었으면 실행 중인 워커들이
+  mtime 을 보고 새 파일을 다시 연다 (재시작 불필요).
+- serve.py 마스터도 시작할 때와 --refresh-seconds 마다 같은 함수를 부른다.
+
+사용법:
+    python build_snapshots.py [--dir snapshots] [--only keyword_autocomplete]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import institution_codebook
+import keyword_dictionary
+import moderation
+import shared_snapshot
+from database import SessionLocal
+
+DEFAULT_DIR = "snapshots"
+
+SNAPSHOTS = (
+    institution_codebook.SNAPSHOT_NAME,
+    keyword_dictionary.SNAPSHOT_NAME,
+    moderation.SNAPSHOT_NAME,
+)
+
+
+def build(name: str, path: str) -> int:
+    if name == moderation.SNAPSHOT_NAME:
+        return moderation.build_automaton_snapshot(path)
+
+    db = SessionLocal()
+    try:
+        if name == institution_codebook.SNAPSHOT_NAME:
+            return institution_codebook.build_snapshot_from_db(db, path)
+        return keyword_dictionary.build_autocomplete_snapshot(db, path)
+    finally:
+        db.close()
+
+
+def build_all(
+    directory: str, names: Optional[Sequence[str]] = None
+) -> Dict[str, Tuple[int, float]]:
+    """스냅샷들을 빌드한다. 반환값: 이름 → (항목 수, 걸린 초)"""
+    results = {}
+    for name in names or SNAPSHOTS:
+        started = time.perf_counter()
+        path = os.path.join(directory, f"{name}.snapshot")
+        results[name] = (build(name, path), time.perf_counter() - started)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="공유 스냅샷 빌드")
+    parser.add_argument("--dir", default=shared_snapshot.SNAPSHOT_DIR or DEFAULT_DIR)
+    parser.add_argument("--only", choices=SNAPSHOTS, action="append")
+    args = parser.parse_args()
+
+    for name, (count, seconds) in build_all(args.dir, args.only).items():
+        print(
+            f"[build_snapshots] {name}: {count}개 → "
+            f"{os.path.join(args.dir, name)}.snapshot ({seconds:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,23 @@
 # path: crud.py
-from typing import Optional, List
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Sequence
 
-from sqlalchemy.orm import Session
+from sqlalchemy import BigInteger, all_, and_, case, cast, func, or_, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+import block_filter
+import embedding_index
+import friend_graph
+import institution_codebook
+import keyword_affinity
+from keyword_dictionary import keyword_dictionary
+import matching
 import models
 import schemas
 import security
+import text_normalize
 
 
 # ============================================================
@@ -21,6 +33,18 @@ def get_user_by_email(db: Session, email: str) -> Optional[models.User]:
     return db.query(models.User).filter(models.User.email == email).first()
 
 
+def get_nicknames(db: Session, user_ids: List[int]) -> dict[int, str]:
+    """user_id 목록 → {user_id: nickname} (탈퇴/비활성 유저 제외)"""
+    if not user_ids:
+        return {}
+    rows = db.query(models.User.id, models.User.nickname).filter(
+        models.User.id.in_(user_ids),
+        models.User.is_deleted.is_(False),
+        models.User.status == "active",
+    )
+    return dict(rows.all())
+
+
 def create_user(db: Session, user_in: schemas.UserCreate) -> models.User:
     hashed_pw = security.get_password_hash(user_in.password)
 
@@ -34,17 +58,126 @@ def create_user(db: Session, user_in: schemas.UserCreate) -> models.User:
         birth_year=user_in.birth_year,
         gender=user_in.gender,
         # 기본값: status='active', signup_step=4
+        # 기본 프로필 빈 값도 같은 트랜잭션에서 생성
+        profile=models.UserProfile(),
     )
+    # INSERT users ... RETURNING (id, 서버 기본값) → INSERT user_profiles, commit 1회
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
+    return db_user
 
-    # 기본 프로필 빈 값 생성
-    profile = models.UserProfile(user_id=db_user.id)
-    db.add(profile)
+
+def bump_user_versions(db: Session, *user_ids: int) -> None:
+    """
+    users.data_version +1 (/users/me* ETag 가 바뀐다).
+    내 데이터를 바꾸는 쓰기와 같은 트랜잭션에서 호출. commit 은 호출하는 쪽에서 한다.
+    """
+    db.query(models.User).filter(models.User.id.in_(user_ids)).update(
+        {models.User.data_version: models.User.data_version + 1},
+        synchronize_session=False,
+    )
+
+
+def block_user(
+    db: Session, blocker_user_id: int, blocked_user_id: int, reason: Optional[str]
+) -> None:
+    stmt = (
+        insert(models.UserBlock)
+        .values(
+            blocker_user_id=blocker_user_id,
+            blocked_user_id=blocked_user_id,
+            reason=reason,
+        )
+        .on_conflict_do_nothing(constraint="uq_user_blocks")
+    )
+    if db.execute(stmt).rowcount:
+        # 차단은 양쪽 목록(차단 목록 / 게시글 필터)에 모두 영향
+        bump_user_versions(db, blocker_user_id, blocked_user_id)
     db.commit()
+    block_filter.block_cache.invalidate(blocker_user_id, blocked_user_id)
 
-    return db_user
+
+def unblock_user(db: Session, blocker_user_id: int, blocked_user_id: int) -> bool:
+    deleted = (
+        db.query(models.UserBlock)
+        .filter(
+            models.UserBlock.blocker_user_id == blocker_user_id,
+            models.UserBlock.blocked_user_id == blocked_user_id,
+        )
+        .delete(synchronize_session=False)
+    )
+    if deleted:
+        bump_user_versions(db, blocker_user_id, blocked_user_id)
+    db.commit()
+    block_filter.block_cache.invalidate(blocker_user_id, blocked_user_id)
+    return deleted > 0
+
+
+def list_user_blocks(db: Session, user_id: int) -> List[models.UserBlock]:
+    return (
+        db.query(models.UserBlock)
+        .filter(models.UserBlock.blocker_user_id == user_id)
+        .order_by(models.UserBlock.created_at.desc())
+        .all()
+    )
+
+
+def get_friendship_between(
+    db: Session, user_a: int, user_b: int
+) -> Optional[models.UserFriendship]:
+    """두 유저 사이의 친구 요청/관계 (방향 무관)"""
+    return (
+        db.query(models.UserFriendship)
+        .filter(
+            or_(
+                and_(
+                    models.UserFriendship.user_id == user_a,
+                    models.UserFriendship.friend_user_id == user_b,
+                ),
+                and_(
+                    models.UserFriendship.user_id == user_b,
+                    models.UserFriendship.friend_user_id == user_a,
+                ),
+            )
+        )
+        .first()
+    )
+
+
+def create_friend_request(
+    db: Session, user_id: int, friend_user_id: int
+) -> models.UserFriendship:
+    friendship = models.UserFriendship(user_id=user_id, friend_user_id=friend_user_id)
+    db.add(friendship)
+    bump_user_versions(db, user_id, friend_user_id)
+    db.commit()
+    return friendship
+
+
+def accept_friend_request(
+    db: Session, friendship: models.UserFriendship
+) -> models.UserFriendship:
+    friendship.status = "accepted"
+    bump_user_versions(db, friendship.user_id, friendship.friend_user_id)
+    db.commit()
+
+    # 친구 그래프 CSR 에 증분 반영
+    friend_graph.on_friendship_accepted(friendship.user_id, friendship.friend_user_id)
+    return friendship
+
+
+def list_incoming_friend_requests(
+    db: Session, user_id: int
+) -> List[models.UserFriendship]:
+    return (
+        db.query(models.UserFriendship)
+        .filter(
+            models.UserFriendship.friend_user_id == user_id,
+            models.UserFriendship.status == "pending",
+        )
+        .order_by(models.UserFriendship.created_at.desc())
+        .all()
+    )
 
 
 # ============================================================
@@ -55,46 +188,110 @@ def create_user(db: Session, user_in: schemas.UserCreate) -> models.User:
 def upsert_user_profile(
     db: Session, user_id: int, profile_in: schemas.UserProfileUpdate
 ) -> models.UserProfile:
+    """INSERT ... ON CONFLICT DO UPDATE ... RETURNING 한 번으로 조회 없이 저장"""
+    values = profile_in.model_dump(exclude_unset=True)
+    table = models.UserProfile.__table__
+    stmt = insert(table).values(user_id=user_id, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={field: stmt.excluded[field] for field in values}
+        or {"user_id": stmt.excluded.user_id},
+    ).returning(models.UserProfile)
+    profile = db.scalars(
+        select(models.UserProfile).from_statement(stmt),
+        execution_options={"populate_existing": True},
+    ).one()
+
+    enqueue_recommendation_refresh(db, user_id)
+    bump_user_versions(db, user_id)
+    db.commit()
+    return profile
+
+
+def set_profile_embedding(
+    db: Session,
+    user_id: int,
+    vector: Sequence[float],
+    model: str,
+    model_version: Optional[str] = None,
+    commit: bool = True,
+) -> models.UserProfile:
+    """
+    임베딩을 float32 바이너리로 저장한다. (IVF 스냅샷은 다음 빌드 때 반영)
+    여러 건을 한 트랜잭션으로 넣을 때는 commit=False 로 부르고 호출하는 쪽에서 commit.
+    """
     profile = db.get(models.UserProfile, user_id)
     if not profile:
         profile = models.UserProfile(user_id=user_id)
 
-    for field, value in profile_in.model_dump(exclude_unset=True).items():
-        setattr(profile, field, value)
+    profile.matching_embedding = embedding_index.encode_vector(vector)
+    profile.embedding_model = model
+    profile.embedding_model_version = model_version
+    profile.embedding_dimension = len(vector)
+    profile.embedded_at = datetime.now(timezone.utc)
 
     db.add(profile)
-    db.commit()
-    db.refresh(profile)
+    if commit:
+        db.commit()
     return profile
 
 
 def create_user_school_anchor(
     db: Session, user_id: int, anchor_in: schemas.UserSchoolAnchorCreate
-) -> models.UserSchoolAnchor:
+) -> dict:
+    return bulk_create_user_school_anchors(db, user_id, [anchor_in])[0]
+
+
+def bulk_create_user_school_anchors(
+    db: Session, user_id: int, anchors_in: List[schemas.UserSchoolAnchorCreate]
+) -> List[dict]:
+    """
+    기존 primary 내리기 + multi-row INSERT ... RETURNING + 커뮤니티 배정 + 추천 갱신 예약을
+    한 트랜잭션(commit 1회)으로 처리한다.
+    primary 는 한 건씩 차례로 넣은 것과 같게 마지막으로 is_primary 인 항목만 남긴다.
+    """
+    if not anchors_in:
+        return []
+
+    primary_index = max(
+        (i for i, anchor_in in enumerate(anchors_in) if anchor_in.is_primary),
+        default=None,
+    )
     # 유저의 기존 primary anchor는 is_primary=false 로 변경
-    if anchor_in.is_primary:
+    if primary_index is not None:
         (
             db.query(models.UserSchoolAnchor)
             .filter(
                 models.UserSchoolAnchor.user_id == user_id,
                 models.UserSchoolAnchor.is_primary.is_(True),
             )
-            .update({"is_primary": False})
+            .update({"is_primary": False}, synchronize_session=False)
         )
 
-    anchor = models.UserSchoolAnchor(
-        user_id=user_id,
-        institution_id=anchor_in.institution_id,
-        school_level=anchor_in.school_level,
-        entry_year=anchor_in.entry_year,
-        graduation_year=anchor_in.graduation_year,
-        is_primary=anchor_in.is_primary,
+    rows = [
+        {
+            **anchor_in.model_dump(),
+            "user_id": user_id,
+            "is_primary": i == primary_index,
+        }
+        for i, anchor_in in enumerate(anchors_in)
+    ]
+    table = models.UserSchoolAnchor.__table__
+    created = db.execute(insert(table).values(rows).returning(*table.c)).mappings()
+    created = sorted((dict(row) for row in created), key=lambda row: row["id"])
+
+    # 앵커에 해당하는 커뮤니티 자동 배정 (같은 트랜잭션)
+    assign_communities_for_anchors(
+        db,
+        anchor_id_from=created[0]["id"],
+        anchor_id_to=created[-1]["id"],
+        bump_versions=False,  # 아래에서 어차피 올린다
     )
+    enqueue_recommendation_refresh(db, user_id)
+    bump_user_versions(db, user_id)
 
-    db.add(anchor)
     db.commit()
-    db.refresh(anchor)
-    return anchor
+    return created
 
 
 def list_user_school_anchors(
@@ -111,18 +308,107 @@ def list_user_school_anchors(
     )
 
 
+def bulk_create_user_school_histories(
+    db: Session, user_id: int, histories_in: List[schemas.UserSchoolHistoryCreate]
+) -> List[dict]:
+    """
+    학교 이력 여러 건을 한 트랜잭션, 한 번의 multi-row INSERT ... RETURNING 으로 넣는다.
+    반, 담임, 동아리는 정규화 키도 같이 저장한다.
+    """
+    rows = [
+        {
+            **history_in.model_dump(),
+            "user_id": user_id,
+            "class_group_key": text_normalize.normalize_class_group(
+                history_in.class_group
+            ),
+            "homeroom_teacher_key": text_normalize.normalize_teacher(
+                history_in.homeroom_teacher
+            ),
+            "club_name_key": text_normalize.normalize_club(history_in.club_name),
+        }
+        for history_in in histories_in
+    ]
+    if not rows:
+        return []
+
+    table = models.UserSchoolHistory.__table__
+    created = db.execute(insert(table).values(rows).returning(*table.c)).mappings()
+    created = [dict(row) for row in created]
+    bump_user_versions(db, user_id)
+    db.commit()
+    return created
+
+
+def list_user_school_histories(
+    db: Session, user_id: int
+) -> List[models.UserSchoolHistory]:
+    return (
+        db.query(models.UserSchoolHistory)
+        .filter(models.UserSchoolHistory.user_id == user_id)
+        .order_by(
+            models.UserSchoolHistory.start_year,
+            models.UserSchoolHistory.grade,
+        )
+        .all()
+    )
+
+
 def add_user_keyword(
     db: Session, user_id: int, keyword_in: schemas.UserKeywordCreate
-) -> models.UserKeyword:
-    kw = models.UserKeyword(
-        user_id=user_id,
-        keyword=keyword_in.keyword,
-        weight=keyword_in.weight,
+) -> dict:
+    return bulk_add_user_keywords(db, user_id, [keyword_in])[0]
+
+
+def bulk_add_user_keywords(
+    db: Session, user_id: int, keywords_in: List[schemas.UserKeywordCreate]
+) -> List[dict]:
+    """
+    키워드를 사전 id 로 바꿔서 한 번에 저장한다. 같은 키워드(정규화 기준)를 다시 넣으면
+    weight 만 갱신하고, 요청 안에서 겹치면 뒤쪽 weight 를 쓴다.
+    정규화 후 빈 키워드가 하나라도 있으면 아무것도 저장하지 않고 ValueError.
+    multi-row upsert ... RETURNING 을 CTE 로 감싸 사전 표기(keywords.keyword)까지
+    한 문장으로 받는다. 반환 순서는 요청 순서 (중복 제거 후).
+    """
+    keyword_ids = keyword_dictionary.intern_many(
+        db, [keyword_in.keyword for keyword_in in keywords_in]
+    )
+    weights: dict[int, Optional[int]] = {}
+    for keyword_id, keyword_in in zip(keyword_ids, keywords_in):
+        weights[keyword_id] = keyword_in.weight
+    if not weights:
+        return []
+
+    table = models.UserKeyword.__table__
+    stmt = insert(table).values(
+        [
+            {"user_id": user_id, "keyword_id": keyword_id, "weight": weight}
+            for keyword_id, weight in weights.items()
+        ]
     )
-    db.add(kw)
+    upserted = (
+        stmt.on_conflict_do_update(
+            constraint="uq_user_keywords", set_={"weight": stmt.excluded.weight}
+        )
+        .returning(*table.c)
+        .cte("upserted")
+    )
+    keyword = models.Keyword.__table__
+    rows = db.execute(
+        select(upserted, keyword.c.keyword).join(
+            keyword, keyword.c.id == upserted.c.keyword_id
+        )
+    ).mappings()
+    by_keyword_id = {row["keyword_id"]: dict(row) for row in rows}
+
+    enqueue_recommendation_refresh(db, user_id)
+    bump_user_versions(db, user_id)
     db.commit()
-    db.refresh(kw)
-    return kw
+
+    # 키워드 유사도 CSR 에 해당 유저 행만 증분 반영
+    for keyword_id, weight in weights.items():
+        keyword_affinity.on_keyword_added(user_id, keyword_id, weight)
+    return [by_keyword_id[keyword_id] for keyword_id in weights]
 
 
 def list_user_keywords(db: Session, user_id: int) -> List[models.UserKeyword]:
@@ -134,6 +420,117 @@ def list_user_keywords(db: Session, user_id: int) -> List[models.UserKeyword]:
     )
 
 
+_REFRESH_KEYWORD_COUNTS_SQL = text(
+    """
+    WITH counts AS (
+        SELECT k.id, COUNT(uk.id) AS cnt
+        FROM keywords k
+        LEFT JOIN user_keywords uk ON uk.keyword_id = k.id
+        GROUP BY k.id
+    )
+    UPDATE keywords k
+    SET user_count = counts.cnt
+    FROM counts
+    WHERE k.id = counts.id
+      AND k.user_count <> counts.cnt
+    """
+)
+
+
+def refresh_keyword_counts(db: Session) -> int:
+    """keywords.user_count 를 다시 센다 (자동완성 정렬용). 반환값: 바뀐 키워드 수"""
+    result = db.execute(_REFRESH_KEYWORD_COUNTS_SQL)
+    db.commit()
+    return result.rowcount
+
+
+def autocomplete_keywords(db: Session, prefix: str, limit: int = 10) -> List[dict]:
+    rows = keyword_dictionary.autocomplete(db, prefix, limit=limit)
+    return [
+        {"id": keyword_id, "keyword": keyword, "user_count": user_count}
+        for user_count, keyword, keyword_id in rows
+    ]
+
+
+def get_user_bootstrap(db: Session, user_id: int) -> dict:
+    """
+    앱 시작 묶음: 유저 + 프로필 + 앵커(학교명) + 키워드 + 가입한 커뮤니티.
+    쿼리 수는 데이터 양과 무관하게 4번:
+      users+user_profiles (joined) / 앵커+학교 (selectin, joined)
+      / 키워드+사전 (selectin, joined) / 커뮤니티
+    """
+    user = (
+        db.query(models.User)
+        .options(
+            joinedload(models.User.profile),
+            selectinload(models.User.school_anchors).joinedload(
+                models.UserSchoolAnchor.institution
+            ),
+            selectinload(models.User.keywords),
+        )
+        .filter(models.User.id == user_id)
+        .populate_existing()
+        .one()
+    )
+    communities = (
+        db.query(models.Community)
+        .join(
+            models.CommunityMember,
+            models.CommunityMember.community_id == models.Community.id,
+        )
+        .filter(models.CommunityMember.user_id == user_id)
+        .order_by(models.CommunityMember.joined_at)
+        .all()
+    )
+    # 목록 API (list_user_school_anchors / list_user_keywords) 와 같은 순서
+    anchors = sorted(
+        user.school_anchors, key=lambda a: (not a.is_primary, a.entry_year)
+    )
+    keywords = sorted(user.keywords, key=lambda k: k.created_at, reverse=True)
+    return {
+        "user": user,
+        "profile": user.profile,
+        "school_anchors": anchors,
+        "keywords": keywords,
+        "communities": communities,
+    }
+
+
+INSTITUTION_FIELDS = tuple(schemas.Institution.model_fields)
+
+
+def search_institutions(
+    db: Session,
+    q: Optional[str] = None,
+    city: Optional[str] = None,
+    district: Optional[str] = None,
+    limit: int = 20,
+) -> list:
+    """학교 검색. INSTITUTION_FIELDS 순서의 컬럼 튜플(Row) 목록"""
+    # 공유 스냅샷이 있으면 (serve.py) DB 를 거치지 않는다
+    codebook = institution_codebook.get_codebook()
+    if codebook is not None:
+        return codebook.search(q=q, city=city, district=district, limit=limit)
+
+    inst = models.Institution
+    query = db.query(*(getattr(inst, field) for field in INSTITUTION_FIELDS)).filter(
+        inst.is_active.is_(True)
+    )
+
+    if q:
+        # %, _ 는 와일드카드가 아니라 글자로 (코드북 스냅샷의 부분 일치와 같게)
+        escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = query.filter(inst.name.ilike(f"%{escaped}%", escape="\\"))
+
+    if city:
+        query = query.filter(inst.region_city == city)
+    if district:
+        query = query.filter(inst.region_district == district)
+
+    # 코드포인트 순서 (DB 기본 collation 이 아니라 코드북 스냅샷과 같은 순서)
+    return query.order_by(inst.name.collate("C"), inst.id).limit(limit).all()
+
+
 # ============================================================
 # 3. 커뮤니티 / 게시글 간단 버전
 # ============================================================
@@ -153,31 +550,525 @@ def create_community(
     )
     db.add(community)
     db.commit()
-    db.refresh(community)
     return community
 
 
+def get_community_by_key(
+    db: Session,
+    institution_id: int,
+    school_level: str,
+    entry_year: int,
+    residence_city: Optional[str] = None,
+    residence_district: Optional[str] = None,
+) -> Optional[models.Community]:
+    # uq_communities_key 인덱스와 같은 식(COALESCE)으로 조회해야 인덱스를 탄다
+    return (
+        db.query(models.Community)
+        .filter(
+            models.Community.institution_id == institution_id,
+            models.Community.school_level == school_level,
+            models.Community.entry_year == entry_year,
+            func.coalesce(models.Community.residence_city, "")
+            == (residence_city or ""),
+            func.coalesce(models.Community.residence_district, "")
+            == (residence_district or ""),
+        )
+        .first()
+    )
+
+
+# ------------------------------------------------------------
+# 앵커 → 커뮤니티 자동 배정 (set-based)
+#   - 앵커 id 범위 단위로 INSERT ... SELECT 를 실행한다. 유저별 루프 없음.
+#   - 거주지는 user_profiles 에서 가져온다 (없으면 NULL = 학교 전체 커뮤니티)
+#   - uq_communities_key / uq_community_members_user 덕분에
+#     ON CONFLICT DO NOTHING 으로 몇 번을 돌려도 결과가 같다 (idempotent)
+# ------------------------------------------------------------
+
+_ASSIGN_COMMUNITIES_SQL = text(
+    """
+    INSERT INTO communities (
+        institution_id, school_level, entry_year,
+        residence_city, residence_district, name
+    )
+    SELECT DISTINCT
+        a.institution_id, a.school_level, a.entry_year,
+        p.residence_city, p.residence_district,
+        i.name || ' ' || a.entry_year || '년 입학'
+    FROM user_school_anchors a
+    JOIN institutions i ON i.id = a.institution_id
+    LEFT JOIN user_profiles p ON p.user_id = a.user_id
+    WHERE a.id BETWEEN :anchor_id_from AND :anchor_id_to
+    ON CONFLICT DO NOTHING
+    """
+)
+
+_ASSIGN_MEMBERS_SQL = text(
+    """
+    INSERT INTO community_members (community_id, user_id)
+    SELECT DISTINCT c.id, a.user_id
+    FROM user_school_anchors a
+    LEFT JOIN user_profiles p ON p.user_id = a.user_id
+    JOIN communities c
+      ON c.institution_id = a.institution_id
+     AND c.school_level = a.school_level
+     AND c.entry_year = a.entry_year
+     AND COALESCE(c.residence_city, '') = COALESCE(p.residence_city, '')
+     AND COALESCE(c.residence_district, '') = COALESCE(p.residence_district, '')
+    WHERE a.id BETWEEN :anchor_id_from AND :anchor_id_to
+    ON CONFLICT DO NOTHING
+    """
+)
+
+
+_BUMP_ANCHOR_USERS_SQL = text(
+    """
+    UPDATE users
+    SET data_version = data_version + 1
+    WHERE id IN (
+        SELECT user_id FROM user_school_anchors
+        WHERE id BETWEEN :anchor_id_from AND :anchor_id_to
+    )
+    """
+)
+
+
+def assign_communities_for_anchors(
+    db: Session, anchor_id_from: int, anchor_id_to: int, bump_versions: bool = True
+) -> int:
+    """
+    앵커 id 범위 [anchor_id_from, anchor_id_to] 에 대해
+    없는 커뮤니티를 만들고 커뮤니티 멤버로 등록한다.
+
+    - 새로 가입된 유저가 있으면 data_version 을 올린다 (bootstrap 의 커뮤니티 목록).
+      호출하는 쪽에서 따로 올리면 bump_versions=False
+    - commit 은 호출하는 쪽에서 한다.
+    - 반환값: 새로 추가된 community_members 행 수
+    """
+    params = {"anchor_id_from": anchor_id_from, "anchor_id_to": anchor_id_to}
+    db.execute(_ASSIGN_COMMUNITIES_SQL, params)
+    added = db.execute(_ASSIGN_MEMBERS_SQL, params).rowcount
+    if added and bump_versions:
+        db.execute(_BUMP_ANCHOR_USERS_SQL, params)
+    return added
+
+
 def create_community_post(
     db: Session, user_id: int, post_in: schemas.CommunityPostCreate
 ) -> models.CommunityPost:
+    # 심사는 moderation_worker 가 비동기로 한다 (그 전까지 작성자에게만 보임)
     post = models.CommunityPost(
         community_id=post_in.community_id,
         author_user_id=user_id,
         content=post_in.content,
+        status="pending",
     )
     db.add(post)
+    bump_posts_version(db, post_in.community_id)
     db.commit()
-    db.refresh(post)
     return post
 
 
+def bump_posts_version(db: Session, community_id) -> None:
+    """
+    communities.posts_version +1 (게시글 목록 ETag 가 바뀐다).
+    community_id 는 값 또는 스칼라 서브쿼리. commit 은 호출하는 쪽에서 한다.
+    """
+    db.query(models.Community).filter(models.Community.id == community_id).update(
+        {models.Community.posts_version: models.Community.posts_version + 1},
+        synchronize_session=False,
+    )
+
+
+def _post_community_id(post_id: int):
+    return (
+        select(models.CommunityPost.community_id)
+        .where(models.CommunityPost.id == post_id)
+        .scalar_subquery()
+    )
+
+
+def get_posts_version(db: Session, community_id: int) -> Optional[int]:
+    return (
+        db.query(models.Community.posts_version)
+        .filter(models.Community.id == community_id)
+        .scalar()
+    )
+
+
+# 목록 응답용 컬럼 (스키마 필드 순서 그대로 → main._rows_response 가 바로 직렬화)
+COMMUNITY_POST_FIELDS = tuple(schemas.CommunityPost.model_fields)
+
+
 def list_community_posts(
-    db: Session, community_id: int, limit: int = 50
-) -> list[models.CommunityPost]:
+    db: Session,
+    community_id: int,
+    viewer_user_id: int,
+    limit: int = 50,
+    exclude_author_ids: Sequence[int] = (),
+) -> list:
+    """
+    공개(active) 글 + 보는 사람이 쓴 심사 대기(pending / review) 글.
+    exclude_author_ids (차단 관계) 가 쓴 글은 SQL 에서 빼므로 limit 개를 꽉 채운다.
+    ORM 객체 대신 COMMUNITY_POST_FIELDS 순서의 컬럼 튜플(Row)을 돌려준다.
+    """
+    post = models.CommunityPost
+    query = db.query(*(getattr(post, field) for field in COMMUNITY_POST_FIELDS)).filter(
+        post.community_id == community_id,
+        or_(
+            post.status == "active",
+            and_(
+                post.status.in_(("pending", "review")),
+                post.author_user_id == viewer_user_id,
+            ),
+        ),
+    )
+    if len(exclude_author_ids):
+        # author_user_id <> ALL(:ids) — 배열 파라미터 하나 (차단 수와 무관하게 같은 SQL)
+        query = query.filter(
+            post.author_user_id
+            != all_(cast([int(i) for i in exclude_author_ids], ARRAY(BigInteger)))
+        )
+    return query.order_by(post.created_at.desc()).limit(limit).all()
+
+
+_MODERATION_LAG_SQL = text(
+    """
+    SELECT
+        COUNT(*),
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY lag),
+        percentile_cont(0.95) WITHIN GROUP (ORDER BY lag),
+        MAX(lag)
+    FROM (
+        SELECT EXTRACT(EPOCH FROM moderated_at - created_at) AS lag
+        FROM community_posts
+        WHERE moderated_at >= :since
+    ) recent
+    """
+)
+
+
+def get_moderation_stats(db: Session, window_seconds: int = 3600) -> dict:
+    """
+    심사 대기열 상태 + 최근 window_seconds 동안의 지연(작성→판정) / 배치 크기.
+    지연은 ix_community_posts_moderated, 배치는 moderation_batches 에서 읽는다.
+    """
+    since = datetime.now(timezone.utc) - timedelta(seconds=window_seconds)
+    pending_posts, oldest_pending_at = (
+        db.query(
+            func.count(models.CommunityPost.id),
+            func.min(models.CommunityPost.created_at),
+        )
+        .filter(models.CommunityPost.status == "pending")
+        .one()
+    )
+    moderated, lag_p50, lag_p95, lag_max = db.execute(
+        _MODERATION_LAG_SQL, {"since": since}
+    ).one()
+    batch = models.ModerationBatch
+    batch_seconds = func.extract("epoch", batch.finished_at - batch.started_at)
+    completed = batch.status != "failed"
+    (
+        batches,
+        failed_batches,
+        avg_batch,
+        max_batch,
+        fetched,
+        classified,
+        avg_seconds,
+        max_seconds,
+    ) = (
+        db.query(
+            func.count(batch.id).filter(completed),
+            func.count(batch.id).filter(batch.status == "failed"),
+            func.avg(batch.batch_size).filter(completed),
+            func.max(batch.batch_size).filter(completed),
+            func.sum(batch.batch_size).filter(completed),
+            func.sum(batch.classified_count).filter(completed),
+            func.avg(batch_seconds).filter(completed),
+            func.max(batch_seconds).filter(completed),
+        )
+        .filter(batch.started_at >= since)
+        .one()
+    )
+    review_posts = (
+        db.query(func.count(models.CommunityPost.id))
+        .filter(models.CommunityPost.status == "review")
+        .scalar()
+    )
+    return {
+        "pending_posts": pending_posts,
+        "oldest_pending_at": oldest_pending_at,
+        "moderated_posts": moderated,
+        "lag_p50_seconds": float(lag_p50 or 0.0),
+        "lag_p95_seconds": float(lag_p95 or 0.0),
+        "lag_max_seconds": float(lag_max or 0.0),
+        "review_posts": review_posts,
+        "batches": batches,
+        "failed_batches": failed_batches,
+        "avg_batch_size": float(avg_batch or 0.0),
+        "max_batch_size": max_batch or 0,
+        # 워커의 배치 처리 시간 (가져오기 → 분류 → 판정 반영)
+        "avg_batch_seconds": float(avg_seconds or 0.0),
+        "max_batch_seconds": float(max_seconds or 0.0),
+        # 워커의 판정 캐시 적중률 (분류기를 건너뛴 비율)
+        "cache_hit_ratio": 1 - classified / fetched if fetched else 0.0,
+    }
+
+
+# ============================================================
+# 4. 추천 후보 (미리 계산된 top-K)
+# ============================================================
+
+# 유저 본인 + 역색인 이웃(같은 학교·학교급, 입학년도 허용 오차 이내)을
+# user_recommendations 에 dirty 로 표시한다. 실제 계산은 recommendation_worker.py
+_ENQUEUE_RECOMMENDATIONS_SQL = text(
+    """
+    INSERT INTO user_recommendations (user_id, dirty_at, dirty_seq)
+    SELECT affected.user_id, now(), 1
+    FROM (
+        SELECT CAST(:user_id AS BIGINT) AS user_id
+        UNION
+        SELECT n.user_id
+        FROM user_school_anchors a
+        JOIN user_school_anchors n
+          ON n.institution_id = a.institution_id
+         AND n.school_level = a.school_level
+         AND n.entry_year BETWEEN a.entry_year - :year_tolerance
+                              AND a.entry_year + :year_tolerance
+        WHERE a.user_id = :user_id
+    ) affected
+    ON CONFLICT (user_id) DO UPDATE
+    SET dirty_at = COALESCE(user_recommendations.dirty_at, EXCLUDED.dirty_at),
+        dirty_seq = user_recommendations.dirty_seq + 1
+    """
+)
+
+
+def enqueue_recommendation_refresh(db: Session, user_id: int) -> None:
+    """commit 은 호출하는 쪽에서 한다 (변경과 같은 트랜잭션)."""
+    db.execute(
+        _ENQUEUE_RECOMMENDATIONS_SQL,
+        {"user_id": user_id, "year_tolerance": matching.DEFAULT_YEAR_TOLERANCE},
+    )
+
+
+def get_user_recommendation(
+    db: Session, user_id: int
+) -> Optional[models.UserRecommendation]:
+    return db.get(models.UserRecommendation, user_id)
+
+
+def get_recommendation_stats(db: Session) -> dict:
+    pending_users, oldest_dirty_at = (
+        db.query(
+            func.count(models.UserRecommendation.user_id),
+            func.min(models.UserRecommendation.dirty_at),
+        )
+        .filter(models.UserRecommendation.dirty_at.isnot(None))
+        .one()
+    )
+    last_job = (
+        db.query(models.SyncJob)
+        .filter(
+            models.SyncJob.external_source == "recommendations",
+            models.SyncJob.finished_at.isnot(None),
+        )
+        .order_by(models.SyncJob.id.desc())
+        .first()
+    )
+    return {
+        "pending_users": pending_users,
+        "oldest_dirty_at": oldest_dirty_at,
+        "last_job": last_job,
+    }
+
+
+# ============================================================
+# 5. 신고 / 운영자 검토 대기열
+# ============================================================
+
+# 대상별 신고 수가 이 값에 도달하면 대상(게시글/댓글)을 hidden 으로 바꾼다
+REPORT_HIDE_THRESHOLD = int(os.getenv("REPORT_HIDE_THRESHOLD", "5"))
+
+# target_type → (모델, 작성자 컬럼)
+_REPORT_TARGETS = {
+    "post": (models.CommunityPost, models.CommunityPost.author_user_id),
+    "comment": (models.CommunityComment, models.CommunityComment.user_id),
+}
+
+# 신고 1건 저장 + 대상 카운터 증가를 한 문장으로.
+# 같은 유저의 중복 신고는 uq_reports_reporter_target 에 걸려 카운터도 안 올라간다 (행 없음).
+# 카운터 행의 ON CONFLICT DO UPDATE 가 행 잠금을 잡으므로 동시 신고도 순서대로 센다.
+_CREATE_REPORT_SQL = text(
+    """
+    WITH new_report AS (
+        INSERT INTO reports (
+            reporter_user_id, reported_user_id, target_type, target_id,
+            reason_category, reason_text
+        )
+        VALUES (
+            :reporter_user_id, :reported_user_id, :target_type, :target_id,
+            :reason_category, :reason_text
+        )
+        ON CONFLICT ON CONSTRAINT uq_reports_reporter_target DO NOTHING
+        RETURNING target_type, target_id
+    )
+    INSERT INTO report_targets (target_type, target_id, report_count)
+    SELECT target_type, target_id, 1 FROM new_report
+    ON CONFLICT (target_type, target_id) DO UPDATE
+    SET report_count = report_targets.report_count + 1,
+        last_reported_at = now(),
+        reviewed_at = NULL
+    RETURNING report_count, hidden_at
+    """
+)
+
+
+def get_report_target_author(
+    db: Session, target_type: str, target_id: int
+) -> Optional[int]:
+    """신고 대상 작성자 id. 대상이 없으면 None"""
+    model, author_column = _REPORT_TARGETS[target_type]
     return (
-        db.query(models.CommunityPost)
-        .filter(models.CommunityPost.community_id == community_id)
-        .order_by(models.CommunityPost.created_at.desc())
+        db.query(author_column)
+        .filter(model.id == target_id, model.is_deleted.is_(False))
+        .scalar()
+    )
+
+
+def create_report(
+    db: Session,
+    reporter_user_id: int,
+    reported_user_id: int,
+    report_in: schemas.ReportCreate,
+) -> dict:
+    """
+    신고를 접수하고 대상 카운터를 올린다.
+    카운터가 임계값에 도달한 신고가 대상 숨김까지 같은 트랜잭션에서 처리한다.
+    """
+    row = db.execute(
+        _CREATE_REPORT_SQL,
+        {
+            "reporter_user_id": reporter_user_id,
+            "reported_user_id": reported_user_id,
+            "target_type": report_in.target_type,
+            "target_id": report_in.target_id,
+            "reason_category": report_in.reason_category,
+            "reason_text": report_in.reason_text,
+        },
+    ).first()
+
+    if row is None:
+        # 이미 신고한 대상
+        db.rollback()
+        target = db.get(
+            models.ReportTarget, (report_in.target_type, report_in.target_id)
+        )
+        return {
+            "target_type": report_in.target_type,
+            "target_id": report_in.target_id,
+            "report_count": target.report_count if target else 0,
+            "hidden": bool(target and target.hidden_at),
+            "duplicate": True,
+        }
+
+    report_count, hidden_at = row
+    # 임계값에 "도달한" 신고만 숨긴다 (운영자가 복구한 뒤 추가 신고로 다시 숨기지 않음)
+    if hidden_at is None and report_count == REPORT_HIDE_THRESHOLD:
+        model, _ = _REPORT_TARGETS[report_in.target_type]
+        # 숨기기 직전 status (pending / 이미 hidden 등) 를 복구용으로 남긴다
+        prior_status = (
+            db.query(model.status)
+            .filter(model.id == report_in.target_id)
+            .with_for_update()
+            .scalar()
+        )
+        db.query(model).filter(model.id == report_in.target_id).update(
+            {"status": "hidden"}, synchronize_session=False
+        )
+        db.query(models.ReportTarget).filter(
+            models.ReportTarget.target_type == report_in.target_type,
+            models.ReportTarget.target_id == report_in.target_id,
+        ).update(
+            {"hidden_at": func.now(), "prior_status": prior_status},
+            synchronize_session=False,
+        )
+        if report_in.target_type == "post":
+            bump_posts_version(db, _post_community_id(report_in.target_id))
+        hidden_at = datetime.now(timezone.utc)
+    db.commit()
+
+    return {
+        "target_type": report_in.target_type,
+        "target_id": report_in.target_id,
+        "report_count": report_count,
+        "hidden": hidden_at is not None,
+        "duplicate": False,
+    }
+
+
+def list_report_queue(db: Session, limit: int = 50) -> List[models.ReportTarget]:
+    """검토 대기 대상, 신고 많은 순 (ix_report_targets_queue 순서 그대로 읽음)"""
+    return (
+        db.query(models.ReportTarget)
+        .filter(models.ReportTarget.reviewed_at.is_(None))
+        .order_by(
+            models.ReportTarget.report_count.desc(),
+            models.ReportTarget.last_reported_at.desc(),
+        )
         .limit(limit)
         .all()
     )
+
+
+def resolve_report_target(
+    db: Session,
+    target_type: str,
+    target_id: int,
+    moderator_user_id: int,
+    restore: bool,
+) -> Optional[models.ReportTarget]:
+    """
+    운영자 검토 완료. restore=True 면 신고로 숨기기 전 status 로 되돌린다
+    (심사 전이던 글은 pending 으로 돌아가 moderation_worker 가 다시 심사한다).
+    이후 새 신고가 들어오면 다시 대기열에 올라온다.
+    """
+    target = db.get(models.ReportTarget, (target_type, target_id))
+    if target is None:
+        return None
+
+    now = datetime.now(timezone.utc)
+    target.reviewed_at = now
+    target.reviewed_by_user_id = moderator_user_id
+    if restore and target.hidden_at is not None:
+        model, _ = _REPORT_TARGETS[target_type]
+        if target.prior_status is not None:
+            status = target.prior_status
+        elif target_type == "post":
+            # prior_status 가 생기기 전에 숨긴 글: 심사 기록으로 추정
+            status = case((model.moderated_at.is_(None), "pending"), else_="active")
+        else:
+            status = "active"
+        db.query(model).filter(model.id == target_id, model.status == "hidden").update(
+            {"status": status}, synchronize_session=False
+        )
+        if target_type == "post":
+            bump_posts_version(db, _post_community_id(target_id))
+        target.hidden_at = None
+        target.prior_status = None
+
+    db.query(models.Report).filter(
+        models.Report.target_type == target_type,
+        models.Report.target_id == target_id,
+        models.Report.status == "pending",
+    ).update(
+        {
+            "status": "resolved",
+            "resolved_by_user_id": moderator_user_id,
+            "resolved_at": now,
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+    return target
@@ -45,13 +45,21 @@ engine = create_engine(
     connect_args={"sslmode": DB_SSLMODE} if DB_SSLMODE else {},
 )
 
+# expire_on_commit=False: commit 후 객체를 다시 SELECT 하지 않는다.
+# (server_default / onupdate 값은 아래 eager_defaults 로 INSERT/UPDATE ... RETURNING 에서 받음)
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine,
 )
 
-Base = declarative_base()
+
+class _EagerDefaults:
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_EagerDefaults)
 
 
 # 5) FastAPI 의존성 주입용
@@ -0,0 +1,266 @@
+# path: embedding_index.py
+"""
+프로필 임베딩 저장 / 근사 최근접 이웃(ANN) 검색.
+
+1) 저장 포맷
+   - user_profiles.matching_embedding 에 float32 little-endian 바이트로 저장
+     (1536차원 = 6KB. 문자열 파싱 없이 np.frombuffer 한 번으로 복원)
+
+2) IVF 인덱스 (NumPy)
+   - k-means 로 nlist 개 중심(centroid)을 만들고, 각 벡터를 가장 가까운 리스트에 배정
+   - 벡터는 단위 길이로 정규화 후 int8 로 양자화 (벡터별 scale 보관, 1536차원 = 1.5KB)
+   - 검색: 질의와 가까운 nprobe 개 리스트만 훑어서 내적(= 코사인) 상위 k 개
+
+3) 스냅샷 파일
+   - 헤더(JSON) + 배열들을 한 파일에 이어 쓰고, np.memmap 으로 읽는다.
+     → 같은 서버의 워커들이 OS 페이지 캐시의 한 벌을 공유한다.
+   - 새 스냅샷은 임시 파일에 쓴 뒤 os.replace 로 원자적으로 교체.
+     검색 시 파일 mtime 이 바뀌었으면 다시 연다 (재시작 불필요).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+import models
+
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+SNAPSHOT_PATH = os.getenv("EMBEDDING_SNAPSHOT_PATH", "embedding_index.snapshot")
+SNAPSHOT_MAGIC = b"IVFSNAP1"
+_ALIGN = 64
+
+DEFAULT_NPROBE = 8
+
+
+# ============================================================
+# 1. 바이너리 저장 포맷
+# ============================================================
+
+
+def encode_vector(vector: Sequence[float]) -> bytes:
+    return np.asarray(vector, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def decode_vector(blob: Optional[bytes]) -> Optional[np.ndarray]:
+    if not blob:
+        return None
+    return np.frombuffer(blob, dtype=EMBEDDING_DTYPE)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def quantize_int8(unit_vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """단위 벡터 → (int8 벡터, 벡터별 scale). 원래 값 ≈ int8 * scale"""
+    scales = np.abs(unit_vectors).max(axis=1) / 127.0
+    scales = np.maximum(scales, 1e-12).astype(np.float32)
+    quantized = np.rint(unit_vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales
+
+
+# ============================================================
+# 2. IVF 인덱스 빌드
+# ============================================================
+
+
+def _assign(
+    vectors: np.ndarray, centroids: np.ndarray, chunk: int = 8192
+) -> np.ndarray:
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk):
+        labels[start : start + chunk] = np.argmax(
+            vectors[start : start + chunk] @ centroids.T, axis=1
+        )
+    return labels
+
+
+def train_centroids(
+    unit_vectors: np.ndarray, nlist: int, iterations: int = 10, seed: int = 42
+) -> np.ndarray:
+    """코사인 기준 k-means (spherical k-means). 최대 nlist*64 개 샘플로 학습."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(unit_vectors), nlist * 64)
+    sample = unit_vectors[rng.choice(len(unit_vectors), sample_size, replace=False)]
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        empty = np.bincount(labels, minlength=nlist) == 0
+        # 빈 리스트는 임의 샘플로 다시 시작
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids.astype(np.float32)
+
+
+def write_snapshot(
+    path: str, user_ids: np.ndarray, vectors: np.ndarray, nlist: Optional[int] = None
+) -> None:
+    """user_ids / vectors(float32, N x d) 로 IVF 스냅샷 파일을 만든다."""
+    unit = _normalize(np.asarray(vectors, dtype=np.float32))
+    if nlist is None:
+        nlist = max(1, int(4 * np.sqrt(len(unit))))
+    nlist = min(nlist, len(unit))
+
+    centroids = train_centroids(unit, nlist)
+    labels = _assign(unit, centroids)
+    order = np.argsort(labels, kind="stable")
+    list_offsets = np.zeros(nlist + 1, dtype=np.int64)
+    list_offsets[1:] = np.cumsum(np.bincount(labels, minlength=nlist))
+
+    quantized, scales = quantize_int8(unit[order])
+    arrays = {
+        "centroids": centroids,
+        "list_offsets": list_offsets,
+        "user_ids": np.asarray(user_ids, dtype=np.int64)[order],
+        "vectors": quantized,
+        "scales": scales,
+    }
+
+    # 헤더: 각 배열의 dtype / shape / 파일 내 offset
+    header = {}
+    offset = 0
+    for name, array in arrays.items():
+        header[name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset += -(-array.nbytes // _ALIGN) * _ALIGN
+    header_bytes = json.dumps(header).encode()
+    data_start = -(-(len(SNAPSHOT_MAGIC) + 8 + len(header_bytes)) // _ALIGN) * _ALIGN
+
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(len(header_bytes).to_bytes(8, "little"))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + header[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+
+
+def build_snapshot_from_db(db: Session, path: Optional[str] = None) -> int:
+    """user_profiles 의 임베딩 전체로 스냅샷을 다시 만든다. 반환값: 벡터 수"""
+    path = path or SNAPSHOT_PATH
+    rows = (
+        db.query(models.UserProfile.user_id, models.UserProfile.matching_embedding)
+        .filter(models.UserProfile.matching_embedding.isnot(None))
+        .yield_per(5000)
+    )
+    user_ids: List[int] = []
+    vectors: List[np.ndarray] = []
+    for user_id, blob in rows:
+        user_ids.append(user_id)
+        vectors.append(decode_vector(blob))
+    if not vectors:
+        return 0
+
+    write_snapshot(path, np.array(user_ids), np.vstack(vectors))
+    return len(user_ids)
+
+
+# ============================================================
+# 3. 스냅샷 로드 / 검색
+# ============================================================
+
+
+class IVFIndex:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError(f"IVF 스냅샷 파일이 아닙니다: {path}")
+            header_len = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(header_len))
+        data_start = -(-(len(SNAPSHOT_MAGIC) + 8 + header_len) // _ALIGN) * _ALIGN
+
+        arrays = {}
+        for name, meta in header.items():
+            arrays[name] = np.memmap(
+                path,
+                dtype=np.dtype(meta["dtype"]),
+                mode="r",
+                offset=data_start + meta["offset"],
+                shape=tuple(meta["shape"]),
+            )
+        # 작은 배열은 메모리로, 큰 벡터 배열은 memmap 그대로 (워커 간 공유)
+        self.centroids = np.array(arrays["centroids"])
+        self.list_offsets = np.array(arrays["list_offsets"])
+        self.user_ids = arrays["user_ids"]
+        self.vectors = arrays["vectors"]
+        self.scales = arrays["scales"]
+        self.dimension = self.centroids.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 20,
+        nprobe: int = DEFAULT_NPROBE,
+        exclude_user_id: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """코사인 유사도 상위 k 개 (user_id, similarity)"""
+        query = _normalize(np.asarray(query, dtype=np.float32))
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+
+        ids_parts, score_parts = [], []
+        for list_no in probes:
+            start, end = self.list_offsets[list_no], self.list_offsets[list_no + 1]
+            if start == end:
+                continue
+            block = self.vectors[start:end].astype(np.float32)
+            score_parts.append((block @ query) * self.scales[start:end])
+            ids_parts.append(self.user_ids[start:end])
+        if not ids_parts:
+            return []
+
+        ids = np.concatenate(ids_parts)
+        scores = np.concatenate(score_parts)
+        if exclude_user_id is not None:
+            scores[ids == exclude_user_id] = -np.inf
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+
+_index: Optional[IVFIndex] = None
+_index_mtime: Optional[float] = None
+_index_lock = threading.Lock()
+
+
+def get_index(path: Optional[str] = None) -> Optional[IVFIndex]:
+    """
+    스냅샷을 memmap 으로 연다. 파일이 교체(mtime 변경)됐으면 다시 연다.
+    스냅샷이 아직 없으면 None.
+    """
+    global _index, _index_mtime
+    path = path or SNAPSHOT_PATH
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+    if _index is None or _index_mtime != mtime or _index.path != path:
+        with _index_lock:
+            if _index is None or _index_mtime != mtime or _index.path != path:
+                _index = IVFIndex(path)
+                _index_mtime = mtime
+    return _index
@@ -0,0 +1,294 @@
+# path: friend_graph.py
+"""
+친구 관계 그래프 (accepted 친구만).
+
+- user_friendships 의 accepted 관계를 무방향 CSR 인접 배열(indptr / indices)로 들고 있는다.
+  (행 번호 = user_id, 각 행의 이웃은 정렬되어 있음)
+- 새로 수락된 친구 관계는 delta(dict) 에 쌓았다가, 일정량이 넘으면 CSR 로 합친다.
+- 적재는 서버 커서로 LOAD_CHUNK_ROWS 행씩 읽어 int32 배열에 바로 채운다
+  (간선 수천만 개를 파이썬 튜플로 만들면 워커마다 GB 단위가 된다).
+- 공통 친구 수: 정렬된 두 이웃 배열의 교집합 (np.intersect1d)
+- 친구의 친구 추천: 친구들의 이웃 행을 한 번에 모아서 np.unique(return_counts)
+  → 공통 친구 수 순으로 정렬
+
+- 행 번호가 user_id 이고 이웃은 int32 로 들고 있으므로 user_id 는 MAX_USER_ID 이하여야 한다.
+  (넘으면 ValueError — 조용히 잘리지 않게)
+
+⚠️ 프로세스 메모리에 있는 스냅샷이므로 다른 워커에서 수락된 관계는
+   REBUILD_INTERVAL_SECONDS 가 지나 다시 적재될 때 반영된다.
+   재적재는 백그라운드 스레드 하나가 하고 (single-flight), 그동안 요청은 기존 스냅샷을 쓴다.
+   처음 한 번만 요청 스레드가 적재하고 (락으로 한 스레드만), 나머지는 기다렸다가 같은 결과를 쓴다.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal
+
+# delta 에 쌓인 간선이 이 수를 넘으면 CSR 로 합친다
+MERGE_THRESHOLD = 50_000
+
+# 적재 시 서버 커서에서 한 번에 가져오는 행 수
+LOAD_CHUNK_ROWS = 100_000
+
+# 다른 워커의 변경을 반영하기 위한 전체 재적재 주기
+REBUILD_INTERVAL_SECONDS = 600.0
+
+# CSR 행 번호 / int32 이웃 배열로 표현할 수 있는 최대 user_id
+MAX_USER_ID = np.iinfo(np.int32).max
+
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+def _check_ids(*arrays: np.ndarray) -> None:
+    for array in arrays:
+        if len(array) and (array.min() < 0 or array.max() > MAX_USER_ID):
+            raise ValueError(
+                f"friend_graph: user_id 가 범위(0..{MAX_USER_ID})를 벗어났습니다."
+            )
+
+
+def build_csr(
+    src: np.ndarray, dst: np.ndarray, n_nodes: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """무방향 간선 (src[i], dst[i]) → (indptr, indices). 각 행은 정렬·중복 제거."""
+    _check_ids(src, dst)
+    # (행 << 32 | 이웃) 하나의 int64 키로 정렬하면 행 순서 + 행 안의 이웃 순서가 같이 맞는다
+    n = len(src)
+    keys = np.empty(2 * n, dtype=np.int64)
+    keys[:n] = (src.astype(np.int64) << 32) | dst.astype(np.int64)
+    keys[n:] = (dst.astype(np.int64) << 32) | src.astype(np.int64)
+    keys.sort()
+    if len(keys):
+        keep = np.empty(len(keys), dtype=bool)
+        keep[0] = True
+        np.not_equal(keys[1:], keys[:-1], out=keep[1:])
+        keys = keys[keep]
+
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys >> 32, minlength=n_nodes), out=indptr[1:])
+    return indptr, (keys & 0xFFFFFFFF).astype(np.int32)
+
+
+def read_accepted_edges(db: Session) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    accepted 간선을 서버 커서로 LOAD_CHUNK_ROWS 행씩 읽어 int32 배열에 채운다.
+    전체를 파이썬 튜플 목록으로 만들지 않으므로 파이썬 객체는 한 덩어리 분만 살아 있다.
+    """
+    friendship = models.UserFriendship
+    result = db.execute(
+        select(friendship.user_id, friendship.friend_user_id)
+        .where(friendship.status == "accepted")
+        .execution_options(yield_per=LOAD_CHUNK_ROWS)
+    )
+    src = np.empty(LOAD_CHUNK_ROWS, dtype=np.int32)
+    dst = np.empty(LOAD_CHUNK_ROWS, dtype=np.int32)
+    n = 0
+    for chunk in result.partitions():
+        # np.array(Row 목록) 은 Row 마다 시퀀스 검사를 해서 느리다 → 평평하게 fromiter
+        flat = itertools.chain.from_iterable(chunk)
+        block = np.fromiter(flat, np.int64, 2 * len(chunk)).reshape(-1, 2)
+        _check_ids(block)  # int32 로 넣기 전에 (넘치면 조용히 잘린다)
+        if n + len(block) > len(src):
+            size = max(2 * len(src), n + len(block))
+            src, dst = np.resize(src, size), np.resize(dst, size)
+        src[n : n + len(block)] = block[:, 0]
+        dst[n : n + len(block)] = block[:, 1]
+        n += len(block)
+    return src[:n], dst[:n]
+
+
+class FriendGraph:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = _EMPTY
+        self._delta: Dict[int, Set[int]] = {}
+        self._delta_edges = 0
+        self.loaded_at: Optional[float] = None
+        # 적재는 한 번에 하나만. 재적재 중 들어온 간선은 여기 모았다가 새 스냅샷에 다시 넣는다
+        self._load_lock = threading.Lock()
+        self._rebuilding = False
+        self._rebuild_log: Optional[List[Tuple[int, int]]] = None
+
+    # --------------------------------------------------------
+    # 적재 / 증분 갱신
+    # --------------------------------------------------------
+
+    def load(self, db: Session) -> None:
+        with self._lock:
+            self._rebuild_log = []
+        src, dst = read_accepted_edges(db)
+        self.load_edges(src, dst)
+
+    def load_edges(self, src: np.ndarray, dst: np.ndarray) -> None:
+        n_nodes = int(max(src.max(initial=0), dst.max(initial=0))) + 1
+        indptr, indices = build_csr(src, dst, n_nodes)
+        with self._lock:
+            self.indptr, self.indices = indptr, indices
+            self._delta = {}
+            self._delta_edges = 0
+            # DB 를 읽은 뒤 수락된 간선은 새 스냅샷에 없을 수 있다 → 다시 넣는다
+            for a, b in self._rebuild_log or ():
+                self._add_edge_locked(a, b)
+            self._rebuild_log = None
+            self.loaded_at = time.monotonic()
+
+    def add_edge(self, a: int, b: int) -> None:
+        """친구 수락 시 호출. delta 에 넣고, 많이 쌓이면 CSR 로 합친다."""
+        _check_ids(np.array([a, b], dtype=np.int64))
+        with self._lock:
+            if self._rebuild_log is not None:
+                self._rebuild_log.append((a, b))
+            self._add_edge_locked(a, b)
+
+    def _add_edge_locked(self, a: int, b: int) -> None:
+        self._delta.setdefault(a, set()).add(b)
+        self._delta.setdefault(b, set()).add(a)
+        self._delta_edges += 1
+        if self._delta_edges >= MERGE_THRESHOLD:
+            self._merge_locked()
+
+    def _merge_locked(self) -> None:
+        n_nodes = len(self.indptr) - 1
+        rows = np.repeat(np.arange(n_nodes, dtype=np.int32), np.diff(self.indptr))
+        delta_src = [a for a, friends in self._delta.items() for _ in friends]
+        delta_dst = [b for friends in self._delta.values() for b in friends]
+        src = np.concatenate([rows, np.array(delta_src, dtype=np.int32)])
+        dst = np.concatenate([self.indices, np.array(delta_dst, dtype=np.int32)])
+        n_nodes = max(n_nodes, int(src.max(initial=0)) + 1, int(dst.max(initial=0)) + 1)
+        self.indptr, self.indices = build_csr(src, dst, n_nodes)
+        self._delta = {}
+        self._delta_edges = 0
+
+    # --------------------------------------------------------
+    # 조회
+    # --------------------------------------------------------
+
+    def _neighbors_locked(self, user_id: int) -> np.ndarray:
+        if user_id < len(self.indptr) - 1:
+            base = self.indices[self.indptr[user_id] : self.indptr[user_id + 1]]
+        else:
+            base = _EMPTY
+        extra = self._delta.get(user_id)
+        if not extra:
+            return base
+        return np.union1d(base, np.fromiter(extra, np.int32, len(extra)))
+
+    def neighbors(self, user_id: int) -> np.ndarray:
+        with self._lock:
+            return self._neighbors_locked(user_id)
+
+    def mutual_count(self, a: int, b: int) -> int:
+        with self._lock:
+            return len(
+                np.intersect1d(
+                    self._neighbors_locked(a),
+                    self._neighbors_locked(b),
+                    assume_unique=True,
+                )
+            )
+
+    def mutual_counts(self, user_id: int, others: List[int]) -> List[int]:
+        with self._lock:
+            mine = self._neighbors_locked(user_id)
+            return [
+                len(
+                    np.intersect1d(
+                        mine, self._neighbors_locked(other), assume_unique=True
+                    )
+                )
+                for other in others
+            ]
+
+    def suggestions(
+        self, user_id: int, limit: int = 20, max_friends: int = 1000
+    ) -> List[Tuple[int, int]]:
+        """친구의 친구 중 아직 친구가 아닌 유저 (user_id, 공통 친구 수) 상위 limit 개"""
+        with self._lock:
+            friends = self._neighbors_locked(user_id)
+            if len(friends) == 0:
+                return []
+            hop = friends[:max_friends]
+
+            # CSR 행들을 한 번에 모은다
+            in_range = hop[hop < len(self.indptr) - 1]
+            starts = self.indptr[in_range]
+            lengths = self.indptr[in_range + 1] - starts
+            offsets = np.arange(int(lengths.sum())) - np.repeat(
+                np.cumsum(lengths) - lengths, lengths
+            )
+            parts = [self.indices[np.repeat(starts, lengths) + offsets]]
+            # delta 에만 있는 간선
+            for friend in hop.tolist():
+                extra = self._delta.get(friend)
+                if extra:
+                    parts.append(np.fromiter(extra, np.int32, len(extra)))
+
+        fof = np.concatenate(parts)
+        candidates, counts = np.unique(fof, return_counts=True)
+        mask = (candidates != user_id) & ~np.isin(
+            candidates, friends, assume_unique=True
+        )
+        candidates, counts = candidates[mask], counts[mask]
+        if len(candidates) == 0:
+            return []
+
+        limit = min(limit, len(candidates))
+        top = np.argpartition(-counts, limit - 1)[:limit]
+        top = top[np.lexsort((candidates[top], -counts[top]))]
+        return list(zip(candidates[top].tolist(), counts[top].tolist()))
+
+
+friend_graph = FriendGraph()
+
+
+def _rebuild_in_background() -> None:
+    db = SessionLocal()
+    try:
+        friend_graph.load(db)
+    except Exception as e:  # 실패하면 기존 스냅샷을 계속 쓰고 다음 주기에 다시 시도
+        print("[friend_graph] 재적재 실패:", repr(e))
+        with friend_graph._lock:
+            friend_graph._rebuild_log = None
+            friend_graph.loaded_at = time.monotonic()
+    finally:
+        db.close()
+        friend_graph._rebuilding = False
+
+
+def get_graph(db: Session) -> FriendGraph:
+    """
+    처음엔 요청 스레드에서 적재 (한 스레드만, 나머지는 기다림).
+    이후 REBUILD_INTERVAL_SECONDS 가 지나면 백그라운드로 재적재하고 기존 스냅샷을 바로 돌려준다.
+    """
+    if friend_graph.loaded_at is None:
+        with friend_graph._load_lock:
+            if friend_graph.loaded_at is None:
+                friend_graph.load(db)
+        return friend_graph
+
+    if time.monotonic() - friend_graph.loaded_at > REBUILD_INTERVAL_SECONDS:
+        with friend_graph._load_lock:
+            if friend_graph._rebuilding:
+                return friend_graph
+            friend_graph._rebuilding = True
+        threading.Thread(
+            target=_rebuild_in_background, name="friend-graph-rebuild", daemon=True
+        ).start()
+    return friend_graph
+
+
+def on_friendship_accepted(user_id: int, friend_user_id: int) -> None:
+    """crud.accept_friend_request 에서 호출. 아직 적재 전이면 무시."""
+    if friend_graph.loaded_at is not None:
+        friend_graph.add_edge(user_id, friend_user_id)
@@ -0,0 +1,797 @@
+# path: generate_dataset.py
+"""
+규모 테스트용 합성 데이터 생성기.
+
+- seed_institutions.py (학교 10개) 대신 운영 규모에 가까운 데이터를 만든다.
+  - 학교: 17개 시/도 전체, 인구 비율로 배분, 초/중/고 비율 6 : 3.2 : 2.4
+  - 유저: 기본 100만 명. 거주지는 인구 비율, 출생연도는 1990년 전후로 몰림
+  - 학교 앵커(초/중/고 입학년도), 학교 기록(학년/반/담임/동아리), 키워드,
+    친구 관계, 차단을 유저마다 만든다. 학교 / 키워드 선택은 Zipf 분포라
+    인기 학교·키워드에 몰린다 (동창 매칭 / 자동완성이 실제처럼 편중된다).
+  - 커뮤니티 / 멤버: crud.assign_communities_for_anchors (앱과 같은 규칙)
+  - 게시글: 커뮤니티 크기 x 로그정규 분포, 작성자는 멤버 중 Zipf (소수가 많이 씀)
+  - 댓글: 게시글마다 기하 분포, 작성자는 같은 커뮤니티 멤버
+- 결정적: 모든 값은 --seed 와 행 키(유저 id, 커뮤니티 id ...)로 만든 난수에서 나온다.
+  같은 --seed / 규모 / --until 이면 같은 내용이 된다.
+  (DB 가 매기는 id 는 병렬 스트림 순서에 따라 달라질 수 있다)
+- 쓰기: --workers 개 프로세스가 작업 조각(유저 --chunk 명 단위 등)을 나눠 받아
+  각자 COPY FROM STDIN 으로 흘려 보낸다. 행을 모아 두지 않고 만들면서 바로 쓰므로
+  메모리는 조각 크기와 무관하게 일정하다 (커뮤니티 조각만 멤버 목록을 읽어 둔다).
+- 비밀번호 해시는 argon2 로 한 번만 계산해서 모든 유저가 같은 값을 쓴다 (--password).
+- 끝나면 테이블별 행 수 / 시간 / 행/초를 출력한다.
+
+⚠️ --truncate 는 users / institutions / keywords / communities 와
+   여기에 딸린 테이블을 모두 비운다. (빈 DB 가 아니면 --truncate 없이는 멈춘다)
+
+사용법:
+    python generate_dataset.py --users 1000000 --workers 8 --truncate
+    python generate_dataset.py --users 20000 --institutions 2000 --truncate
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+
+import crud
+import partitions
+import security
+import text_normalize
+from database import SessionLocal, engine
+
+# ============================================================
+# 1. 분포 / 사전 데이터
+# ============================================================
+
+# (시/도, 학교 이름 접두사, 인구 비중 %, 대표 구/군)
+REGIONS: List[Tuple[str, str, float, Tuple[str, ...]]] = [
+    (
+        "서울특별시",
+        "서울",
+        18.6,
+        (
+            "강남구",
+            "강동구",
+            "송파구",
+            "노원구",
+            "마포구",
+            "관악구",
+            "은평구",
+            "강서구",
+        ),
+    ),
+    ("부산광역시", "부산", 6.4, ("해운대구", "부산진구", "동래구", "사하구", "북구")),
+    ("대구광역시", "대구", 4.6, ("수성구", "달서구", "북구", "동구")),
+    ("인천광역시", "인천", 5.8, ("남동구", "부평구", "연수구", "서구", "미추홀구")),
+    ("광주광역시", "광주", 2.8, ("북구", "광산구", "서구", "남구")),
+    ("대전광역시", "대전", 2.8, ("서구", "유성구", "중구", "대덕구")),
+    ("울산광역시", "울산", 2.2, ("남구", "중구", "북구", "울주군")),
+    ("세종특별자치시", "세종", 0.8, ("세종시",)),
+    (
+        "경기도",
+        "경기",
+        26.5,
+        (
+            "수원시",
+            "성남시",
+            "고양시",
+            "용인시",
+            "부천시",
+            "안산시",
+            "화성시",
+            "남양주시",
+        ),
+    ),
+    ("강원특별자치도", "강원", 3.0, ("춘천시", "원주시", "강릉시")),
+    ("충청북도", "충북", 3.1, ("청주시", "충주시", "제천시")),
+    ("충청남도", "충남", 4.2, ("천안시", "아산시", "서산시", "당진시")),
+    ("전북특별자치도", "전북", 3.4, ("전주시", "익산시", "군산시")),
+    ("전라남도", "전남", 3.5, ("목포시", "여수시", "순천시", "광양시")),
+    ("경상북도", "경북", 5.0, ("포항시", "구미시", "경산시", "안동시")),
+    ("경상남도", "경남", 6.3, ("창원시", "김해시", "진주시", "양산시")),
+    ("제주특별자치도", "제주", 1.3, ("제주시", "서귀포시")),
+]
+
+# 학교급 → (비중, 이름 접미사, 입학 나이, 학년 수)
+LEVELS: Dict[str, Tuple[float, str, int, int]] = {
+    "elementary": (6.0, "초등학교", 8, 6),
+    "middle": (3.2, "중학교", 14, 3),
+    "high": (2.4, "고등학교", 17, 3),
+}
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구민진나지엄채원천방공현함변염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용"
+SURNAME_WEIGHTS = [21.5, 14.7, 8.4, 4.7, 4.3] + [2.0] * 10 + [0.6] * 80
+GIVEN_SYLLABLES = (
+    "민서지현우준영수연진하은도윤예주성호경태혜정원재동희선미유나시채승아상용혁빈"
+)
+
+HOBBIES = (
+    "축구 야구 농구 배구 테니스 배드민턴 탁구 골프 등산 캠핑 낚시 수영 러닝 자전거 요가 "
+    "헬스 클라이밍 볼링 당구 스키 보드 서핑 여행 사진 영화 드라마 독서 글쓰기 그림 "
+    "피아노 기타 드럼 노래 춤 요리 베이킹 커피 와인 맥주 맛집 게임 보드게임 바둑 "
+    "코딩 주식 재테크 부동산 반려견 반려묘 식물 원예 봉사 교회 성당 불교 육아 패션 "
+    "뷰티 애니 웹툰 만화 음악 클래식 재즈 힙합 케이팝 아이돌 연극 뮤지컬 전시 역사"
+).split()
+HOBBY_SUFFIXES = (
+    "",
+    " 동호회",
+    " 모임",
+    " 덕후",
+    " 입문",
+    " 고수",
+    " 좋아함",
+    " 매니아",
+)
+
+CLUBS = (
+    "방송부 밴드부 합창부 미술부 과학반 컴퓨터반 도서부 축구부 농구부 야구부 "
+    "배구부 육상부 태권도부 영어회화반 신문부 봉사반 댄스부 연극부 사진부 토론반"
+).split()
+
+POST_PHRASES = (
+    "다들 잘 지내시나요",
+    "오랜만에 생각나서 글 남겨요",
+    "이번 주말에 모임 어떠세요",
+    "그때 담임 선생님 기억나세요",
+    "학교 앞 분식집 아직 있대요",
+    "운동회 사진 찾았어요",
+    "졸업앨범 보다가 웃었네요",
+    "근처 사시는 분 계신가요",
+    "수학여행 때 일 기억나요",
+    "동창회 날짜 정해 봐요",
+    "요즘 다들 뭐 하고 지내세요",
+    "반가워요 저 기억하세요",
+)
+COMMENT_PHRASES = (
+    "반가워요",
+    "저도 기억나요",
+    "좋아요 참석할게요",
+    "와 진짜 오랜만이네요",
+    "ㅋㅋㅋ 그때 생각난다",
+    "연락 주세요",
+    "사진 더 올려 주세요",
+    "저도 근처 살아요",
+)
+
+# 유저별 난수 구분값 (같은 유저라도 테이블마다 다른 난수열)
+_SALT_BASE, _SALT_ANCHOR, _SALT_HISTORY, _SALT_KEYWORD = 0, 1, 2, 3
+_SALT_FRIEND, _SALT_BLOCK, _SALT_INSTITUTION = 4, 5, 6
+
+
+def _cumulative(weights: Sequence[float]) -> List[float]:
+    return list(itertools.accumulate(weights))
+
+
+def _zipf_cumulative(n: int, s: float) -> List[float]:
+    return _cumulative([1.0 / (rank**s) for rank in range(1, n + 1)])
+
+
+def _pick(rng: random.Random, cumulative: Sequence[float]) -> int:
+    """누적 가중치에서 인덱스 하나 (random.choices 보다 빠름, 리스트 생성 없음)"""
+    return bisect.bisect_right(cumulative, rng.random() * cumulative[-1])
+
+
+def _geometric(rng: random.Random, mean: float, cap: int) -> int:
+    """평균 mean 인 기하 분포 (0 포함), cap 으로 자른다"""
+    if mean <= 0:
+        return 0
+    p = 1.0 / (mean + 1.0)
+    return min(int(math.log(1.0 - rng.random()) / math.log(1.0 - p)), cap)
+
+
+# ============================================================
+# 2. 계획 (모든 프로세스가 같은 값을 만든다)
+# ============================================================
+
+
+@dataclass
+class Plan:
+    seed: int
+    users: int
+    institutions: int
+    keywords: int
+    until: datetime
+    days: int
+    password_hash: str
+    posts_per_member: float
+    comments_per_post: float
+    friends_per_user: float
+    keywords_per_user: float
+
+    def __post_init__(self) -> None:
+        self.region_cumulative = _cumulative([region[2] for region in REGIONS])
+        self.level_cumulative = _cumulative([spec[0] for spec in LEVELS.values()])
+        self.level_names = list(LEVELS)
+        self.surname_cumulative = _cumulative(SURNAME_WEIGHTS[: len(SURNAMES)])
+
+        # 학교 id → (지역 번호, 구/군, 학교급). (지역, 학교급) 별 학교 id 목록 + Zipf 누적 가중치
+        self.institution_rows: List[Tuple[int, str, str]] = []
+        by_group: Dict[Tuple[int, str], List[int]] = {}
+        for institution_id in range(1, self.institutions + 1):
+            rng = self.rng(institution_id, _SALT_INSTITUTION)
+            region = _pick(rng, self.region_cumulative)
+            district = rng.choice(REGIONS[region][3])
+            level = self.level_names[_pick(rng, self.level_cumulative)]
+            self.institution_rows.append((region, district, level))
+            by_group.setdefault((region, level), []).append(institution_id)
+        self.institutions_by_group = by_group
+        self.group_cumulative = {
+            key: _zipf_cumulative(len(ids), 1.1) for key, ids in by_group.items()
+        }
+        self.keyword_cumulative = _zipf_cumulative(self.keywords, 1.0)
+
+    def rng(self, key: int, salt: int) -> random.Random:
+        return random.Random((self.seed << 44) ^ (key << 4) ^ salt)
+
+    def timestamp(self, rng: random.Random, recent_bias: float = 1.0) -> datetime:
+        """--until 이전 --days 일 안의 시각. recent_bias > 1 이면 최근에 몰린다"""
+        back = self.days * 86400 * (rng.random() ** recent_bias)
+        return self.until - timedelta(seconds=back)
+
+    # ---- 유저 기본 속성 (users / profiles / anchors 가 같이 쓴다) ----
+
+    def user_base(self, user_id: int) -> Tuple[int, str, int, str, str]:
+        """(지역 번호, 구/군, 출생연도, 이름, 성별)"""
+        rng = self.rng(user_id, _SALT_BASE)
+        region = _pick(rng, self.region_cumulative)
+        district = rng.choice(REGIONS[region][3])
+        birth_year = int(rng.triangular(1960, 2008, 1990))
+        name = SURNAMES[_pick(rng, self.surname_cumulative)] + "".join(
+            rng.choice(GIVEN_SYLLABLES) for _ in range(2)
+        )
+        gender = "male" if rng.random() < 0.5 else "female"
+        return region, district, birth_year, name, gender
+
+    def user_anchors(self, user_id: int) -> List[Tuple[int, str, int]]:
+        """[(학교 id, 학교급, 입학년도)] — 초/중/고 중 1~3개, 현재 연도 이후 입학은 뺀다"""
+        region, _, birth_year, _, _ = self.user_base(user_id)
+        rng = self.rng(user_id, _SALT_ANCHOR)
+        count = 1 + _pick(rng, (0.3, 0.7, 1.0))
+        levels = rng.sample(self.level_names, count)
+        anchors = []
+        for level in self.level_names:  # 초 → 중 → 고 순서
+            if level not in levels:
+                continue
+            entry_year = birth_year + LEVELS[level][2]
+            if entry_year > self.until.year:
+                continue
+            # 85% 는 지금 사는 지역 학교, 나머지는 다른 지역 (이사)
+            school_region = (
+                region if rng.random() < 0.85 else _pick(rng, self.region_cumulative)
+            )
+            ids = self.institutions_by_group.get((school_region, level))
+            if not ids:
+                continue
+            index = _pick(rng, self.group_cumulative[(school_region, level)])
+            anchors.append((ids[index], level, entry_year))
+        return anchors
+
+
+# ============================================================
+# 3. 테이블별 행 생성기
+# ============================================================
+
+INSTITUTION_COLUMNS = (
+    "id",
+    "external_source",
+    "external_id",
+    "name",
+    "name_normalized",
+    "institution_type",
+    "region_city",
+    "region_district",
+    "address",
+)
+KEYWORD_COLUMNS = ("id", "keyword", "keyword_normalized")
+USER_COLUMNS = (
+    "id",
+    "login_id",
+    "password_hash",
+    "real_name",
+    "nickname",
+    "birth_year",
+    "gender",
+    "is_verified",
+    "created_at",
+)
+PROFILE_COLUMNS = ("user_id", "residence_city", "residence_district")
+ANCHOR_COLUMNS = (
+    "user_id",
+    "institution_id",
+    "school_level",
+    "entry_year",
+    "is_primary",
+)
+HISTORY_COLUMNS = (
+    "user_id",
+    "institution_id",
+    "school_level",
+    "start_year",
+    "end_year",
+    "grade",
+    "class_group",
+    "homeroom_teacher",
+    "club_name",
+    "class_group_key",
+    "homeroom_teacher_key",
+    "club_name_key",
+)
+USER_KEYWORD_COLUMNS = ("user_id", "keyword_id", "weight")
+FRIENDSHIP_COLUMNS = ("user_id", "friend_user_id", "status", "created_at")
+BLOCK_COLUMNS = ("blocker_user_id", "blocked_user_id")
+POST_COLUMNS = ("community_id", "author_user_id", "content", "status", "created_at")
+COMMENT_COLUMNS = ("post_id", "user_id", "content", "created_at")
+
+
+def institution_rows(plan: Plan, start: int, end: int) -> Iterator[tuple]:
+    counters: Dict[Tuple[int, str, str], int] = {}
+    # 이름 번호(서울강동2초등학교)는 앞선 id 에 달려 있으므로 1번부터 센다
+    for institution_id in range(1, end + 1):
+        region, district, level = plan.institution_rows[institution_id - 1]
+        key = (region, district, level)
+        counters[key] = counters.get(key, 0) + 1
+        if institution_id < start:
+            continue
+        _, prefix, _, _ = REGIONS[region]
+        number = counters[key]
+        stem = district[:-1] if len(district) > 2 else district
+        name = f"{prefix}{stem}{number if number > 1 else ''}{LEVELS[level][1]}"
+        rng = plan.rng(institution_id, _SALT_INSTITUTION)
+        yield (
+            institution_id,
+            "synthetic",
+            str(institution_id),
+            name,
+            text_normalize.normalize_key(name),
+            level,
+            REGIONS[region][0],
+            district,
+            f"{REGIONS[region][0]} {district} 학교로 {rng.randint(1, 300)}",
+        )
+
+
+def keyword_rows(plan: Plan, start: int, end: int) -> Iterator[tuple]:
+    per_round = len(HOBBIES) * len(HOBBY_SUFFIXES)
+    for keyword_id in range(start, end + 1):
+        index = keyword_id - 1
+        hobby = HOBBIES[index % len(HOBBIES)]
+        suffix = HOBBY_SUFFIXES[(index // len(HOBBIES)) % len(HOBBY_SUFFIXES)]
+        generation = index // per_round
+        keyword = f"{hobby}{suffix}{generation + 1 if generation else ''}"
+        yield keyword_id, keyword, text_normalize.normalize_keyword(keyword)
+
+
+def user_rows(plan: Plan, start: int, end: int) -> Iterator[tuple]:
+    for user_id in range(start, end + 1):
+        _, _, birth_year, name, gender = plan.user_base(user_id)
+        rng = plan.rng(user_id, _SALT_BASE)
+        yield (
+            user_id,
+            f"gen{user_id}",
+            plan.password_hash,
+            name,
+            f"{name}{user_id % 10000}",
+            birth_year,
+            gender,
+            rng.random() < 0.7,
+            plan.timestamp(rng, recent_bias=0.7),
+        )
+
+
+def profile_rows(plan: Plan, start: int, end: int) -> Iterator[tuple]:
+    for user_id in range(start, end + 1):
+        region, district, _, _, _ = plan.user_base(user_id)
+        yield user_id, REGIONS[region][0], district
+
+
+def anchor_rows(plan: Plan, start: int, end: int) -> Iterator[tuple]:
+    for user_id in range(start, end + 1):
+        anchors = plan.user_anchors(user_id)
+        for i, (institution_id, level, entry_year) in enumerate(anchors):
+            yield user_id, institution_id, level, entry_year, i == len(anchors) - 1
+
+
+def history_rows(plan: Plan, start: int, end: int) -> Iterator[tuple]:
+    for user_id in range(start, end + 1):
+        anchors = plan.user_anchors(user_id)
+        if not anchors:
+            continue
+        rng = plan.rng(user_id, _SALT_HISTORY)
+        for _ in range(_geometric(rng, 1.5, 6)):
+            institution_id, level, entry_year = rng.choice(anchors)
+            grades = LEVELS[level][3]
+            grade = rng.randint(1, grades)
+            year = entry_year + grade - 1
+            class_number = rng.randint(1, 10)
+            # 같은 학교·연도·학년·반이면 같은 담임 (동창 찾기가 실제로 겹치게)
+            teacher_rng = random.Random(
+                hash((plan.seed, institution_id, year, grade, class_number))
+            )
+            teacher = (
+                SURNAMES[_pick(teacher_rng, plan.surname_cumulative)]
+                + "".join(teacher_rng.choice(GIVEN_SYLLABLES) for _ in range(2))
+                + " 선생님"
+            )
+            class_group = f"{grade}학년 {class_number}반"
+            club = rng.choice(CLUBS) if rng.random() < 0.6 else None
+            yield (
+                user_id,
+                institution_id,
+                level,
+                year,
+                year,
+                grade,
+                class_group,
+                teacher,
+                club,
+                text_normalize.normalize_class_group(class_group),
+                text_normalize.normalize_teacher(teacher),
+                text_normalize.normalize_club(club),
+            )
+
+
+def user_keyword_rows(plan: Plan, start: int, end: int) -> Iterator[tuple]:
+    for user_id in range(start, end + 1):
+        rng = plan.rng(user_id, _SALT_KEYWORD)
+        chosen = set()
+        for _ in range(_geometric(rng, plan.keywords_per_user, 30)):
+            chosen.add(_pick(rng, plan.keyword_cumulative) + 1)
+        for keyword_id in sorted(chosen):
+            yield user_id, keyword_id, rng.randint(1, 5)
+
+
+def friendship_rows(plan: Plan, start: int, end: int) -> Iterator[tuple]:
+    for user_id in range(start, end + 1):
+        rng = plan.rng(user_id, _SALT_FRIEND)
+        # 한 쌍은 한 행만: id 가 작은 쪽이 후보를 뽑고 자기보다 큰 id 만 남긴다
+        # (다른 청크에서 (B, A) 가 또 나오지 않는다). 후보 분포가 대칭이라
+        # 평균 --friends-per-user 개를 뽑아 절반을 남기면 유저당 친구 수 평균이 그대로다.
+        friends = set()
+        for _ in range(_geometric(rng, plan.friends_per_user, 400)):
+            # 절반은 id 가까운 유저(같은 시기 가입), 절반은 전체에서
+            if rng.random() < 0.5:
+                friend = user_id + rng.randint(-500, 500)
+            else:
+                friend = rng.randint(1, plan.users)
+            if user_id < friend <= plan.users:
+                friends.add(friend)
+        for friend in sorted(friends):
+            status = "accepted" if rng.random() < 0.85 else "pending"
+            # 요청을 보낸 쪽은 둘 중 아무나
+            if rng.random() < 0.5:
+                yield user_id, friend, status, plan.timestamp(rng)
+            else:
+                yield friend, user_id, status, plan.timestamp(rng)
+
+
+def block_rows(plan: Plan, start: int, end: int) -> Iterator[tuple]:
+    for user_id in range(start, end + 1):
+        rng = plan.rng(user_id, _SALT_BLOCK)
+        if rng.random() >= 0.03:
+            continue
+        blocked = {rng.randint(1, plan.users) for _ in range(rng.randint(1, 3))}
+        blocked.discard(user_id)
+        for other in sorted(blocked):
+            yield user_id, other
+
+
+USER_DETAIL_TABLES = [
+    ("user_profiles", PROFILE_COLUMNS, profile_rows),
+    ("user_school_anchors", ANCHOR_COLUMNS, anchor_rows),
+    ("user_school_histories", HISTORY_COLUMNS, history_rows),
+    ("user_keywords", USER_KEYWORD_COLUMNS, user_keyword_rows),
+    ("user_friendships", FRIENDSHIP_COLUMNS, friendship_rows),
+    ("user_blocks", BLOCK_COLUMNS, block_rows),
+]
+
+
+def post_rows(
+    plan: Plan, communities: Dict[int, Tuple[str, List[int]]]
+) -> Iterator[tuple]:
+    for community_id, (community_key, user_ids) in communities.items():
+        # 커뮤니티 id 는 병렬 적재 순서에 따라 바뀌므로 자연 키로 난수를 만든다
+        rng = random.Random(f"{plan.seed}:{community_key}")
+        count = int(len(user_ids) * plan.posts_per_member * rng.lognormvariate(0, 1))
+        if not count:
+            continue
+        author_cumulative = _zipf_cumulative(len(user_ids), 1.2)
+        for _ in range(min(count, 20000)):
+            author = user_ids[_pick(rng, author_cumulative)]
+            content = " ".join(rng.sample(POST_PHRASES, rng.randint(1, 3)))
+            status = "hidden" if rng.random() < 0.02 else "active"
+            yield community_id, author, content, status, plan.timestamp(rng, 2.0)
+
+
+def comment_rows(
+    plan: Plan,
+    posts: Sequence[Tuple[int, int, datetime]],
+    communities: Dict[int, Tuple[str, List[int]]],
+) -> Iterator[tuple]:
+    # 게시글 id 도 순서에 따라 바뀐다 → (커뮤니티 자연 키, 커뮤니티 안 글 순번)
+    # posts 는 (community_id, id) 순서여야 한다
+    for community_id, group in itertools.groupby(posts, key=lambda row: row[1]):
+        community_key, user_ids = communities[community_id]
+        for index, (post_id, _, created_at) in enumerate(group):
+            rng = random.Random(f"{plan.seed}:{community_key}:{index}")
+            for _ in range(_geometric(rng, plan.comments_per_post, 100)):
+                delay = timedelta(minutes=rng.expovariate(1 / 180))
+                yield (
+                    post_id,
+                    rng.choice(user_ids),
+                    rng.choice(COMMENT_PHRASES),
+                    min(created_at + delay, plan.until),
+                )
+
+
+# ============================================================
+# 4. 작업 조각 (워커 프로세스에서 실행)
+# ============================================================
+
+_plan: Optional[Plan] = None
+
+# (테이블, 행 수, 시작 시각, 끝 시각)
+Timing = Tuple[str, int, float, float]
+
+
+def _init_worker(plan: Plan) -> None:
+    global _plan
+    _plan = plan
+    # fork 로 물려받은 커넥션은 쓰지 않는다 (부모와 소켓 공유 방지)
+    engine.dispose(close=False)
+
+
+def _copy(cursor, table: str, columns: Sequence[str], rows: Iterator[tuple]) -> Timing:
+    started = time.time()
+    count = 0
+    with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+            count += 1
+    return table, count, started, time.time()
+
+
+def _run_task(task: Tuple[str, int, int]) -> List[Timing]:
+    kind, start, end = task
+    plan = _plan
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.driver_connection.cursor()
+        timings = []
+        if kind == "institutions":
+            rows = institution_rows(plan, start, end)
+            timings.append(_copy(cursor, "institutions", INSTITUTION_COLUMNS, rows))
+        elif kind == "keywords":
+            rows = keyword_rows(plan, start, end)
+            timings.append(_copy(cursor, "keywords", KEYWORD_COLUMNS, rows))
+        elif kind == "users":
+            rows = user_rows(plan, start, end)
+            timings.append(_copy(cursor, "users", USER_COLUMNS, rows))
+        elif kind == "user_details":
+            for table, columns, generate in USER_DETAIL_TABLES:
+                timings.append(
+                    _copy(cursor, table, columns, generate(plan, start, end))
+                )
+        elif kind == "community_content":
+            timings.extend(_community_content(cursor, plan, start, end))
+        raw.commit()
+        return timings
+    finally:
+        raw.close()
+
+
+_COMMUNITY_MEMBERS_SQL = """
+    SELECT c.id,
+           concat_ws('/', c.institution_id, c.school_level, c.entry_year,
+                     c.residence_city, c.residence_district),
+           array_agg(m.user_id ORDER BY m.user_id)
+    FROM communities c
+    JOIN community_members m ON m.community_id = c.id
+    WHERE c.id BETWEEN %s AND %s
+    GROUP BY c.id
+    ORDER BY c.id
+"""
+
+
+def _community_content(cursor, plan: Plan, start: int, end: int) -> List[Timing]:
+    cursor.execute(_COMMUNITY_MEMBERS_SQL, (start, end))
+    communities = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+    rows = post_rows(plan, communities)
+    timings = [_copy(cursor, "community_posts", POST_COLUMNS, rows)]
+
+    # 같은 커뮤니티 글은 한 COPY 안에서 생성 순서대로 id 를 받는다
+    cursor.execute(
+        "SELECT id, community_id, created_at FROM community_posts "
+        "WHERE community_id BETWEEN %s AND %s ORDER BY community_id, id",
+        (start, end),
+    )
+    rows = comment_rows(plan, cursor.fetchall(), communities)
+    timings.append(_copy(cursor, "community_comments", COMMENT_COLUMNS, rows))
+    return timings
+
+
+# ============================================================
+# 5. 실행
+# ============================================================
+
+TRUNCATE_SQL = (
+    "TRUNCATE users, institutions, keywords, communities RESTART IDENTITY CASCADE"
+)
+
+FINALIZE_SQL = [
+    "SELECT setval(pg_get_serial_sequence('users', 'id'), "
+    "(SELECT coalesce(max(id), 0) + 1 FROM users), false)",
+    "SELECT setval(pg_get_serial_sequence('institutions', 'id'), "
+    "(SELECT coalesce(max(id), 0) + 1 FROM institutions), false)",
+    "SELECT setval(pg_get_serial_sequence('keywords', 'id'), "
+    "(SELECT coalesce(max(id), 0) + 1 FROM keywords), false)",
+    """
+    UPDATE community_posts p SET comment_count = c.n
+    FROM (
+        SELECT post_id, count(*) AS n FROM community_comments GROUP BY post_id
+    ) c
+    WHERE c.post_id = p.id
+    """,
+]
+
+
+def _ranges(total: int, size: int) -> Iterator[Tuple[int, int]]:
+    for start in range(1, total + 1, size):
+        yield start, min(start + size - 1, total)
+
+
+def _run_phase(pool, tasks: List[Tuple[str, int, int]], stats: Dict) -> None:
+    futures = [pool.submit(_run_task, task) for task in tasks]
+    for future in as_completed(futures):
+        for table, count, started, finished in future.result():
+            rows, first, last = stats.get(table, (0, started, finished))
+            stats[table] = (rows + count, min(first, started), max(last, finished))
+
+
+def _assign_communities(chunk: int) -> Tuple[str, int, float, float]:
+    started = time.time()
+    db = SessionLocal()
+    try:
+        max_id = db.execute(text("SELECT max(id) FROM user_school_anchors")).scalar()
+        for start, end in _ranges(max_id or 0, chunk * 5):
+            crud.assign_communities_for_anchors(db, start, end, bump_versions=False)
+            db.commit()
+        members = db.execute(text("SELECT count(*) FROM community_members")).scalar()
+    finally:
+        db.close()
+    return "community_members", members, started, time.time()
+
+
+def _print_stats(stats: Dict, started: float) -> None:
+    # 테이블 시간 = 그 테이블 첫 COPY 시작 ~ 마지막 COPY 끝 (워커끼리 겹친 구간 포함)
+    print(f"{'테이블':24s} {'행 수':>12s} {'시간(s)':>9s} {'행/초':>12s}")
+    total_rows = 0
+    for table, (rows, first, last) in stats.items():
+        seconds = max(last - first, 1e-6)
+        total_rows += rows
+        print(f"{table:24s} {rows:12,d} {seconds:9.1f} {rows / seconds:12,.0f}")
+    elapsed = time.time() - started
+    print(
+        f"{'합계':24s} {total_rows:12,d} {elapsed:9.1f} {total_rows / elapsed:12,.0f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="규모 테스트용 합성 데이터 생성")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--institutions", type=int, default=12_000)
+    parser.add_argument("--keywords", type=int, default=20_000)
+    parser.add_argument("--keywords-per-user", type=float, default=6.0)
+    parser.add_argument("--friends-per-user", type=float, default=12.0)
+    parser.add_argument("--posts-per-member", type=float, default=0.3)
+    parser.add_argument("--comments-per-post", type=float, default=2.0)
+    parser.add_argument("--days", type=int, default=730, help="생성 시각 범위(일)")
+    parser.add_argument(
+        "--until",
+        help="생성 시각 상한 YYYY-MM-DD (기본: 오늘 0시 UTC, 결정성은 이 값 기준)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--chunk", type=int, default=20_000, help="작업 조각당 유저 수")
+    parser.add_argument("--password", default="password123", help="모든 유저 비밀번호")
+    parser.add_argument("--truncate", action="store_true", help="기존 데이터 비우기")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        if args.truncate:
+            conn.execute(text(TRUNCATE_SQL))
+        elif conn.execute(text("SELECT EXISTS (SELECT 1 FROM users)")).scalar():
+            raise SystemExit(
+                "[generate_dataset] users 가 비어 있지 않습니다. --truncate 필요"
+            )
+
+    until_day = date.fromisoformat(args.until) if args.until else date.today()
+    plan = Plan(
+        seed=args.seed,
+        users=args.users,
+        institutions=args.institutions,
+        keywords=args.keywords,
+        until=datetime.combine(until_day, dt_time(), tzinfo=timezone.utc),
+        days=args.days,
+        # argon2 는 여기서 한 번만
+        password_hash=security.get_password_hash(args.password),
+        posts_per_member=args.posts_per_member,
+        comments_per_post=args.comments_per_post,
+        friends_per_user=args.friends_per_user,
+        keywords_per_user=args.keywords_per_user,
+    )
+    # 게시글 생성 시각 범위의 월 파티션 (partitions.py)
+    with engine.begin() as conn:
+        if partitions.is_partitioned(conn, "community_posts"):
+            partitions.ensure_partitions(
+                conn,
+                "community_posts",
+                plan.until - timedelta(days=plan.days),
+                plan.until,
+            )
+    print(
+        f"[generate_dataset] users={args.users:,} institutions={args.institutions:,} "
+        f"keywords={args.keywords:,} workers={args.workers} seed={args.seed}"
+    )
+
+    started = time.time()
+    stats: Dict[str, Tuple[int, float, float]] = {}
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_init_worker, initargs=(plan,)
+    ) as pool:
+        small = max(1, args.chunk // 4)
+        _run_phase(
+            pool,
+            [("institutions", s, e) for s, e in _ranges(args.institutions, small)]
+            + [("keywords", s, e) for s, e in _ranges(args.keywords, small)],
+            stats,
+        )
+        _run_phase(
+            pool, [("users", s, e) for s, e in _ranges(args.users, args.chunk)], stats
+        )
+        _run_phase(
+            pool,
+            [("user_details", s, e) for s, e in _ranges(args.users, args.chunk)],
+            stats,
+        )
+
+        table, rows, first, last = _assign_communities(args.chunk)
+        stats[table] = (rows, first, last)
+        with engine.connect() as conn:
+            communities = conn.execute(text("SELECT max(id) FROM communities")).scalar()
+        community_chunk = max(1, (communities or 0) // (args.workers * 8) or 1)
+        _run_phase(
+            pool,
+            [
+                ("community_content", s, e)
+                for s, e in _ranges(communities or 0, community_chunk)
+            ],
+            stats,
+        )
+
+    with engine.begin() as conn:
+        for sql in FINALIZE_SQL:
+            conn.execute(text(sql))
+    db = SessionLocal()
+    try:
+        crud.refresh_keyword_counts(db)
+    finally:
+        db.close()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+    _print_stats(stats, started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# path: institution_codebook.py
+"""
+학교 코드북: 활성 학교 전체를 공유 스냅샷(shared_snapshot)으로 만들어 검색한다.
+
+- /institutions/search 는 요청마다 DB 에서 name ILIKE '%q%' 로 훑었다.
+  학교 목록은 동기화 작업 때만 바뀌므로 서버가 스냅샷 하나를 mmap 해서 DB 없이 답한다.
+- 배열
+  - 이름 순으로 정렬한 id / 학교급·시도·구군·동 코드(코드표는 헤더 meta)
+  - name / address 문자열 (blob + offsets)
+  - search_blob: 소문자화한 이름을 '\\n' 으로 이어 붙인 바이트.
+    부분 일치는 mmap.find 로 blob 을 (복사 없이) 훑고, 위치 → 행 번호는 searchsorted.
+    행이 이름 순이라 앞에서부터 limit 개를 채우면 바로 멈춘다.
+- 결과는 crud.INSTITUTION_FIELDS 순서의 튜플 (DB 경로와 같은 모양).
+- 스냅샷은 build_snapshots.py / serve.py 가 만든다. 없으면 get_codebook() 은 None.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+import models
+import shared_snapshot
+
+SNAPSHOT_NAME = "institution_codebook"
+SNAPSHOT_MAGIC = b"INSTCB01"
+
+_CODE_COLUMNS = (
+    "institution_type",
+    "region_city",
+    "region_district",
+    "region_neighborhood",
+)
+_NONE_CODE = -1
+
+
+def build_snapshot_from_db(db: Session, path: str) -> int:
+    """활성 학교 전체로 코드북 스냅샷을 만든다. 반환값: 학교 수"""
+    inst = models.Institution
+    rows = (
+        db.query(
+            inst.id,
+            inst.name,
+            inst.address,
+            *(getattr(inst, column) for column in _CODE_COLUMNS),
+        )
+        .filter(inst.is_active.is_(True))
+        .all()
+    )
+    rows.sort(key=lambda row: (row.name, row.id))
+
+    arrays = {"ids": np.array([row.id for row in rows], dtype=np.int64)}
+    code_tables = {}
+    for column in _CODE_COLUMNS:
+        values = sorted({getattr(row, column) for row in rows} - {None})
+        codes = {value: i for i, value in enumerate(values)}
+        arrays[column] = np.array(
+            [codes.get(getattr(row, column), _NONE_CODE) for row in rows],
+            dtype=np.int32,
+        )
+        code_tables[column] = values
+
+    arrays["name_blob"], arrays["name_offsets"] = shared_snapshot.encode_strings(
+        row.name for row in rows
+    )
+    arrays["address_blob"], arrays["address_offsets"] = shared_snapshot.encode_strings(
+        row.address or "" for row in rows
+    )
+    search = "".join(f"{row.name.lower()}\n" for row in rows).encode()
+    arrays["search_blob"] = np.frombuffer(search, dtype=np.uint8)
+    # 각 행의 search_blob 시작 위치 (소문자화로 길이가 바뀔 수 있어 따로 센다)
+    arrays["search_offsets"] = np.zeros(len(rows) + 1, dtype=np.int64)
+    arrays["search_offsets"][1:] = np.cumsum(
+        [len(row.name.lower().encode()) + 1 for row in rows]
+    )
+
+    shared_snapshot.write(
+        path, SNAPSHOT_MAGIC, arrays, {"codes": code_tables, "count": len(rows)}
+    )
+    return len(rows)
+
+
+class InstitutionCodebook:
+    def __init__(self, path: str) -> None:
+        snapshot = shared_snapshot.Snapshot(path, SNAPSHOT_MAGIC)
+        self.snapshot = snapshot
+        self.ids = snapshot.view("ids")
+        self.names = snapshot.strings("name")
+        self.addresses = snapshot.strings("address")
+        self.code_arrays = {column: snapshot[column] for column in _CODE_COLUMNS}
+        self.code_tables = snapshot.meta["codes"]
+        self.search_offsets = np.asarray(snapshot["search_offsets"])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _code(self, column: str, value: Optional[str]) -> Optional[int]:
+        """필터 값 → 코드. 코드표에 없는 값이면 None (결과 없음)"""
+        try:
+            return self.code_tables[column].index(value)
+        except ValueError:
+            return None
+
+    def _row(self, index: int) -> tuple:
+        codes = {column: self.code_arrays[column][index] for column in _CODE_COLUMNS}
+        decoded = {
+            column: (self.code_tables[column][code] if code != _NONE_CODE else None)
+            for column, code in codes.items()
+        }
+        return (
+            self.ids[index],
+            self.names[index],
+            decoded["institution_type"],
+            decoded["region_city"],
+            decoded["region_district"],
+            decoded["region_neighborhood"],
+            self.addresses[index] or None,
+            True,
+        )
+
+    def search(
+        self,
+        q: Optional[str] = None,
+        city: Optional[str] = None,
+        district: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[tuple]:
+        """
+        crud.search_institutions 의 DB 경로와 같은 조건 / 순서.
+        q 는 글자 그대로 부분 일치 (%, _ 도 글자), 이름 코드포인트 순 (DB 쪽은 COLLATE "C") → id 순.
+        """
+        filters = []
+        for column, value in (("region_city", city), ("region_district", district)):
+            if value:
+                code = self._code(column, value)
+                if code is None:
+                    return []
+                filters.append((self.code_arrays[column], code))
+
+        if not q:
+            mask = np.ones(len(self), dtype=bool)
+            for array, code in filters:
+                mask &= array == code
+            return [self._row(i) for i in np.flatnonzero(mask)[:limit]]
+
+        needle = q.lower().encode()
+        indexes: List[int] = []
+        position = self.snapshot.find("search_blob", needle)
+        while position != -1 and len(indexes) < limit:
+            index = int(np.searchsorted(self.search_offsets, position, "right")) - 1
+            if all(array[index] == code for array, code in filters):
+                indexes.append(index)
+            # 같은 행 안의 다음 매칭은 건너뛴다
+            position = self.snapshot.find(
+                "search_blob", needle, int(self.search_offsets[index + 1])
+            )
+        return [self._row(i) for i in indexes]
+
+
+_handle = shared_snapshot.SnapshotHandle(SNAPSHOT_NAME, InstitutionCodebook)
+
+
+def get_codebook() -> Optional[InstitutionCodebook]:
+    return _handle.get()
@@ -0,0 +1,303 @@
+# path: keyword_affinity.py
+"""
+키워드 유사도(affinity) 점수 계산기.
+
+- 키워드 사전 id(keywords.id)를 0부터 시작하는 열 번호로 바꾸고,
+  유저별 (열 번호, weight) 희소 벡터를 CSR 배열(indptr / indices / data)로 보관한다.
+- 한 유저 vs 후보 유저들의 TF-IDF 코사인 유사도를 NumPy 연산 한 번에 계산한다.
+- add_user_keyword 가 호출될 때마다 해당 유저 행만 CSR 끝에 다시 붙인다.
+  (예전 행은 버려진 영역으로 남기고, 버려진 양이 많아지면 한 번에 압축)
+
+⚠️ 프로세스 메모리에 있는 인덱스이므로 워커마다 따로 가진다.
+   다른 워커에서 추가된 키워드는 get_index 가 다시 적재해서 반영한다.
+   - VERSION_CHECK_SECONDS 마다 max(user_keywords.id) 를 보고 적재 때와 다르면 (새 키워드 행)
+   - RELOAD_INTERVAL_SECONDS 가 지나면 (weight 만 바뀐 경우까지)
+   새 인덱스를 따로 만든 뒤 참조만 바꿔 끼우고, 그동안 다른 스레드는 기존 인덱스를 쓴다.
+   특정 유저의 최신 벡터가 꼭 필요하면 (추천 재계산) refresh_users 로 그 유저 행만 DB 에서 다시 읽는다.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+import models
+
+
+# weight 가 비어 있는 키워드의 기본 가중치
+DEFAULT_WEIGHT = 1.0
+
+# 버려진 CSR 영역이 전체의 이 비율을 넘으면 압축(전체 재구성)
+COMPACT_RATIO = 0.5
+
+# 다른 워커의 키워드 추가 확인 주기 / weight 변경까지 반영하는 전체 재적재 주기
+VERSION_CHECK_SECONDS = 10.0
+RELOAD_INTERVAL_SECONDS = 600.0
+
+
+def _keyword_rows_version(db: Session) -> int:
+    """user_keywords 의 가장 큰 id (PK 인덱스 끝 한 번). 새 행이 생기면 바뀐다."""
+    return db.query(func.coalesce(func.max(models.UserKeyword.id), 0)).scalar()
+
+
+class KeywordAffinityIndex:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.loaded = False
+        # 적재 시작 때의 _keyword_rows_version / 적재 시각 / 마지막 버전 확인 시각
+        self.version: Optional[int] = None
+        self.loaded_at: Optional[float] = None
+        self.checked_at = 0.0
+        self._reset_locked()
+
+    def _reset_locked(self) -> None:
+        # keywords.id → CSR 열 번호
+        self._columns: Dict[int, int] = {}
+        self._doc_freq = np.zeros(1024, dtype=np.int64)
+
+        # 유저 → (열 번호 → weight). CSR 재구성의 원본.
+        self._user_keywords: Dict[int, Dict[int, float]] = {}
+
+        # CSR (행 = 유저). capacity 를 두 배씩 늘려 가며 끝에 이어 붙인다.
+        self._row_of_user: Dict[int, int] = {}
+        self._indptr = np.zeros(1025, dtype=np.int64)
+        self._indices = np.zeros(4096, dtype=np.int32)
+        self._data = np.zeros(4096, dtype=np.float32)
+        self._n_rows = 0
+        self._nnz = 0
+        self._garbage = 0
+
+        self._dirty_users: set[int] = set()
+
+    # --------------------------------------------------------
+    # 적재 / 증분 갱신
+    # --------------------------------------------------------
+
+    def load(self, db: Session) -> None:
+        """user_keywords 전체를 읽어 CSR 을 처음부터 만든다."""
+        # 읽기 전에 잡아 둔다 (읽는 사이 추가된 행은 다음 확인에서 다시 적재)
+        version = _keyword_rows_version(db)
+        rows = db.query(
+            models.UserKeyword.user_id,
+            models.UserKeyword.keyword_id,
+            models.UserKeyword.weight,
+        ).yield_per(10000)
+        self.load_rows(rows)
+        self.version = version
+        self.loaded_at = self.checked_at = time.monotonic()
+
+    def needs_reload(self, db: Session) -> bool:
+        now = time.monotonic()
+        loaded_at = self.loaded_at
+        if loaded_at is not None and now - loaded_at > RELOAD_INTERVAL_SECONDS:
+            return True
+        if now - self.checked_at < VERSION_CHECK_SECONDS:
+            return False
+        self.checked_at = now
+        return _keyword_rows_version(db) != self.version
+
+    def refresh_users(self, db: Session, user_ids: Sequence[int]) -> None:
+        """user_ids 의 키워드 행을 DB 에서 다시 읽어 벡터를 통째로 바꾼다."""
+        vectors: Dict[int, list] = {user_id: [] for user_id in user_ids}
+        rows = db.query(
+            models.UserKeyword.user_id,
+            models.UserKeyword.keyword_id,
+            models.UserKeyword.weight,
+        ).filter(models.UserKeyword.user_id.in_(list(vectors)))
+        for user_id, keyword_id, weight in rows:
+            vectors[user_id].append((keyword_id, weight))
+        with self._lock:
+            for user_id, keywords in vectors.items():
+                self._replace_user_locked(user_id, keywords)
+
+    def load_rows(self, rows: Iterable[Sequence]) -> None:
+        """(user_id, keyword_id, weight) 튜플 목록으로 CSR 을 처음부터 만든다."""
+        with self._lock:
+            self._reset_locked()
+            for user_id, keyword_id, weight in rows:
+                self._add_locked(user_id, keyword_id, weight)
+            self._compact_locked()
+            self.loaded = True
+
+    def add(self, user_id: int, keyword_id: int, weight: Optional[int] = None) -> None:
+        with self._lock:
+            self._add_locked(user_id, keyword_id, weight)
+
+    def _add_locked(self, user_id: int, keyword_id: int, weight: Optional[int]) -> None:
+        column = self._columns.get(keyword_id)
+        if column is None:
+            column = len(self._columns)
+            self._columns[keyword_id] = column
+            if column >= len(self._doc_freq):
+                self._doc_freq = _grow(self._doc_freq, column + 1)
+
+        vector = self._user_keywords.setdefault(user_id, {})
+        if column not in vector:
+            self._doc_freq[column] += 1
+        # (user_id, keyword_id) 는 유니크 → 다시 들어오면 weight 갱신
+        vector[column] = float(weight) if weight is not None else DEFAULT_WEIGHT
+        self._dirty_users.add(user_id)
+
+    def _replace_user_locked(self, user_id: int, keywords: list) -> None:
+        old = self._user_keywords.pop(user_id, None)
+        if old:
+            for column in old:
+                self._doc_freq[column] -= 1
+        self._dirty_users.discard(user_id)
+        if keywords:
+            for keyword_id, weight in keywords:
+                self._add_locked(user_id, keyword_id, weight)
+            return
+        # 키워드가 없어졌다 → CSR 행도 버린다
+        old_row = self._row_of_user.pop(user_id, None)
+        if old_row is not None:
+            self._garbage += int(self._indptr[old_row + 1] - self._indptr[old_row])
+
+    def _flush_locked(self) -> None:
+        """바뀐 유저 행들을 CSR 끝에 다시 붙인다."""
+        if not self._dirty_users:
+            return
+
+        for user_id in self._dirty_users:
+            old_row = self._row_of_user.get(user_id)
+            if old_row is not None:
+                self._garbage += int(
+                    self._indptr[old_row + 1] - self._indptr[old_row]
+                )
+            self._append_row_locked(user_id, self._user_keywords[user_id])
+        self._dirty_users.clear()
+
+        if self._garbage > self._nnz * COMPACT_RATIO:
+            self._compact_locked()
+
+    def _append_row_locked(self, user_id: int, vector: Dict[int, float]) -> None:
+        n = len(vector)
+        if self._nnz + n > len(self._indices):
+            self._indices = _grow(self._indices, self._nnz + n)
+            self._data = _grow(self._data, self._nnz + n)
+        if self._n_rows + 2 > len(self._indptr):
+            self._indptr = _grow(self._indptr, self._n_rows + 2)
+
+        start = self._nnz
+        self._indices[start : start + n] = np.fromiter(vector.keys(), np.int32, n)
+        self._data[start : start + n] = np.fromiter(vector.values(), np.float32, n)
+        self._nnz += n
+
+        self._row_of_user[user_id] = self._n_rows
+        self._n_rows += 1
+        self._indptr[self._n_rows] = self._nnz
+
+    def _compact_locked(self) -> None:
+        """버려진 영역 없이 CSR 을 다시 만든다."""
+        self._row_of_user = {}
+        self._n_rows = 0
+        self._nnz = 0
+        self._garbage = 0
+        self._indptr[0] = 0
+        for user_id, vector in self._user_keywords.items():
+            self._append_row_locked(user_id, vector)
+        self._dirty_users.clear()
+
+    # --------------------------------------------------------
+    # 점수 계산
+    # --------------------------------------------------------
+
+    def _idf_locked(self) -> np.ndarray:
+        n_users = max(len(self._user_keywords), 1)
+        df = self._doc_freq[: len(self._columns)]
+        return (np.log((n_users + 1) / (df + 1)) + 1.0).astype(np.float32)
+
+    def _gather_locked(self, rows: np.ndarray):
+        """
+        rows 에 해당하는 CSR 행들의 (행 번호, 열 번호, weight) 를 한 번에 모은다.
+        반환: (row_labels, indices, data) — row_labels 는 0..len(rows)-1
+        """
+        starts = self._indptr[rows]
+        lengths = self._indptr[rows + 1] - starts
+        total = int(lengths.sum())
+        row_labels = np.repeat(np.arange(len(rows)), lengths)
+        # 각 행의 시작 위치 + 행 안에서의 offset
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(starts, lengths) + offsets
+        return row_labels, self._indices[positions], self._data[positions]
+
+    def scores(self, user_id: int, candidate_ids: Sequence[int]) -> List[float]:
+        """
+        user_id 와 candidate_ids 각각의 TF-IDF 코사인 유사도 (0.0 ~ 1.0).
+        키워드가 없는 유저는 0.0.
+        """
+        with self._lock:
+            self._flush_locked()
+            if user_id not in self._row_of_user or not candidate_ids:
+                return [0.0] * len(candidate_ids)
+
+            idf = self._idf_locked()
+
+            # 기준 유저 벡터를 dense 로 펼친다 (어휘 크기만큼)
+            _, q_idx, q_val = self._gather_locked(
+                np.array([self._row_of_user[user_id]])
+            )
+            query = np.zeros(len(idf), dtype=np.float32)
+            query[q_idx] = q_val * idf[q_idx]
+            query_norm = float(np.linalg.norm(query))
+
+            present = np.array(
+                [self._row_of_user.get(c, -1) for c in candidate_ids], dtype=np.int64
+            )
+            mask = present >= 0
+            labels, idx, val = self._gather_locked(present[mask])
+            weighted = val * idf[idx]
+            n = int(mask.sum())
+            dots = np.bincount(labels, weights=weighted * query[idx], minlength=n)
+            norms = np.sqrt(np.bincount(labels, weights=weighted**2, minlength=n))
+
+        result = np.zeros(len(candidate_ids), dtype=np.float64)
+        denom = norms * query_norm
+        result[mask] = np.divide(dots, denom, out=np.zeros(n), where=denom > 0)
+        return result.tolist()
+
+
+def _grow(array: np.ndarray, min_size: int) -> np.ndarray:
+    size = len(array)
+    while size < min_size:
+        size *= 2
+    grown = np.zeros(size, dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+# 프로세스 전역 인덱스 (첫 사용 시 DB 에서 적재, 이후 get_index 가 교체)
+affinity_index = KeywordAffinityIndex()
+_reload_lock = threading.Lock()
+
+
+def get_index(db: Session) -> KeywordAffinityIndex:
+    global affinity_index
+    if not affinity_index.loaded:
+        # 첫 적재는 기다린다 (한 스레드만 읽음)
+        with _reload_lock:
+            if not affinity_index.loaded:
+                affinity_index.load(db)
+        return affinity_index
+
+    index = affinity_index
+    # 다시 적재는 한 스레드만, 나머지는 기존 인덱스로 계속 계산
+    if index.needs_reload(db) and _reload_lock.acquire(blocking=False):
+        try:
+            fresh = KeywordAffinityIndex()
+            fresh.load(db)
+            affinity_index = fresh
+        finally:
+            _reload_lock.release()
+    return affinity_index
+
+
+def on_keyword_added(user_id: int, keyword_id: int, weight: Optional[int]) -> None:
+    """crud.add_user_keyword 에서 호출. 아직 적재 전이면 무시 (적재 시 DB 에서 읽는다)."""
+    if affinity_index.loaded:
+        affinity_index.add(user_id, keyword_id, weight)
@@ -0,0 +1,269 @@
+# path: keyword_dictionary.py
+"""
+키워드 사전 (keywords 테이블) 의 프로세스 내 캐시.
+
+1) intern: 키워드 문자열 → keywords.id
+   - text_normalize.normalize_keyword 로 정규화한 형태가 같으면 같은 id
+     ("ＦＣ서울" == "fc서울", "힙합  댄스" == "힙합 댄스". 기호는 남기므로 "C++" != "C")
+   - id 는 바뀌지 않으므로 캐시가 stale 해질 일이 없다 (LRU 로 크기만 제한)
+     단, 이번 트랜잭션에서 새로 INSERT 한 id 는 롤백될 수 있으므로 캐시하지 않는다.
+   - 캐시에 없는 것만 모아서 SELECT 1번, 그래도 없는 것만 INSERT 1번
+
+2) autocomplete: 인기 키워드 자동완성
+   - keywords.user_count (refresh_keyword_counts.py 가 미리 계산) 상위 N 개를
+     정규화 형태로 정렬해 두고, 접두사 범위를 bisect 로 찾는다.
+   - AUTOCOMPLETE_TTL_SECONDS 마다 DB 에서 다시 읽는다 (동시에 만료돼도 한 스레드만 읽음).
+   - SNAPSHOT_DIR 이 켜져 있으면 (serve.py) 같은 목록을 공유 스냅샷 파일에서 mmap 으로 읽는다.
+     워커마다 10만 개 튜플을 따로 들고 있지 않고, 갱신은 스냅샷 교체로 한 번에 반영된다.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+import models
+import shared_snapshot
+import text_normalize
+
+INTERN_CACHE_SIZE = 200_000
+
+AUTOCOMPLETE_SIZE = 100_000
+AUTOCOMPLETE_TTL_SECONDS = 300.0
+
+SNAPSHOT_NAME = "keyword_autocomplete"
+SNAPSHOT_MAGIC = b"KWACSNP1"
+
+
+def _autocomplete_rows(db: Session, size: int) -> List[Tuple[str, int, str, int]]:
+    """인기 상위 size 개 (정규화 형태, user_count, 표시 문자열, id), 정규화 형태 순"""
+    rows = (
+        db.query(
+            models.Keyword.keyword_normalized,
+            models.Keyword.user_count,
+            models.Keyword.keyword,
+            models.Keyword.id,
+        )
+        .filter(models.Keyword.user_count > 0)
+        .order_by(models.Keyword.user_count.desc())
+        .limit(size)
+        .all()
+    )
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+class KeywordDictionary:
+    def __init__(self, cache_size: int = INTERN_CACHE_SIZE) -> None:
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+
+        # 자동완성 스냅샷: 정규화 형태 정렬 목록 + (user_count, 표시 문자열, id)
+        self._ac_keys: List[str] = []
+        self._ac_entries: List[Tuple[int, str, int]] = []
+        self._ac_loaded_at: Optional[float] = None
+        # 다시 읽기 single-flight (_lock 은 load_autocomplete 안에서 잡으므로 따로 둔다)
+        self._ac_reload_lock = threading.Lock()
+
+    # --------------------------------------------------------
+    # intern
+    # --------------------------------------------------------
+
+    def _cache_get(self, normalized: str) -> Optional[int]:
+        with self._lock:
+            keyword_id = self._ids.get(normalized)
+            if keyword_id is not None:
+                self._ids.move_to_end(normalized)
+            return keyword_id
+
+    def _cache_put(self, found: Dict[str, int]) -> None:
+        with self._lock:
+            for normalized, keyword_id in found.items():
+                self._ids[normalized] = keyword_id
+                self._ids.move_to_end(normalized)
+            while len(self._ids) > self.cache_size:
+                self._ids.popitem(last=False)
+
+    def intern_many(self, db: Session, keywords: Sequence[str]) -> List[int]:
+        """
+        키워드 목록 → keywords.id 목록 (같은 순서). 사전에 없으면 만든다.
+        정규화 결과가 빈 문자열인 키워드는 ValueError. commit 은 호출하는 쪽에서.
+        """
+        normalized = [text_normalize.normalize_keyword(k) for k in keywords]
+        if any(n is None for n in normalized):
+            raise ValueError("빈 키워드는 등록할 수 없습니다.")
+
+        result: Dict[str, int] = {}
+        display: Dict[str, str] = {}
+        for keyword, norm in zip(keywords, normalized):
+            keyword_id = self._cache_get(norm)
+            if keyword_id is not None:
+                result[norm] = keyword_id
+            else:
+                display.setdefault(norm, keyword.strip())
+
+        missing = list(display)
+        if missing:
+            table = models.Keyword.__table__
+            found = dict(
+                db.query(models.Keyword.keyword_normalized, models.Keyword.id)
+                .filter(models.Keyword.keyword_normalized.in_(missing))
+                .all()
+            )
+            # 이미 커밋된 id 만 캐시한다 (새로 넣은 id 는 호출한 트랜잭션이 롤백될 수 있음)
+            self._cache_put(found)
+
+            to_insert = [n for n in missing if n not in found]
+            if to_insert:
+                stmt = (
+                    insert(table)
+                    .values(
+                        [
+                            {"keyword": display[n], "keyword_normalized": n}
+                            for n in to_insert
+                        ]
+                    )
+                    .on_conflict_do_nothing(index_elements=[table.c.keyword_normalized])
+                    .returning(table.c.keyword_normalized, table.c.id)
+                )
+                found.update(dict(db.execute(stmt).all()))
+                # 동시에 다른 요청이 먼저 넣은 경우
+                raced = [n for n in to_insert if n not in found]
+                if raced:
+                    found.update(
+                        dict(
+                            db.query(
+                                models.Keyword.keyword_normalized, models.Keyword.id
+                            )
+                            .filter(models.Keyword.keyword_normalized.in_(raced))
+                            .all()
+                        )
+                    )
+            result.update(found)
+
+        return [result[n] for n in normalized]
+
+    def intern(self, db: Session, keyword: str) -> int:
+        return self.intern_many(db, [keyword])[0]
+
+    # --------------------------------------------------------
+    # autocomplete
+    # --------------------------------------------------------
+
+    def load_autocomplete(self, db: Session, size: int = AUTOCOMPLETE_SIZE) -> None:
+        rows = _autocomplete_rows(db, size)
+        keys = [row[0] for row in rows]
+        entries = [(row[1], row[2], row[3]) for row in rows]
+        with self._lock:
+            self._ac_keys, self._ac_entries = keys, entries
+            self._ac_loaded_at = time.monotonic()
+
+    def _ac_expired(self) -> bool:
+        loaded_at = self._ac_loaded_at
+        return (
+            loaded_at is None
+            or time.monotonic() - loaded_at > AUTOCOMPLETE_TTL_SECONDS
+        )
+
+    def autocomplete(
+        self, db: Session, prefix: str, limit: int = 10
+    ) -> List[Tuple[int, str, int]]:
+        """접두사로 시작하는 인기 키워드 (user_count, keyword, id) 상위 limit 개"""
+        snapshot = get_autocomplete_snapshot()
+        if snapshot is not None:
+            return snapshot.autocomplete(prefix, limit)
+
+        if self._ac_expired():
+            # 만료 시 한 스레드만 다시 읽는다 (나머지는 기다렸다가 새 목록 사용)
+            with self._ac_reload_lock:
+                if self._ac_expired():
+                    self.load_autocomplete(db)
+
+        normalized = text_normalize.normalize_keyword(prefix)
+        with self._lock:
+            keys, entries = self._ac_keys, self._ac_entries
+        if not normalized:
+            return heapq.nlargest(limit, entries)
+
+        lo = bisect.bisect_left(keys, normalized)
+        hi = bisect.bisect_left(keys, normalized + "\U0010ffff")
+        return heapq.nlargest(limit, entries[lo:hi])
+
+
+# ============================================================
+# 공유 스냅샷 (serve.py 워커용)
+# ============================================================
+
+
+def build_autocomplete_snapshot(
+    db: Session, path: str, size: int = AUTOCOMPLETE_SIZE
+) -> int:
+    """자동완성 목록을 스냅샷 파일로 쓴다. 반환값: 키워드 수"""
+    rows = _autocomplete_rows(db, size)
+    arrays = {
+        "user_counts": np.array([row[1] for row in rows], dtype=np.int64),
+        "ids": np.array([row[3] for row in rows], dtype=np.int64),
+    }
+    arrays["key_blob"], arrays["key_offsets"] = shared_snapshot.encode_strings(
+        row[0] for row in rows
+    )
+    arrays["keyword_blob"], arrays["keyword_offsets"] = shared_snapshot.encode_strings(
+        row[2] for row in rows
+    )
+    shared_snapshot.write(path, SNAPSHOT_MAGIC, arrays, {"count": len(rows)})
+    return len(rows)
+
+
+class AutocompleteSnapshot:
+    """load_autocomplete 목록과 같은 내용 / 순서를 mmap 으로 읽는다"""
+
+    def __init__(self, path: str) -> None:
+        snapshot = shared_snapshot.Snapshot(path, SNAPSHOT_MAGIC)
+        self.snapshot = snapshot
+        self.keys = snapshot.strings("key")
+        self.keywords = snapshot.strings("keyword")
+        self.user_counts = snapshot["user_counts"]
+        self.ids = snapshot.view("ids")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Tuple[int, str, int]]:
+        normalized = text_normalize.normalize_keyword(prefix)
+        if normalized:
+            lo = bisect.bisect_left(self.keys, normalized)
+            hi = bisect.bisect_left(self.keys, normalized + "\U0010ffff")
+        else:
+            lo, hi = 0, len(self)
+        counts = self.user_counts[lo:hi]
+        if len(counts) > limit:
+            # limit 번째로 큰 값 이상만 후보로 (동점 포함 → heapq 결과와 같다)
+            kth = np.partition(counts, len(counts) - limit)[len(counts) - limit]
+            candidates = lo + np.flatnonzero(counts >= kth)
+        else:
+            candidates = range(lo, hi)
+        entries = [
+            (int(self.user_counts[i]), self.keywords[i], self.ids[i])
+            for i in map(int, candidates)
+        ]
+        return heapq.nlargest(limit, entries)
+
+
+_autocomplete_snapshot = shared_snapshot.SnapshotHandle(
+    SNAPSHOT_NAME, AutocompleteSnapshot
+)
+
+
+def get_autocomplete_snapshot() -> Optional[AutocompleteSnapshot]:
+    return _autocomplete_snapshot.get()
+
+keyword_dictionary = KeywordDictionary()
@@ -0,0 +1,85 @@
+# path: load_embeddings.py
+"""
+프로필 임베딩 적재 스크립트.
+
+- 임베딩 모델(외부 서비스 / 배치 작업)이 만든 JSONL 을 읽어
+  user_profiles.matching_embedding 에 float32 바이트로 저장한다 (crud.set_profile_embedding).
+  한 줄 형식: {"user_id": 1, "embedding": [0.1, ...]}
+- 차원이 --dimension 과 다르거나 없는 유저의 줄은 건너뛴다.
+- --batch-size 줄마다 commit, --rebuild 면 끝나고 IVF 스냅샷도 다시 만든다
+  (/users/me/similar-profiles 가 읽는 것은 스냅샷이다).
+
+사용법:
+    python load_embeddings.py --input embeddings.jsonl --model text-embedding-3-small
+    python load_embeddings.py --input embeddings.jsonl --model m --model-version 2 --rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import orjson
+from sqlalchemy.orm import Session
+
+import crud
+import embedding_index
+import models
+from database import SessionLocal
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="프로필 임베딩 적재")
+    parser.add_argument("--input", required=True, help="JSONL 경로")
+    parser.add_argument("--model", required=True, help="embedding_model 에 기록")
+    parser.add_argument("--model-version")
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--rebuild", action="store_true", help="IVF 스냅샷 다시 만들기")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    loaded = skipped = 0
+    db: Session = SessionLocal()
+    try:
+        with open(args.input, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = orjson.loads(line)
+                vector = row.get("embedding") or []
+                if len(vector) != args.dimension or not db.get(
+                    models.User, row["user_id"]
+                ):
+                    skipped += 1
+                    continue
+                crud.set_profile_embedding(
+                    db,
+                    row["user_id"],
+                    vector,
+                    model=args.model,
+                    model_version=args.model_version,
+                    commit=False,
+                )
+                loaded += 1
+                if loaded % args.batch_size == 0:
+                    db.commit()
+                    db.expunge_all()
+        db.commit()
+        print(
+            f"[load_embeddings] 저장 {loaded}명, 건너뜀 {skipped}줄 "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+
+        if args.rebuild:
+            count = embedding_index.build_snapshot_from_db(db)
+            print(
+                f"[load_embeddings] 스냅샷 벡터 {count}개 → "
+                f"{embedding_index.SNAPSHOT_PATH}"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
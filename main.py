@@ -1,7 +1,14 @@
 # path: main.py
-from typing import List, Optional
+import hashlib
+import itertools
+import os
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 
-from fastapi import FastAPI, Depends, HTTPException, Query
+import orjson
+
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -9,11 +16,24 @@ import models
 import schemas
 import crud
 import security
-import ai_service  # 기존 파일 그대로 사용
+import admission
+import metrics
+import tracing
+from block_filter import block_cache
+import embedding_index
+import friend_graph
+import matching
+import partitions
 from database import engine, get_db, check_db_connection
 
-# 1) 테이블 생성 (개발용 빠른 생성)
+# 1) 테이블 생성 (개발용 빠른 생성) + 이번 달 ~ 몇 달 뒤 파티션
 models.Base.metadata.create_all(bind=engine)
+with engine.begin() as _conn:
+    partitions.ensure_upcoming(_conn)
+
+# 2) 트레이싱 (TRACES_SAMPLE_RATE > 0 일 때만 켜짐, 앱 생성 전에 초기화)
+if tracing.init():
+    tracing.trace_functions(crud, op="crud")
 
 app = FastAPI(
     title="Intersection / Humane Backend (v1)",
@@ -21,6 +41,13 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# 요청 단위 계측 (라우트별 지연 / SQL 수 / 느린 요청 로그 → GET /metrics)
+# add_middleware 는 바깥쪽으로 쌓이므로 admission 이 metrics 안쪽이 된다
+# (대기 시간과 503 도 요청 지표에 잡힌다)
+metrics.install_sql_hooks(engine)
+app.add_middleware(admission.AdmissionMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
@@ -31,6 +58,15 @@ def get_db_session() -> Session:
     yield from get_db()
 
 
+def _rows_response(rows, fields) -> ORJSONResponse:
+    """
+    목록 응답 빠른 경로: 컬럼 튜플을 pydantic 검증 없이 orjson 으로 바로 직렬화.
+    fields 는 응답 스키마의 필드 순서 (JSON 모양은 response_model 과 같다).
+    """
+    return ORJSONResponse([dict(zip(fields, row)) for row in rows])
+
+
+@tracing.traced("auth", name="get_current_user")
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db_session),
@@ -51,6 +87,100 @@ def get_current_user(
     return user
 
 
+# 운영자 login_id 목록 (쉼표 구분)
+MODERATOR_LOGIN_IDS = {
+    login_id.strip()
+    for login_id in os.getenv("MODERATOR_LOGIN_IDS", "").split(",")
+    if login_id.strip()
+}
+
+
+def get_current_moderator(
+    current_user: models.User = Depends(get_current_user),
+) -> models.User:
+    if current_user.login_id not in MODERATOR_LOGIN_IDS:
+        raise HTTPException(status_code=403, detail="운영자 권한이 필요합니다.")
+    return current_user
+
+
+# -----------------------------
+# 조건부 GET (ETag / If-None-Match)
+#   ETag 는 행을 읽지 않고 버전 표시값(users.data_version, communities.posts_version)
+#   + 경로/쿼리로 만든다. 같으면 목록 조회/직렬화 없이 304.
+#   (친구 목록은 예외: 친구 닉네임을 PK 로 읽어 넣는다. check_friends_etag 참고)
+# -----------------------------
+
+
+def _check_etag(request: Request, response: Response, *versions) -> str:
+    key = "|".join([request.url.path, request.url.query, *map(str, versions)])
+    etag = f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag.removeprefix("W/") in candidates or "*" in candidates:
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return etag
+
+
+def check_user_etag(
+    request: Request,
+    response: Response,
+    current_user: models.User = Depends(get_current_user),
+) -> str:
+    """/users/me* 용: 인증 때 읽은 유저 행의 data_version 만 쓴다 (추가 쿼리 없음)"""
+    return _check_etag(request, response, current_user.id, current_user.data_version)
+
+
+def check_friends_etag(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+) -> List[Tuple[int, str]]:
+    """
+    /users/me/friends 용: 친구 목록은 워커별 friend_graph 스냅샷에서 읽는다.
+    다른 워커에서 수락된 친구는 이 워커 스냅샷에 늦게 들어오므로 data_version 만으로는
+    옛 목록에 새 ETag 가 붙을 수 있다 → 스냅샷에서 읽은 친구 id 자체를 ETag 에 넣는다.
+    응답의 닉네임(과 탈퇴/비활성 제외)은 친구 쪽 users 행에 달려 있고 내 data_version 은
+    그대로이므로, 친구 행을 PK 로 한 번 읽어 (id, 닉네임) 까지 ETag 에 넣는다.
+    반환값: (친구 id, 닉네임) 목록 (핸들러가 다시 읽지 않는다)
+    """
+    friend_ids = friend_graph.get_graph(db).neighbors(current_user.id).tolist()
+    nicknames = crud.get_nicknames(db, friend_ids)
+    friends = [
+        (user_id, nicknames[user_id]) for user_id in friend_ids if user_id in nicknames
+    ]
+    _check_etag(
+        request,
+        response,
+        current_user.id,
+        current_user.data_version,
+        *itertools.chain.from_iterable(friends),
+    )
+    return friends
+
+
+def check_posts_etag(
+    community_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+) -> str:
+    """
+    게시글 목록용: 커뮤니티 posts_version + 보는 사람(본인 pending 글, 차단 목록).
+    차단 목록은 워커별 block_cache 에서 읽지만 캐시가 data_version 을 같이 보므로
+    (버전이 다르면 다시 읽음) ETag 와 어긋나지 않는다. communities PK 조회 1번.
+    """
+    return _check_etag(
+        request,
+        response,
+        crud.get_posts_version(db, community_id),
+        current_user.id,
+        current_user.data_version,
+    )
+
+
 # -----------------------------
 # Health
 # -----------------------------
@@ -67,6 +197,14 @@ def health_db():
     return {"status": "ok", "message": "Database connection successful"}
 
 
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+def read_metrics():
+    """Prometheus 텍스트 형식 (라우트별 지연 히스토그램, SQL 수/시간, argon2/moderation 시간)"""
+    return PlainTextResponse(
+        metrics.registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
 # -----------------------------
 # Root
 # -----------------------------
@@ -117,11 +255,202 @@ def login_for_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@app.get("/users/me", response_model=schemas.User, tags=["users"])
+@app.get(
+    "/users/me",
+    response_model=schemas.User,
+    tags=["users"],
+    dependencies=[Depends(check_user_etag)],
+)
 def read_users_me(current_user: models.User = Depends(get_current_user)):
     return current_user
 
 
+@app.get(
+    "/users/me/bootstrap",
+    response_model=schemas.UserBootstrap,
+    tags=["users"],
+    dependencies=[Depends(check_user_etag)],
+)
+def read_my_bootstrap(
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    앱 시작 시 한 번에: 유저 / 프로필 / 학교 앵커(학교명 포함) / 키워드 / 가입 커뮤니티.
+    ETag 를 주므로 If-None-Match 로 다시 부르면 바뀐 게 없을 때 304.
+    """
+    return crud.get_user_bootstrap(db, user_id=current_user.id)
+
+
+# -----------------------------
+# Blocks (차단)
+# -----------------------------
+
+
+@app.post("/users/{user_id}/block", status_code=204, tags=["blocks"])
+def block_user(
+    user_id: int,
+    body: schemas.UserBlockCreate,
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    if user_id == current_user.id:
+        raise HTTPException(status_code=400, detail="자기 자신은 차단할 수 없습니다.")
+    if db.get(models.User, user_id) is None:
+        raise HTTPException(status_code=404, detail="존재하지 않는 유저입니다.")
+
+    crud.block_user(
+        db, blocker_user_id=current_user.id, blocked_user_id=user_id, reason=body.reason
+    )
+
+
+@app.delete("/users/{user_id}/block", status_code=204, tags=["blocks"])
+def unblock_user(
+    user_id: int,
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    if not crud.unblock_user(
+        db, blocker_user_id=current_user.id, blocked_user_id=user_id
+    ):
+        raise HTTPException(status_code=404, detail="차단한 유저가 아닙니다.")
+
+
+@app.get(
+    "/users/me/blocks",
+    response_model=List[schemas.UserBlock],
+    tags=["blocks"],
+    dependencies=[Depends(check_user_etag)],
+)
+def list_my_blocks(
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    return crud.list_user_blocks(db, user_id=current_user.id)
+
+
+# -----------------------------
+# Friends (친구)
+# -----------------------------
+
+
+@app.post(
+    "/users/{user_id}/friend-request",
+    response_model=schemas.Friendship,
+    tags=["friends"],
+)
+def send_friend_request(
+    user_id: int,
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    if user_id == current_user.id:
+        raise HTTPException(status_code=400, detail="자기 자신에게는 요청할 수 없습니다.")
+    if db.get(models.User, user_id) is None:
+        raise HTTPException(status_code=404, detail="존재하지 않는 유저입니다.")
+    if user_id in block_cache.get(db, current_user.id, current_user.data_version):
+        raise HTTPException(status_code=400, detail="친구 요청을 보낼 수 없습니다.")
+
+    existing = crud.get_friendship_between(db, current_user.id, user_id)
+    if existing is None:
+        return crud.create_friend_request(
+            db, user_id=current_user.id, friend_user_id=user_id
+        )
+    # 상대가 먼저 보낸 요청이 있으면 바로 수락
+    if existing.status == "pending" and existing.friend_user_id == current_user.id:
+        return crud.accept_friend_request(db, existing)
+    raise HTTPException(status_code=400, detail="이미 친구이거나 요청한 상태입니다.")
+
+
+@app.post(
+    "/users/{user_id}/friend-accept",
+    response_model=schemas.Friendship,
+    tags=["friends"],
+)
+def accept_friend_request(
+    user_id: int,
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    existing = crud.get_friendship_between(db, current_user.id, user_id)
+    if (
+        existing is None
+        or existing.status != "pending"
+        or existing.friend_user_id != current_user.id
+    ):
+        raise HTTPException(status_code=404, detail="받은 친구 요청이 없습니다.")
+    return crud.accept_friend_request(db, existing)
+
+
+@app.get(
+    "/users/me/friend-requests",
+    response_model=List[schemas.Friendship],
+    tags=["friends"],
+    dependencies=[Depends(check_user_etag)],
+)
+def list_friend_requests(
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    return crud.list_incoming_friend_requests(db, user_id=current_user.id)
+
+
+@app.get(
+    "/users/me/friends",
+    response_model=List[schemas.Friend],
+    tags=["friends"],
+)
+def list_friends(friends: List[Tuple[int, str]] = Depends(check_friends_etag)):
+    return [{"user_id": user_id, "nickname": nickname} for user_id, nickname in friends]
+
+
+@app.get(
+    "/users/{user_id}/mutual-friends",
+    response_model=schemas.MutualFriends,
+    tags=["friends"],
+)
+def read_mutual_friends(
+    user_id: int,
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    count = friend_graph.get_graph(db).mutual_count(current_user.id, user_id)
+    return {"user_id": user_id, "mutual_friend_count": count}
+
+
+@app.get(
+    "/users/me/friend-suggestions",
+    response_model=List[schemas.FriendSuggestion],
+    tags=["friends"],
+)
+def list_friend_suggestions(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    blocked = block_cache.get(db, current_user.id, current_user.data_version)
+    suggestions = friend_graph.get_graph(db).suggestions(
+        current_user.id, limit=limit + len(blocked)
+    )
+    suggestions = block_cache.filter(
+        db,
+        current_user.id,
+        suggestions,
+        key=lambda s: s[0],
+        version=current_user.data_version,
+    )[:limit]
+    nicknames = crud.get_nicknames(db, [user_id for user_id, _ in suggestions])
+    return [
+        {
+            "user_id": user_id,
+            "nickname": nicknames[user_id],
+            "mutual_friend_count": count,
+        }
+        for user_id, count in suggestions
+        if user_id in nicknames
+    ]
+
+
 # -----------------------------
 # Profile / School Anchors / Keywords
 # -----------------------------
@@ -157,10 +486,29 @@ def add_school_anchor(
     return anchor
 
 
+@app.post(
+    "/users/me/school-anchors/bulk",
+    response_model=List[schemas.UserSchoolAnchor],
+    tags=["school"],
+)
+def add_school_anchors_bulk(
+    body: List[schemas.UserSchoolAnchorCreate],
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    # 온보딩용: 여러 앵커를 한 번에 (한 트랜잭션)
+    if len(body) > 50:
+        raise HTTPException(status_code=400, detail="한 번에 50건까지 등록할 수 있습니다.")
+    return crud.bulk_create_user_school_anchors(
+        db, user_id=current_user.id, anchors_in=body
+    )
+
+
 @app.get(
     "/users/me/school-anchors",
     response_model=List[schemas.UserSchoolAnchor],
     tags=["school"],
+    dependencies=[Depends(check_user_etag)],
 )
 def list_my_school_anchors(
     db: Session = Depends(get_db_session),
@@ -170,6 +518,37 @@ def list_my_school_anchors(
     return anchors
 
 
+@app.post(
+    "/users/me/school-histories",
+    response_model=List[schemas.UserSchoolHistory],
+    tags=["school"],
+)
+def add_school_histories(
+    body: List[schemas.UserSchoolHistoryCreate],
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    # 전체 학교 이력을 한 번에 (한 트랜잭션)
+    if len(body) > 50:
+        raise HTTPException(status_code=400, detail="한 번에 50건까지 등록할 수 있습니다.")
+    return crud.bulk_create_user_school_histories(
+        db, user_id=current_user.id, histories_in=body
+    )
+
+
+@app.get(
+    "/users/me/school-histories",
+    response_model=List[schemas.UserSchoolHistory],
+    tags=["school"],
+    dependencies=[Depends(check_user_etag)],
+)
+def list_my_school_histories(
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    return crud.list_user_school_histories(db, user_id=current_user.id)
+
+
 @app.post(
     "/users/me/keywords",
     response_model=schemas.UserKeyword,
@@ -180,14 +559,39 @@ def add_keyword(
     db: Session = Depends(get_db_session),
     current_user: models.User = Depends(get_current_user),
 ):
-    kw = crud.add_user_keyword(db, user_id=current_user.id, keyword_in=body)
+    try:
+        kw = crud.add_user_keyword(db, user_id=current_user.id, keyword_in=body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return kw
 
 
+@app.post(
+    "/users/me/keywords/bulk",
+    response_model=List[schemas.UserKeyword],
+    tags=["keywords"],
+)
+def add_keywords_bulk(
+    body: List[schemas.UserKeywordCreate],
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    # 온보딩용: 여러 키워드를 한 번에 (한 트랜잭션, 정규화 기준 중복 제거)
+    if len(body) > 50:
+        raise HTTPException(status_code=400, detail="한 번에 50건까지 등록할 수 있습니다.")
+    try:
+        return crud.bulk_add_user_keywords(
+            db, user_id=current_user.id, keywords_in=body
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.get(
     "/users/me/keywords",
     response_model=List[schemas.UserKeyword],
     tags=["keywords"],
+    dependencies=[Depends(check_user_etag)],
 )
 def list_keywords(
     db: Session = Depends(get_db_session),
@@ -197,6 +601,179 @@ def list_keywords(
     return kws
 
 
+@app.get(
+    "/keywords/autocomplete",
+    response_model=List[schemas.KeywordSuggestion],
+    tags=["keywords"],
+)
+def autocomplete_keywords(
+    q: str = Query("", description="키워드 접두사 (비우면 전체 인기순)"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db_session),
+):
+    return crud.autocomplete_keywords(db, prefix=q, limit=limit)
+
+
+# -----------------------------
+# Matches (교집합 친구 찾기)
+# -----------------------------
+
+
+@app.get(
+    "/users/me/matches",
+    response_model=List[schemas.Match],
+    tags=["matches"],
+)
+def list_my_matches(
+    year_tolerance: int = Query(1, ge=0, le=3, description="입학년도 허용 오차"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    # 차단 관계 유저를 뺀 뒤에도 limit 개가 남도록 그만큼 더 가져온다
+    blocked = block_cache.get(db, current_user.id, current_user.data_version)
+    matches = matching.find_matches(
+        db,
+        user_id=current_user.id,
+        year_tolerance=year_tolerance,
+        limit=limit + len(blocked),
+    )
+    matches = block_cache.filter(
+        db,
+        current_user.id,
+        matches,
+        key=lambda m: m["user_id"],
+        version=current_user.data_version,
+    )
+    return matches[:limit]
+
+
+@app.get(
+    "/users/me/classmates",
+    response_model=List[schemas.Classmate],
+    tags=["matches"],
+)
+def list_my_classmates(
+    limit: int = Query(50, ge=1, le=100),
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    blocked = block_cache.get(db, current_user.id, current_user.data_version)
+    classmates = matching.find_classmates(
+        db, user_id=current_user.id, limit=limit + len(blocked)
+    )
+    classmates = block_cache.filter(
+        db,
+        current_user.id,
+        classmates,
+        key=lambda c: c["user_id"],
+        version=current_user.data_version,
+    )
+    return classmates[:limit]
+
+
+@app.get(
+    "/users/me/recommendations",
+    response_model=schemas.Recommendations,
+    tags=["matches"],
+)
+def read_my_recommendations(
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    # recommendation_worker.py 가 미리 계산해 둔 결과 (PK 조회 한 번)
+    rec = crud.get_user_recommendation(db, user_id=current_user.id)
+    if rec is None:
+        # 아직 계산 대상이 아니면 대기열에 넣고 빈 결과
+        crud.enqueue_recommendation_refresh(db, current_user.id)
+        db.commit()
+        rec = crud.get_user_recommendation(db, user_id=current_user.id)
+
+    stale_seconds = 0.0
+    if rec.dirty_at is not None:
+        stale_seconds = (datetime.now(timezone.utc) - rec.dirty_at).total_seconds()
+
+    return {
+        "user_id": current_user.id,
+        "computed_at": rec.computed_at,
+        "is_stale": rec.dirty_at is not None,
+        "stale_seconds": stale_seconds,
+        "matches": block_cache.filter(
+            db,
+            current_user.id,
+            orjson.loads(rec.matches) if rec.matches else [],
+            key=lambda m: m["user_id"],
+            version=current_user.data_version,
+        )[:limit],
+    }
+
+
+@app.get(
+    "/recommendations/stats",
+    response_model=schemas.RecommendationStats,
+    tags=["matches"],
+)
+def read_recommendation_stats(
+    db: Session = Depends(get_db_session),
+    moderator: models.User = Depends(get_current_moderator),
+):
+    stats = crud.get_recommendation_stats(db)
+    now = datetime.now(timezone.utc)
+    job = stats["last_job"]
+    elapsed = (job.finished_at - job.started_at).total_seconds() if job else 0.0
+    done = job.upserted_count if job else 0
+    return {
+        "pending_users": stats["pending_users"],
+        "oldest_pending_seconds": (
+            (now - stats["oldest_dirty_at"]).total_seconds()
+            if stats["oldest_dirty_at"]
+            else 0.0
+        ),
+        "last_batch_users": done,
+        "last_batch_seconds": elapsed,
+        "last_batch_users_per_second": done / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+@app.get(
+    "/users/me/similar-profiles",
+    response_model=List[schemas.SimilarProfile],
+    tags=["matches"],
+)
+def list_similar_profiles(
+    k: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    profile = db.get(models.UserProfile, current_user.id)
+    query = embedding_index.decode_vector(
+        profile.matching_embedding if profile else None
+    )
+    if query is None:
+        raise HTTPException(status_code=404, detail="프로필 임베딩이 아직 없습니다.")
+
+    index = embedding_index.get_index()
+    if index is None or index.dimension != len(query):
+        raise HTTPException(status_code=503, detail="추천 인덱스가 준비되지 않았습니다.")
+
+    blocked = block_cache.get(db, current_user.id, current_user.data_version)
+    hits = index.search(query, k=k + len(blocked), exclude_user_id=current_user.id)
+    hits = block_cache.filter(
+        db,
+        current_user.id,
+        hits,
+        key=lambda hit: hit[0],
+        version=current_user.data_version,
+    )[:k]
+    nicknames = crud.get_nicknames(db, [user_id for user_id, _ in hits])
+    return [
+        {"user_id": user_id, "nickname": nicknames[user_id], "similarity": similarity}
+        for user_id, similarity in hits
+        if user_id in nicknames
+    ]
+
+
 # -----------------------------
 # Institutions (학교 검색)
 # -----------------------------
@@ -217,19 +794,8 @@ def search_institutions(
     limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db_session),
 ):
-    query = db.query(models.Institution).filter(models.Institution.is_active.is_(True))
-
-    if q:
-        like = f"%{q}%"
-        query = query.filter(models.Institution.name.ilike(like))
-
-    if city:
-        query = query.filter(models.Institution.region_city == city)
-    if district:
-        query = query.filter(models.Institution.region_district == district)
-
-    institutions = query.order_by(models.Institution.name).limit(limit).all()
-    return institutions
+    rows = crud.search_institutions(db, q=q, city=city, district=district, limit=limit)
+    return _rows_response(rows, crud.INSTITUTION_FIELDS)
 
 
 # -----------------------------
@@ -247,6 +813,17 @@ def create_community(
     db: Session = Depends(get_db_session),
     current_user: models.User = Depends(get_current_user),  # 추후 owner 개념 확장 가능
 ):
+    # (학교, 학교급, 입학년도, 거주지) 당 커뮤니티는 하나
+    if crud.get_community_by_key(
+        db,
+        institution_id=body.institution_id,
+        school_level=body.school_level,
+        entry_year=body.entry_year,
+        residence_city=body.residence_city,
+        residence_district=body.residence_district,
+    ):
+        raise HTTPException(status_code=400, detail="이미 존재하는 커뮤니티입니다.")
+
     community = crud.create_community(db, body)
     return community
 
@@ -268,15 +845,89 @@ def create_community_post(
         content=body.content,
     )
 
-    # AI 텍스트 심사
-    is_safe, message = ai_service.check_text_safety(post_in.content)
-    if not is_safe:
-        raise HTTPException(status_code=400, detail=message)
-
+    # AI 텍스트 심사는 moderation_worker 가 비동기로 (status='pending' 으로 저장)
     post = crud.create_community_post(db, user_id=current_user.id, post_in=post_in)
     return post
 
 
+@app.get(
+    "/moderation/stats",
+    response_model=schemas.ModerationStats,
+    tags=["community_posts"],
+)
+def read_moderation_stats(
+    db: Session = Depends(get_db_session),
+    moderator: models.User = Depends(get_current_moderator),
+):
+    stats = crud.get_moderation_stats(db)
+    oldest = stats.pop("oldest_pending_at")
+    now = datetime.now(timezone.utc)
+    return {
+        **stats,
+        "oldest_pending_seconds": (now - oldest).total_seconds() if oldest else 0.0,
+    }
+
+
+@app.post(
+    "/reports",
+    response_model=schemas.ReportResult,
+    tags=["reports"],
+)
+def create_report(
+    body: schemas.ReportCreate,
+    db: Session = Depends(get_db_session),
+    current_user: models.User = Depends(get_current_user),
+):
+    author_id = crud.get_report_target_author(db, body.target_type, body.target_id)
+    if author_id is None:
+        raise HTTPException(status_code=404, detail="신고 대상을 찾을 수 없습니다.")
+    if author_id == current_user.id:
+        raise HTTPException(status_code=400, detail="자신의 글은 신고할 수 없습니다.")
+    return crud.create_report(
+        db,
+        reporter_user_id=current_user.id,
+        reported_user_id=author_id,
+        report_in=body,
+    )
+
+
+@app.get(
+    "/moderation/reports",
+    response_model=List[schemas.ReportQueueItem],
+    tags=["reports"],
+)
+def list_report_queue(
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db_session),
+    moderator: models.User = Depends(get_current_moderator),
+):
+    return crud.list_report_queue(db, limit=limit)
+
+
+@app.post(
+    "/moderation/reports/{target_type}/{target_id}/resolve",
+    response_model=schemas.ReportQueueItem,
+    tags=["reports"],
+)
+def resolve_report_target(
+    target_type: str,
+    target_id: int,
+    body: schemas.ReportResolve,
+    db: Session = Depends(get_db_session),
+    moderator: models.User = Depends(get_current_moderator),
+):
+    target = crud.resolve_report_target(
+        db,
+        target_type=target_type,
+        target_id=target_id,
+        moderator_user_id=moderator.id,
+        restore=body.restore,
+    )
+    if target is None:
+        raise HTTPException(status_code=404, detail="신고된 대상이 아닙니다.")
+    return target
+
+
 @app.get(
     "/communities/{community_id}/posts",
     response_model=List[schemas.CommunityPost],
@@ -287,6 +938,17 @@ def list_community_posts(
     limit: int = Query(50, ge=1, le=100),
     db: Session = Depends(get_db_session),
     current_user: models.User = Depends(get_current_user),
+    etag: str = Depends(check_posts_etag),
 ):
-    posts = crud.list_community_posts(db, community_id=community_id, limit=limit)
-    return posts
+    # 차단 관계 작성자의 글은 SQL 에서 뺀다 (걸러진 만큼 페이지가 비지 않게)
+    blocked = block_cache.get(db, current_user.id, current_user.data_version)
+    posts = crud.list_community_posts(
+        db,
+        community_id=community_id,
+        viewer_user_id=current_user.id,
+        limit=limit,
+        exclude_author_ids=blocked,
+    )
+    response = _rows_response(posts, crud.COMMUNITY_POST_FIELDS)
+    response.headers["ETag"] = etag
+    return response
@@ -0,0 +1,196 @@
+# path: matching.py
+"""
+교집합 매칭 엔진.
+
+- 후보 생성: (institution_id, school_level, entry_year) → user_id 역색인
+  (models.py 의 ix_user_school_anchors_key) 을 내 앵커마다 range seek 한다.
+  → 전체 유저를 스캔하지 않는다.
+- 동창 찾기(find_classmates): 학교 이력의 반 / 담임 / 동아리 정규화 키 일치
+- 점수: 겹치는 학교 앵커(입학년도 차이가 작을수록 높음)
+        + 공유 키워드 수
+        + 같은 거주지(시/도 + 구/군)
+        + 키워드 TF-IDF 코사인 유사도 (keyword_affinity, 후보 전체를 한 번에 계산)
+"""
+
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import keyword_affinity
+
+
+# 기본 입학년도 허용 오차 (추천 테이블 미리 계산 / 이웃 재계산 범위에도 사용)
+DEFAULT_YEAR_TOLERANCE = 1
+
+# 점수 가중치
+ANCHOR_WEIGHT = 10
+KEYWORD_WEIGHT = 3
+RESIDENCE_WEIGHT = 5
+AFFINITY_WEIGHT = 10  # 코사인 유사도(0~1)에 곱하는 값
+
+# 앵커로 뽑는 후보 수 상한 (키워드/거주지 점수는 이 후보 안에서만 계산)
+CANDIDATE_LIMIT = 500
+
+
+_MATCHES_SQL = text(
+    """
+    WITH my_anchors AS (
+        SELECT institution_id, school_level, entry_year
+        FROM user_school_anchors
+        WHERE user_id = :user_id
+    ),
+    anchor_hits AS (
+        SELECT
+            a.user_id,
+            COUNT(*) AS anchor_overlap,
+            SUM(:year_tolerance + 1 - ABS(a.entry_year - m.entry_year)) AS anchor_score
+        FROM my_anchors m
+        JOIN user_school_anchors a
+          ON a.institution_id = m.institution_id
+         AND a.school_level = m.school_level
+         AND a.entry_year BETWEEN m.entry_year - :year_tolerance
+                              AND m.entry_year + :year_tolerance
+        WHERE a.user_id <> :user_id
+        GROUP BY a.user_id
+        ORDER BY anchor_score DESC, a.user_id
+        LIMIT :candidate_limit
+    ),
+    keyword_hits AS (
+        SELECT k.user_id, COUNT(DISTINCT k.keyword_id) AS keyword_overlap
+        FROM anchor_hits h
+        JOIN user_keywords k ON k.user_id = h.user_id
+        WHERE k.keyword_id IN (
+            SELECT keyword_id FROM user_keywords WHERE user_id = :user_id
+        )
+        GROUP BY k.user_id
+    ),
+    scored AS (
+        SELECT
+            h.user_id,
+            u.nickname,
+            h.anchor_overlap,
+            COALESCE(kh.keyword_overlap, 0) AS keyword_overlap,
+            COALESCE(
+                p.residence_city IS NOT NULL
+                AND p.residence_city = mp.residence_city
+                AND p.residence_district IS NOT DISTINCT FROM mp.residence_district,
+                false
+            ) AS same_residence,
+            h.anchor_score
+        FROM anchor_hits h
+        JOIN users u ON u.id = h.user_id
+        LEFT JOIN keyword_hits kh ON kh.user_id = h.user_id
+        LEFT JOIN user_profiles p ON p.user_id = h.user_id
+        LEFT JOIN user_profiles mp ON mp.user_id = :user_id
+        WHERE u.is_deleted = false AND u.status = 'active'
+    )
+    SELECT
+        user_id,
+        nickname,
+        anchor_overlap,
+        keyword_overlap,
+        same_residence,
+        anchor_score * :anchor_weight
+            + keyword_overlap * :keyword_weight
+            + CASE WHEN same_residence THEN :residence_weight ELSE 0 END AS score
+    FROM scored
+    ORDER BY score DESC, user_id
+    """
+)
+
+
+def find_matches(
+    db: Session,
+    user_id: int,
+    year_tolerance: int = DEFAULT_YEAR_TOLERANCE,
+    limit: int = 20,
+) -> List[dict]:
+    """
+    user_id 와 과거를 공유하는 다른 유저를 점수순으로 돌려준다.
+    (같은 학교·학교급, 입학년도 차이 year_tolerance 이내)
+    """
+    rows = db.execute(
+        _MATCHES_SQL,
+        {
+            "user_id": user_id,
+            "year_tolerance": year_tolerance,
+            "candidate_limit": CANDIDATE_LIMIT,
+            "anchor_weight": ANCHOR_WEIGHT,
+            "keyword_weight": KEYWORD_WEIGHT,
+            "residence_weight": RESIDENCE_WEIGHT,
+        },
+    ).mappings()
+    matches = [dict(row) for row in rows]
+    if not matches:
+        return matches
+
+    # 키워드 유사도로 재정렬 (후보 전체를 NumPy 연산 한 번으로)
+    affinities = keyword_affinity.get_index(db).scores(
+        user_id, [m["user_id"] for m in matches]
+    )
+    for match, affinity in zip(matches, affinities):
+        match["keyword_affinity"] = round(affinity, 4)
+        score = float(match["score"]) + affinity * AFFINITY_WEIGHT
+        match["score"] = round(score, 4)
+
+    matches.sort(key=lambda m: (-m["score"], m["user_id"]))
+    return matches[:limit]
+
+
+# ------------------------------------------------------------
+# 동창 찾기 (user_school_histories)
+#   - 같은 학교·학년도·학년·반 / 같은 학교·담임·학년도 / 같은 학교·동아리·학년도
+#   - 모두 정규화 키 등호 비교 → models.py 의 ix_user_school_histories_* 인덱스 seek
+# ------------------------------------------------------------
+
+_CLASSMATES_SQL = text(
+    """
+    WITH mine AS (
+        SELECT institution_id, start_year, grade,
+               class_group_key, homeroom_teacher_key, club_name_key
+        FROM user_school_histories
+        WHERE user_id = :user_id
+    ),
+    hits AS (
+        SELECT h.user_id, 'class' AS reason
+        FROM mine m
+        JOIN user_school_histories h
+          ON h.institution_id = m.institution_id
+         AND h.start_year = m.start_year
+         AND h.grade = m.grade
+         AND h.class_group_key = m.class_group_key
+        UNION ALL
+        SELECT h.user_id, 'homeroom'
+        FROM mine m
+        JOIN user_school_histories h
+          ON h.institution_id = m.institution_id
+         AND h.homeroom_teacher_key = m.homeroom_teacher_key
+         AND h.start_year = m.start_year
+        UNION ALL
+        SELECT h.user_id, 'club'
+        FROM mine m
+        JOIN user_school_histories h
+          ON h.institution_id = m.institution_id
+         AND h.club_name_key = m.club_name_key
+         AND h.start_year = m.start_year
+    )
+    SELECT
+        hits.user_id,
+        u.nickname,
+        array_agg(DISTINCT hits.reason) AS reasons,
+        COUNT(*) AS hit_count
+    FROM hits
+    JOIN users u ON u.id = hits.user_id
+    WHERE hits.user_id <> :user_id
+      AND u.is_deleted = false AND u.status = 'active'
+    GROUP BY hits.user_id, u.nickname
+    ORDER BY hit_count DESC, hits.user_id
+    LIMIT :limit
+    """
+)
+
+
+def find_classmates(db: Session, user_id: int, limit: int = 50) -> List[dict]:
+    rows = db.execute(_CLASSMATES_SQL, {"user_id": user_id, "limit": limit})
+    return [dict(row) for row in rows.mappings()]
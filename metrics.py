@@ -0,0 +1,351 @@
+# path: metrics.py
+"""
+요청 단위 성능 계측 → Prometheus 텍스트 형식 (GET /metrics).
+
+- MetricsMiddleware (순수 ASGI 미들웨어)
+  - 라우트(경로 템플릿, 예: /communities/{community_id}/posts)별 지연 히스토그램
+  - 상태 코드별 요청 수, 요청당 SQL 문장 수 / SQL 시간 합계
+- install_sql_hooks(engine): before/after_cursor_execute (실패하면 handle_error) 이벤트로
+  지금 처리 중인 요청(ContextVar)의 SQL 수와 시간을 센다.
+  (동기 엔드포인트는 스레드풀에서 돌지만 contextvars 가 복사되어 같은 요청 통계를 본다)
+- timed("argon2"): 구간 시간. 요청 통계와 전역 합계에 같이 쌓는다.
+  (게시글 심사는 별도 워커 프로세스라 여기가 아니라 sync_jobs → GET /moderation/stats)
+- 느린 요청 로그: SLOW_REQUEST_MS 를 넘으면 오래 걸린 SQL 을 리터럴을 가려서 남긴다.
+  (바인드 파라미터 값은 애초에 기록하지 않는다)
+- 디버그 헤더: METRICS_DEBUG_HEADER=1 이면 X-Query-Count / X-Query-Time-Ms 응답 헤더
+
+환경 변수:
+    METRICS_ENABLED=1          (0 이면 미들웨어/SQL 훅이 바로 통과)
+    SLOW_REQUEST_MS=500
+    METRICS_DEBUG_HEADER=0
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+DEBUG_HEADER = os.getenv("METRICS_DEBUG_HEADER", "0") == "1"
+
+# 지연 히스토그램 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# 느린 요청 로그에 남길 SQL 수 (오래 걸린 순)
+SLOW_LOG_STATEMENTS = 5
+# 요청당 기억해 두는 SQL 문장 수 상한 (느린 요청 로그용)
+_MAX_TRACKED_STATEMENTS = 200
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+# 로그가 컬럼 목록으로 도배되지 않게 첫 SELECT 목록은 줄인다
+_SELECT_LIST = re.compile(r"^SELECT\s.*?\sFROM\s", re.S)
+
+
+@dataclass
+class RequestStats:
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    sections: Dict[str, float] = field(default_factory=dict)
+    statements: List[Tuple[float, str]] = field(default_factory=list)
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar(
+    "metrics_request_stats", default=None
+)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def redact_sql(statement: str) -> str:
+    """SQL 안의 문자열/숫자 리터럴을 ? 로 가린다 (바인드 파라미터는 원래 자리표시자)"""
+    statement = _SELECT_LIST.sub("SELECT ... FROM ", statement.lstrip(), count=1)
+    statement = _STRING_LITERAL.sub("'?'", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+# ============================================================
+# 집계 (프로세스 전역)
+# ============================================================
+
+
+class _RouteStats:
+    __slots__ = ("buckets", "count", "seconds", "sql_count", "sql_seconds", "slow")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.seconds = 0.0
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.slow = 0
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], _RouteStats] = {}
+        self._statuses: Dict[Tuple[str, str, int], int] = {}
+        self._sections: Dict[str, List[float]] = {}
+        # 다른 모듈 지표 (admission 등): 호출하면 Prometheus 텍스트 줄 목록을 돌려준다
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        self._collectors.append(collector)
+
+    def observe_request(
+        self,
+        route: str,
+        method: str,
+        status: int,
+        seconds: float,
+        stats: RequestStats,
+        slow: bool,
+    ) -> None:
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            entry = self._routes.get((route, method))
+            if entry is None:
+                entry = self._routes[(route, method)] = _RouteStats()
+            entry.buckets[bucket] += 1
+            entry.count += 1
+            entry.seconds += seconds
+            entry.sql_count += stats.sql_count
+            entry.sql_seconds += stats.sql_seconds
+            entry.slow += slow
+            key = (route, method, status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+
+    def observe_section(self, name: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._sections.get(name)
+            if entry is None:
+                entry = self._sections[name] = [0, 0.0]
+            entry[0] += 1
+            entry[1] += seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._statuses.clear()
+            self._sections.clear()
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        with self._lock:
+            routes = {key: _copy_route(value) for key, value in self._routes.items()}
+            statuses = dict(self._statuses)
+            sections = {name: tuple(value) for name, value in self._sections.items()}
+
+        lines = [
+            "# HELP http_requests_total 요청 수",
+            "# TYPE http_requests_total counter",
+        ]
+        for (route, method, status), count in sorted(statuses.items()):
+            labels = _labels(route=route, method=method, status=str(status))
+            lines.append(f"http_requests_total{{{labels}}} {count}")
+
+        lines += [
+            "# HELP http_request_duration_seconds 요청 처리 시간",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (route, method), entry in sorted(routes.items()):
+            labels = _labels(route=route, method=method)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, entry.buckets):
+                cumulative += count
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} '
+                f"{entry.count}"
+            )
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {entry.seconds}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {entry.count}")
+
+        for name, kind, attr, help_text in [
+            ("http_request_sql_statements_total", "counter", "sql_count", "SQL 문장 수"),
+            ("http_request_sql_seconds_total", "counter", "sql_seconds", "SQL 시간"),
+            ("http_slow_requests_total", "counter", "slow", "느린 요청 수"),
+        ]:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for (route, method), entry in sorted(routes.items()):
+                labels = _labels(route=route, method=method)
+                lines.append(f"{name}{{{labels}}} {getattr(entry, attr)}")
+
+        lines += [
+            "# HELP app_section_seconds_total 구간(argon2, moderation 등) 시간",
+            "# TYPE app_section_seconds_total counter",
+        ]
+        for name, (_, seconds) in sorted(sections.items()):
+            lines.append(f'app_section_seconds_total{{section="{name}"}} {seconds}')
+        lines += [
+            "# HELP app_section_calls_total 구간 호출 수",
+            "# TYPE app_section_calls_total counter",
+        ]
+        for name, (count, _) in sorted(sections.items()):
+            lines.append(f'app_section_calls_total{{section="{name}"}} {count}')
+        for collector in self._collectors:
+            lines += collector()
+        return "\n".join(lines) + "\n"
+
+
+def _copy_route(entry: _RouteStats) -> _RouteStats:
+    copied = _RouteStats()
+    for attr in _RouteStats.__slots__:
+        value = getattr(entry, attr)
+        setattr(copied, attr, list(value) if attr == "buckets" else value)
+    return copied
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(
+        f'{key}="{value.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for key, value in labels.items()
+    )
+
+
+registry = Registry()
+
+
+# ============================================================
+# 구간 시간 / SQL 훅
+# ============================================================
+
+
+@contextmanager
+def timed(section: str) -> Iterator[None]:
+    """with timed("argon2"): ... → 요청 통계 + 전역 합계"""
+    if not ENABLED:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.observe_section(section, elapsed)
+        stats = _current.get()
+        if stats is not None:
+            stats.sections[section] = stats.sections.get(section, 0.0) + elapsed
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _record_statement(conn, statement: str) -> None:
+    stats = _current.get()
+    if stats is None:
+        return
+    started = conn.info.get("metrics_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats.sql_count += 1
+    stats.sql_seconds += elapsed
+    if len(stats.statements) < _MAX_TRACKED_STATEMENTS:
+        stats.statements.append((elapsed, statement))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_statement(conn, statement)
+
+
+def _handle_error(exception_context) -> None:
+    """
+    실패한 문장은 after_cursor_execute 가 불리지 않는다.
+    시작 시각을 여기서 꺼내지 않으면 커넥션에 남아 다음 문장 시간이 어긋난다.
+    (실패한 문장도 SQL 수 / 느린 요청 로그에 넣는다)
+    """
+    conn = exception_context.connection
+    if conn is not None and exception_context.statement is not None:
+        _record_statement(conn, exception_context.statement)
+
+
+def install_sql_hooks(engine) -> None:
+    from sqlalchemy import event
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+# ============================================================
+# ASGI 미들웨어
+# ============================================================
+
+
+class MetricsMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_stats(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if DEBUG_HEADER:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-query-count", str(stats.sql_count).encode()))
+                    headers.append(
+                        (b"x-query-time-ms", f"{stats.sql_seconds * 1000:.2f}".encode())
+                    )
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - started
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            slow = elapsed * 1000 >= SLOW_REQUEST_MS
+            registry.observe_request(
+                route_path, scope["method"], status, elapsed, stats, slow
+            )
+            if slow:
+                _log_slow_request(scope["method"], route_path, status, elapsed, stats)
+
+
+def _log_slow_request(
+    method: str, route: str, status: int, elapsed: float, stats: RequestStats
+) -> None:
+    slowest = sorted(stats.statements, key=lambda item: item[0], reverse=True)
+    summary = (
+        f"[slow request] {method} {route} {status} {elapsed * 1000:.0f}ms "
+        f"SQL {stats.sql_count}건 {stats.sql_seconds * 1000:.0f}ms"
+    )
+    for name, seconds in stats.sections.items():
+        summary += f" {name} {seconds * 1000:.0f}ms"
+    lines = [summary]
+    for seconds, statement in slowest[:SLOW_LOG_STATEMENTS]:
+        lines.append(f"  {seconds * 1000:7.1f}ms  {redact_sql(statement)[:500]}")
+    logger.warning("\n".join(lines))
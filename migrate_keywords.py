@@ -0,0 +1,225 @@
+# path: migrate_keywords.py
+"""
+user_keywords.keyword(Text) → keywords 사전 + user_keywords.keyword_id 전환 스크립트.
+
+- 역할:
+    1) keywords 테이블 생성, user_keywords.keyword_id 컬럼 추가
+    2) 기존 키워드 문자열을 정규화(text_normalize.normalize_keyword)해서 사전에 등록
+       ("ＦＣ서울" / "fc서울", "힙합  댄스" / "힙합 댄스" 같은 변형은 같은 id.
+        기호는 남기므로 "C++" / "C#" / "C" 는 다른 id)
+    3) 임시 매핑 테이블(raw → id) 조인으로 keyword_id 를 id 범위 배치로 채움
+    4) 같은 유저의 같은 키워드(정규화 기준) 중복 행은 최신 1건만 남김
+    5) NOT NULL / FK / 유니크 제약 추가 후 keyword 컬럼 삭제
+    6) keywords.user_count 갱신
+
+- 전체가 한 트랜잭션이라 중간에 실패하면 원래 상태로 돌아간다.
+- 이미 전환된 DB(keyword 컬럼 없음)에서는 아무것도 하지 않는다.
+- --renormalize: 이미 전환된 DB 의 keywords.keyword_normalized 를 지금 규칙으로 다시 계산
+  (예전 규칙은 기호까지 지웠다. 새 규칙이 더 잘게 나누므로 유니크 충돌은 없다.
+   다만 예전 규칙으로 이미 한 id 로 합쳐진 "C++" / "C" 같은 키워드는 되돌릴 수 없다)
+- 전/후 user_keywords 테이블(+인덱스) 크기를 출력한다.
+  DROP COLUMN 만으로는 공간이 줄지 않으므로 --vacuum-full 로 재작성까지 할 수 있다.
+
+사용법:
+    python migrate_keywords.py [--batch-size 50000] [--vacuum-full]
+    python migrate_keywords.py --renormalize
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import crud
+import models
+import text_normalize
+from database import SessionLocal, engine
+from keyword_dictionary import keyword_dictionary
+
+_TABLE_SIZE_SQL = text(
+    """
+    SELECT pg_total_relation_size('user_keywords'),
+           pg_relation_size('user_keywords'),
+           pg_indexes_size('user_keywords')
+    """
+)
+
+_HAS_KEYWORD_COLUMN_SQL = text(
+    """
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'user_keywords' AND column_name = 'keyword'
+    """
+)
+
+_UPDATE_BATCH_SQL = text(
+    """
+    UPDATE user_keywords uk
+    SET keyword_id = m.keyword_id
+    FROM keyword_migration_map m
+    WHERE uk.keyword = m.raw
+      AND uk.id BETWEEN :id_from AND :id_to
+    """
+)
+
+_DEDUPE_SQL = text(
+    """
+    DELETE FROM user_keywords a
+    USING user_keywords b
+    WHERE a.user_id = b.user_id
+      AND a.keyword_id = b.keyword_id
+      AND (a.created_at, a.id) < (b.created_at, b.id)
+    """
+)
+
+_FINALIZE_SQLS = [
+    "DELETE FROM user_keywords WHERE keyword_id IS NULL",
+    "ALTER TABLE user_keywords ALTER COLUMN keyword_id SET NOT NULL",
+    "ALTER TABLE user_keywords ADD CONSTRAINT user_keywords_keyword_id_fkey "
+    "FOREIGN KEY (keyword_id) REFERENCES keywords (id)",
+    "ALTER TABLE user_keywords ADD CONSTRAINT uq_user_keywords "
+    "UNIQUE (user_id, keyword_id)",
+    # (user_id, keyword_id) 유니크 인덱스가 user_id 단독 조회도 처리한다
+    "DROP INDEX IF EXISTS ix_user_keywords_user_id",
+    "ALTER TABLE user_keywords DROP COLUMN keyword",
+]
+
+
+def _print_sizes(db: Session, label: str) -> None:
+    total, heap, indexes = db.execute(_TABLE_SIZE_SQL).one()
+    print(
+        f"[migrate_keywords] {label}: 전체 {total / 1024 / 1024:.1f}MB "
+        f"(테이블 {heap / 1024 / 1024:.1f}MB, 인덱스 {indexes / 1024 / 1024:.1f}MB)"
+    )
+
+
+def migrate_keywords(db: Session, batch_size: int = 50000) -> int:
+    """반환값: 사전에 등록된 키워드 수"""
+    if db.execute(_HAS_KEYWORD_COLUMN_SQL).first() is None:
+        print("[migrate_keywords] 이미 전환된 스키마입니다.")
+        return 0
+    _print_sizes(db, "전환 전")
+
+    models.Keyword.__table__.create(bind=db.connection(), checkfirst=True)
+    db.execute(
+        text("ALTER TABLE user_keywords ADD COLUMN IF NOT EXISTS keyword_id INTEGER")
+    )
+
+    # 1) 서로 다른 원문 키워드 → 사전 id
+    raws: List[str] = (
+        db.execute(text("SELECT DISTINCT keyword FROM user_keywords")).scalars().all()
+    )
+    valid = [raw for raw in raws if text_normalize.normalize_keyword(raw) is not None]
+    print(
+        f"[migrate_keywords] 원문 키워드 {len(raws)}종 "
+        f"(정규화 후 빈 키워드 {len(raws) - len(valid)}종은 삭제)"
+    )
+
+    mapping: Dict[str, int] = {}
+    for start in range(0, len(valid), 5000):
+        chunk = valid[start : start + 5000]
+        mapping.update(zip(chunk, keyword_dictionary.intern_many(db, chunk)))
+    print(f"[migrate_keywords] 사전 키워드 {len(set(mapping.values()))}개")
+
+    # 2) 매핑 테이블 조인으로 keyword_id 채우기 (id 범위 배치)
+    db.execute(
+        text(
+            "CREATE TEMP TABLE keyword_migration_map "
+            "(raw TEXT PRIMARY KEY, keyword_id INTEGER NOT NULL) ON COMMIT DROP"
+        )
+    )
+    if mapping:
+        db.execute(
+            text("INSERT INTO keyword_migration_map VALUES (:raw, :keyword_id)"),
+            [{"raw": raw, "keyword_id": kid} for raw, kid in mapping.items()],
+        )
+    db.execute(text("ANALYZE keyword_migration_map"))
+
+    min_id, max_id = db.execute(
+        text("SELECT MIN(id), MAX(id) FROM user_keywords")
+    ).one()
+    if min_id is not None:
+        for id_from in range(min_id, max_id + 1, batch_size):
+            id_to = min(id_from + batch_size - 1, max_id)
+            updated = db.execute(
+                _UPDATE_BATCH_SQL, {"id_from": id_from, "id_to": id_to}
+            ).rowcount
+            print(f"[migrate_keywords] id {id_from}~{id_to}: {updated}건")
+
+    # 3) 중복 정리 + 제약 추가
+    removed = db.execute(_DEDUPE_SQL).rowcount
+    print(f"[migrate_keywords] 중복 키워드 {removed}건 삭제")
+    for sql in _FINALIZE_SQLS:
+        db.execute(text(sql))
+
+    db.commit()
+    crud.refresh_keyword_counts(db)
+    _print_sizes(db, "전환 후")
+    return len(set(mapping.values()))
+
+
+def renormalize_keywords(db: Session, batch_size: int = 50000) -> int:
+    """keywords.keyword_normalized 를 normalize_keyword 로 다시 계산. 반환값: 바뀐 행 수"""
+    rows = db.execute(
+        text("SELECT id, keyword, keyword_normalized FROM keywords")
+    ).all()
+    changed = [
+        {"id": keyword_id, "normalized": normalized}
+        for keyword_id, keyword, old in rows
+        if (normalized := text_normalize.normalize_keyword(keyword)) != old
+    ]
+    for start in range(0, len(changed), batch_size):
+        db.execute(
+            text("UPDATE keywords SET keyword_normalized = :normalized WHERE id = :id"),
+            changed[start : start + batch_size],
+        )
+    db.commit()
+    print(f"[migrate_keywords] 정규화 형태 갱신 {len(changed)}/{len(rows)}개")
+    return len(changed)
+
+
+def vacuum_full() -> None:
+    """DROP COLUMN 으로 남은 공간까지 회수 (테이블 재작성, 실행 중 잠금)"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM FULL ANALYZE user_keywords"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="키워드 사전(keywords) 전환")
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument(
+        "--vacuum-full",
+        action="store_true",
+        help="전환 후 VACUUM FULL 로 테이블을 재작성해서 공간 회수",
+    )
+    parser.add_argument(
+        "--renormalize",
+        action="store_true",
+        help="전환된 DB 의 keyword_normalized 를 지금 정규화 규칙으로 다시 계산",
+    )
+    args = parser.parse_args()
+
+    db: Session | None = None
+    try:
+        db = SessionLocal()
+        if args.renormalize:
+            renormalize_keywords(db, batch_size=args.batch_size)
+            return
+        migrate_keywords(db, batch_size=args.batch_size)
+        if args.vacuum_full:
+            vacuum_full()
+            _print_sizes(db, "VACUUM FULL 후")
+    except Exception as e:
+        if db is not None:
+            db.rollback()
+        print("[migrate_keywords] 오류 발생:", repr(e))
+        raise
+    finally:
+        if db is not None:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
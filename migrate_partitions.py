@@ -0,0 +1,122 @@
+# path: migrate_partitions.py
+"""
+community_posts / institution_raw → 월 단위 파티션 테이블 전환 스크립트 (partitions.py).
+
+- create_all 은 이미 있는 테이블을 바꾸지 않으므로 기존 DB 는 이 스크립트로 한 번 옮긴다.
+- 테이블마다:
+    1) 기존 테이블 / 인덱스 / id 시퀀스 이름 뒤에 _unpartitioned 를 붙인다
+    2) 다른 테이블에서 이 테이블을 가리키는 FK 를 지운다 (community_comments.post_id)
+    3) models 정의대로 파티션 테이블을 만들고, 기존 데이터 범위 + 앞으로 MONTHS_AHEAD 개월 파티션 생성
+    4) INSERT ... SELECT 로 옮기고 시퀀스를 이어받은 뒤 기존 테이블 삭제
+- 전체가 한 트랜잭션이라 중간에 실패하면 원래 상태로 돌아간다.
+- 이미 파티션 테이블이면 아무것도 하지 않는다.
+
+사용법:
+    python migrate_partitions.py [--only community_posts]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+import models
+import partitions
+from database import engine
+
+_SUFFIX = "_unpartitioned"
+
+_INDEXES_SQL = text(
+    """
+    SELECT indexname FROM pg_indexes
+    WHERE schemaname = current_schema() AND tablename = :table
+    """
+)
+
+_REFERENCING_FKS_SQL = text(
+    """
+    SELECT conrelid::regclass::text, conname
+    FROM pg_constraint
+    WHERE contype = 'f' AND confrelid = to_regclass(:table)
+    """
+)
+
+
+def migrate_table(conn: Connection, table: str) -> None:
+    spec = partitions.PARTITIONED_TABLES[table]
+    exists = conn.execute(text("SELECT to_regclass(:table)"), {"table": table})
+    if exists.scalar() is None:
+        print(f"[migrate_partitions] {table}: 테이블 없음 (create_all 이 만든다)")
+        return
+    if partitions.is_partitioned(conn, table):
+        print(f"[migrate_partitions] {table}: 이미 파티션 테이블")
+        return
+
+    started = time.perf_counter()
+    old = f"{table}{_SUFFIX}"
+    sequence = conn.execute(
+        text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}
+    ).scalar()
+
+    # 1) 기존 이름 비우기
+    indexes = list(conn.execute(_INDEXES_SQL, {"table": table}).scalars())
+    conn.execute(text(f"ALTER TABLE {table} RENAME TO {old}"))
+    for index in indexes:
+        conn.execute(text(f"ALTER INDEX {index} RENAME TO {index}{_SUFFIX}"))
+    conn.execute(text(f"ALTER SEQUENCE {sequence} RENAME TO {table}_id_seq{_SUFFIX}"))
+
+    # 2) 들어오는 FK (파티션 테이블은 id 만으로 참조할 수 없다)
+    for referencing, constraint in conn.execute(_REFERENCING_FKS_SQL, {"table": old}):
+        conn.execute(text(f"ALTER TABLE {referencing} DROP CONSTRAINT {constraint}"))
+        print(f"[migrate_partitions] {table}: FK 삭제 {referencing}.{constraint}")
+
+    # 3) 새 테이블 + 파티션
+    models.Base.metadata.tables[table].create(conn)
+    now = datetime.now(timezone.utc)
+    first, last = conn.execute(
+        text(f"SELECT min({spec.column}), max({spec.column}) FROM {old}")
+    ).one()
+    created = partitions.ensure_partitions(
+        conn,
+        table,
+        first or now,
+        max(last or now, partitions.add_months(now, partitions.MONTHS_AHEAD)),
+    )
+
+    # 4) 데이터 / 시퀀스 이전
+    columns = ", ".join(column.name for column in models.Base.metadata.tables[table].c)
+    rows = conn.execute(
+        text(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {old}")
+    ).rowcount
+    conn.execute(
+        text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"last_value, is_called) FROM {table}_id_seq{_SUFFIX}"
+        )
+    )
+    conn.execute(text(f"DROP TABLE {old}"))
+    conn.execute(text(f"ANALYZE {table}"))
+    print(
+        f"[migrate_partitions] {table}: {rows:,}행 → 파티션 {len(created)}개 "
+        f"({time.perf_counter() - started:.1f}s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="월 단위 파티션 테이블 전환")
+    parser.add_argument(
+        "--only", choices=list(partitions.PARTITIONED_TABLES), action="append"
+    )
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        for table in args.only or partitions.PARTITIONED_TABLES:
+            migrate_table(conn, table)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,14 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     Numeric,
     SmallInteger,
     String,
     Text,
+    UniqueConstraint,
     func,
 )
 from sqlalchemy.orm import relationship
@@ -62,6 +65,9 @@ class User(Base):
     is_deleted = Column(Boolean, nullable=False, server_default="false")
     deleted_at = Column(DateTime(timezone=True))
 
+    # /users/me* 응답(프로필/앵커/이력/키워드/차단/친구)이 바뀔 때마다 +1 → ETag
+    data_version = Column(BigInteger, nullable=False, server_default="0")
+
     # 관계
     profile = relationship(
         "UserProfile",
@@ -103,10 +109,12 @@ class UserProfile(Base):
         String(20), nullable=False, server_default="friends"
     )  # 'public','friends','private'
 
-    # AI 추천용(지금은 타입만 맞춰두고 실제 임베딩 로직은 나중에)
-    matching_embedding = Column(
-        Text, nullable=True
-    )  # vector(1536)를 쓰려면 pgvector 확장 필요. 지금은 Text로 placeholder.
+    # AI 추천용 임베딩: float32 little-endian 바이트 (embedding_index.encode_vector)
+    # 1536차원 = 6KB. 유사도 검색은 embedding_index 의 IVF 스냅샷으로 한다.
+    # 채우는 쪽: load_embeddings.py (외부에서 계산한 임베딩 적재)
+    # 예전 Text placeholder 컬럼이 있는 DB 는 한 번 (값은 비어 있었으므로 버린다):
+    #   ALTER TABLE user_profiles ALTER COLUMN matching_embedding TYPE bytea USING NULL;
+    matching_embedding = Column(LargeBinary, nullable=True)
     embedding_model = Column(String(100))
     embedding_model_version = Column(String(50))
     embedding_dimension = Column(SmallInteger)
@@ -121,13 +129,19 @@ class UserProfile(Base):
 
 class UserBlock(Base):
     __tablename__ = "user_blocks"
+    __table_args__ = (
+        UniqueConstraint("blocker_user_id", "blocked_user_id", name="uq_user_blocks"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     blocker_user_id = Column(
         BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     blocked_user_id = Column(
-        BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,  # "나를 차단한 유저" 조회용
     )
     reason = Column(Text)
     created_at = Column(
@@ -136,14 +150,22 @@ class UserBlock(Base):
 
 
 class UserFriendship(Base):
+    """user_id 가 friend_user_id 에게 보낸 친구 요청. 수락되면 status='accepted'"""
+
     __tablename__ = "user_friendships"
+    __table_args__ = (
+        UniqueConstraint("user_id", "friend_user_id", name="uq_user_friendships"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(
         BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     friend_user_id = Column(
-        BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,  # 받은 요청 조회용
     )
     status = Column(String(20), nullable=False, server_default="pending")
     created_at = Column(
@@ -157,6 +179,36 @@ class UserFriendship(Base):
     )
 
 
+class UserRecommendation(Base):
+    """
+    유저별 추천 후보 top-K 를 미리 계산해 둔 테이블.
+    - matches: matching.find_matches 결과 JSON (Text placeholder)
+    - dirty_at: 재계산이 필요해진 시각 (NULL 이면 최신, 대기열 순서)
+    - dirty_seq: dirty 표시할 때마다 +1. 워커는 가져올 때 읽은 값과 같을 때만 dirty 를 지운다
+      (계산 도중 다시 바뀌었는지 판단용. 시각 비교와 달리 커밋 순서에 영향받지 않는다)
+    """
+
+    __tablename__ = "user_recommendations"
+
+    user_id = Column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    matches = Column(Text)
+    computed_at = Column(DateTime(timezone=True))
+    dirty_at = Column(DateTime(timezone=True))
+    dirty_seq = Column(BigInteger, nullable=False, server_default="0")
+
+
+# 재계산 대기열: dirty 인 행만 들어가는 partial index
+Index(
+    "ix_user_recommendations_dirty",
+    UserRecommendation.dirty_at,
+    postgresql_where=UserRecommendation.dirty_at.isnot(None),
+)
+
+
 # ============================================================
 # 2. 기관(학교) / 동기화
 # ============================================================
@@ -180,6 +232,8 @@ class SyncJob(Base):
 
 class InstitutionRaw(Base):
     __tablename__ = "institution_raw"
+    # received_at 월 단위 파티션 (partitions.py). PK 에 파티션 키가 들어가야 한다
+    __table_args__ = {"postgresql_partition_by": "RANGE (received_at)"}
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     sync_job_id = Column(
@@ -189,11 +243,17 @@ class InstitutionRaw(Base):
     external_id = Column(Text, nullable=False)
     payload = Column(Text, nullable=False)  # JSONB → Text 로 placeholder
     received_at = Column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
+        server_default=func.now(),
     )
     processed = Column(Boolean, nullable=False, server_default="false")
     processed_at = Column(DateTime(timezone=True))
 
+    # ORM 식별은 id 만으로 (id 는 시퀀스라 유일)
+    __mapper_args__ = {"eager_defaults": True, "primary_key": [id]}
+
 
 class Institution(Base):
     __tablename__ = "institutions"
@@ -239,7 +299,10 @@ class UserSchoolAnchor(Base):
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(
-        BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     institution_id = Column(
         BigInteger, ForeignKey("institutions.id"), nullable=False
@@ -262,13 +325,31 @@ class UserSchoolAnchor(Base):
     user = relationship("User", back_populates="school_anchors")
     institution = relationship("Institution")
 
+    @property
+    def institution_name(self) -> str:
+        return self.institution.name
+
+
+# 교집합 매칭용 역색인: (학교, 학교급, 입학년도) → user_id
+# user_id 까지 포함시켜 index-only scan 으로 후보를 뽑는다.
+Index(
+    "ix_user_school_anchors_key",
+    UserSchoolAnchor.institution_id,
+    UserSchoolAnchor.school_level,
+    UserSchoolAnchor.entry_year,
+    UserSchoolAnchor.user_id,
+)
+
 
 class UserSchoolHistory(Base):
     __tablename__ = "user_school_histories"
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(
-        BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     institution_id = Column(
         BigInteger, ForeignKey("institutions.id"), nullable=False
@@ -285,6 +366,11 @@ class UserSchoolHistory(Base):
     is_transfer = Column(Boolean, nullable=False, server_default="false")
     notes = Column(Text)
 
+    # 동창 찾기용 정규화 키 (text_normalize). 등호 비교로 인덱스 seek.
+    class_group_key = Column(Text)
+    homeroom_teacher_key = Column(Text)
+    club_name_key = Column(Text)
+
     created_at = Column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -299,14 +385,63 @@ class UserSchoolHistory(Base):
     institution = relationship("Institution")
 
 
+# 동창 찾기 인덱스: 같은 학교·학년도·학년·반 / 같은 담임 / 같은 동아리
+Index(
+    "ix_user_school_histories_class",
+    UserSchoolHistory.institution_id,
+    UserSchoolHistory.start_year,
+    UserSchoolHistory.grade,
+    UserSchoolHistory.class_group_key,
+    UserSchoolHistory.user_id,
+)
+Index(
+    "ix_user_school_histories_homeroom",
+    UserSchoolHistory.institution_id,
+    UserSchoolHistory.homeroom_teacher_key,
+    UserSchoolHistory.start_year,
+    UserSchoolHistory.user_id,
+)
+Index(
+    "ix_user_school_histories_club",
+    UserSchoolHistory.institution_id,
+    UserSchoolHistory.club_name_key,
+    UserSchoolHistory.start_year,
+    UserSchoolHistory.user_id,
+)
+
+
+class Keyword(Base):
+    """
+    키워드 사전. 같은 키워드는 정규화 형태(keyword_normalized) 기준으로 한 번만 저장한다.
+    - keyword: 처음 등록된 표시용 문자열
+    - user_count: 이 키워드를 가진 유저 수 (refresh_keyword_counts.py 가 주기적으로 갱신)
+    """
+
+    __tablename__ = "keywords"
+
+    # 사전 크기는 int4 로 충분. user_keywords 행에서 weight(int2) 와 붙어 8바이트 정렬 안에 들어간다.
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    keyword = Column(Text, nullable=False)
+    keyword_normalized = Column(Text, nullable=False, unique=True)
+    user_count = Column(Integer, nullable=False, server_default="0", index=True)
+
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
 class UserKeyword(Base):
     __tablename__ = "user_keywords"
+    __table_args__ = (
+        UniqueConstraint("user_id", "keyword_id", name="uq_user_keywords"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(
         BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    keyword = Column(Text, nullable=False)
+    # 조회는 항상 user_id 로 시작 → (user_id, keyword_id) 유니크 인덱스 하나로 충분
+    keyword_id = Column(Integer, ForeignKey("keywords.id"), nullable=False)
     weight = Column(SmallInteger)
 
     created_at = Column(
@@ -314,6 +449,11 @@ class UserKeyword(Base):
     )
 
     user = relationship("User", back_populates="keywords")
+    keyword_entry = relationship("Keyword", lazy="joined")
+
+    @property
+    def keyword(self) -> str:
+        return self.keyword_entry.keyword
 
 
 # ============================================================
@@ -337,6 +477,9 @@ class Community(Base):
     description = Column(Text)
     status = Column(String(20), nullable=False, server_default="active")
 
+    # 게시글 목록에 보이는 글이 바뀔 때마다 +1 (작성/심사/신고 숨김/복구) → ETag
+    posts_version = Column(BigInteger, nullable=False, server_default="0")
+
     created_at = Column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -348,15 +491,35 @@ class Community(Base):
     )
 
 
+# 커뮤니티 키: (학교, 학교급, 입학년도, 거주지) 당 하나.
+# 거주지는 NULL 일 수 있으므로 COALESCE 로 묶어서 유니크 처리
+Index(
+    "uq_communities_key",
+    Community.institution_id,
+    Community.school_level,
+    Community.entry_year,
+    func.coalesce(Community.residence_city, ""),
+    func.coalesce(Community.residence_district, ""),
+    unique=True,
+)
+
+
 class CommunityMember(Base):
     __tablename__ = "community_members"
+    __table_args__ = (
+        UniqueConstraint("community_id", "user_id", name="uq_community_members_user"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     community_id = Column(
         BigInteger, ForeignKey("communities.id", ondelete="CASCADE"), nullable=False
     )
+    # 내 커뮤니티 목록 (/users/me/bootstrap) 은 user_id 로 찾는다
     user_id = Column(
-        BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     role = Column(String(20), nullable=False, server_default="member")
     joined_at = Column(
@@ -367,6 +530,8 @@ class CommunityMember(Base):
 
 class CommunityPost(Base):
     __tablename__ = "community_posts"
+    # created_at 월 단위 파티션 (partitions.py). PK 에 파티션 키가 들어가야 한다
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     community_id = Column(
@@ -382,9 +547,16 @@ class CommunityPost(Base):
     like_count = Column(Integer, nullable=False, server_default="0")
     comment_count = Column(Integer, nullable=False, server_default="0")
 
+    # pending(심사 대기, 작성자에게만 보임) → moderation_worker 가 active / hidden 으로 변경
+    # 분류기가 이 글에서만 MODERATION_MAX_ATTEMPTS 번 실패하면 review (운영자 확인 대기)
     status = Column(String(20), nullable=False, server_default="active")
+    moderated_at = Column(DateTime(timezone=True))
+    moderation_attempts = Column(SmallInteger, nullable=False, server_default="0")
     created_at = Column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
+        server_default=func.now(),
     )
     updated_at = Column(
         DateTime(timezone=True),
@@ -395,16 +567,70 @@ class CommunityPost(Base):
     is_deleted = Column(Boolean, nullable=False, server_default="false")
     deleted_at = Column(DateTime(timezone=True))
 
+    # ORM 식별은 id 만으로 (id 는 시퀀스라 유일)
+    __mapper_args__ = {"eager_defaults": True, "primary_key": [id]}
+
+
+# 커뮤니티 피드: 최신 파티션부터 순서대로 읽다가 limit 을 채우면 멈춘다
+Index(
+    "ix_community_posts_feed",
+    CommunityPost.community_id,
+    CommunityPost.created_at,
+)
+
+# 심사 대기열 (moderation_worker 가 오래된 순으로 가져감)
+Index(
+    "ix_community_posts_pending",
+    CommunityPost.created_at,
+    postgresql_where=CommunityPost.status == "pending",
+)
+
+# 심사 지연 통계 (GET /moderation/stats 가 최근 판정만 읽는다)
+Index(
+    "ix_community_posts_moderated",
+    CommunityPost.moderated_at,
+    postgresql_where=CommunityPost.moderated_at.isnot(None),
+)
+
+# 운영자 확인 대기 (분류기가 반복해서 실패한 글)
+Index(
+    "ix_community_posts_review",
+    CommunityPost.created_at,
+    postgresql_where=CommunityPost.status == "review",
+)
+
+
+class ModerationBatch(Base):
+    """
+    moderation_worker 배치 기록 (배치마다 한 줄).
+    MODERATION_BATCH_RETENTION_DAYS 가 지난 행은 워커가 지운다.
+    """
+
+    __tablename__ = "moderation_batches"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    started_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    finished_at = Column(DateTime(timezone=True))
+    status = Column(String(20), nullable=False)  # success / failed
+    batch_size = Column(Integer, nullable=False, server_default="0")
+    classified_count = Column(Integer, nullable=False, server_default="0")  # 캐시 미스
+    hidden_count = Column(Integer, nullable=False, server_default="0")
+    review_count = Column(Integer, nullable=False, server_default="0")
+    error_message = Column(Text)
+
+
+Index("ix_moderation_batches_started", ModerationBatch.started_at)
+
 
 class CommunityComment(Base):
     __tablename__ = "community_comments"
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    post_id = Column(
-        BigInteger,
-        ForeignKey("community_posts.id", ondelete="CASCADE"),
-        nullable=False,
-    )
+    # community_posts 는 파티션 테이블이라 id 만으로는 FK 를 걸 수 없다
+    # (보관 기간이 지나 archive 로 옮겨진 글의 댓글은 그대로 남는다)
+    post_id = Column(BigInteger, nullable=False)
     user_id = Column(
         BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -430,6 +656,15 @@ class CommunityComment(Base):
 
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        # 같은 유저는 같은 대상을 한 번만 신고
+        UniqueConstraint(
+            "reporter_user_id",
+            "target_type",
+            "target_id",
+            name="uq_reports_reporter_target",
+        ),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     reporter_user_id = Column(
@@ -452,3 +687,37 @@ class Report(Base):
         onupdate=func.now(),
     )
     resolved_at = Column(DateTime(timezone=True))
+
+
+class ReportTarget(Base):
+    """
+    신고 대상별 누적 카운터 (reports 를 매번 GROUP BY 하지 않도록).
+    - report_count 가 임계값을 넘는 순간 대상(게시글/댓글)을 hidden 으로 바꾸고 hidden_at 기록
+      (숨기기 직전 status 는 prior_status 에 두었다가 운영자가 복구할 때 되돌린다)
+    - reviewed_at 이 NULL 인 대상이 운영자 검토 대기열
+    """
+
+    __tablename__ = "report_targets"
+
+    target_type = Column(String(30), primary_key=True)
+    target_id = Column(BigInteger, primary_key=True)
+    report_count = Column(Integer, nullable=False, server_default="0")
+    first_reported_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    last_reported_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    hidden_at = Column(DateTime(timezone=True))
+    prior_status = Column(String(20))
+    reviewed_at = Column(DateTime(timezone=True))
+    reviewed_by_user_id = Column(BigInteger, ForeignKey("users.id"))
+
+
+# 운영자 대기열: 신고 수 많은 순 (검토 안 된 대상만)
+Index(
+    "ix_report_targets_queue",
+    ReportTarget.report_count.desc(),
+    ReportTarget.last_reported_at.desc(),
+    postgresql_where=ReportTarget.reviewed_at.is_(None),
+)
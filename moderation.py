@@ -0,0 +1,500 @@
+# path: moderation.py
+"""
+금칙어 사전 기반 텍스트 검사 (Aho-Corasick).
+
+1) 정규화 (사전 단어 / 본문 모두 같은 규칙)
+   - 문자마다 NFKC + casefold (전각/반각, 대소문자 통일)
+   - 공백 / 기호 / '_' 는 건너뜀            ("바 보", "바.보", "바_보" → 바보)
+   - 같은 문자가 3번 이상 연속되면 2번으로 줄임 ("바보보보보" → 바보보)
+     하나로 합치면 사전 단어도 "ass" → "as" 가 되어 "was", "class" 에 걸리므로 두 번까지는 둔다.
+   - 한글 음절은 자모로 분해 (호환 자모로 통일)
+     → "ㅂㅏ보", 옛 입력기의 조합형 자모 입력도 같은 단위열이 된다.
+   - 각 단위(자모/문자)는 원문 문자 위치를 기억해서, 매칭 결과를 원문 구간으로 돌려준다.
+   - 자모 단위 비교라 음절 중간에서 끝나는 매칭도 잡는다 ("바봌ㅋ" 의 "바보").
+
+2) 오토마톤
+   - 사전 전체를 트라이 + 실패 링크로 컴파일해서 본문을 한 번만 훑는다.
+     (단어 수와 무관하게 O(본문 길이 + 매칭 수))
+   - 전이는 {state * 0x110000 + 코드포인트: 다음 state} 하나의 dict 로 보관.
+
+3) 사전 파일 / 교체
+   - UTF-8, 한 줄에 단어 하나. "단어<TAB>분류" 로 분류를 붙일 수 있고 '#' 은 주석.
+   - 파일 mtime 이 바뀌면 새 오토마톤을 따로 만든 뒤 참조만 바꿔 끼운다.
+     검사 중인 요청은 시작할 때 잡은 오토마톤을 끝까지 쓰므로 중간 상태를 보지 않는다.
+   - 새 사전이 깨져 있으면 기존 오토마톤을 유지한다.
+   - 처음 검사할 때는 사전을 다 읽을 때까지 기다리고, 사전 파일이 없으면 예외를 낸다
+     (빈 사전으로 모든 글을 통과시키지 않는다. 심사 워커는 롤백되어 글이 pending 으로 남는다).
+
+4) 공유 스냅샷 (SNAPSHOT_DIR 이 켜져 있을 때, serve.py)
+   - 컴파일한 오토마톤을 CSR 배열(상태별 전이 구간 / 실패 링크 / 출력)로 파일에 쓰고
+     워커는 mmap 으로 읽는다 (MappedAutomaton). 워커마다 전이 dict 를 만들지 않는다.
+   - 전이 찾기는 dict 조회 대신 상태 구간 안의 bisect (상태당 자식 수가 적어서 몇 번 비교).
+   - 사전 파일이 바뀌면 serve.py 마스터가 스냅샷을 다시 쓰고, 워커는 mtime 을 보고 새로 연다.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+import shared_snapshot
+
+logger = logging.getLogger(__name__)
+
+DICTIONARY_PATH = os.getenv("MODERATION_DICTIONARY_PATH", "moderation_terms.txt")
+
+# 파일 변경 확인 주기 (요청마다 stat 하지 않도록)
+RELOAD_CHECK_SECONDS = 2.0
+
+DEFAULT_CATEGORY = "abuse"
+
+# 같은 문자 연속 허용 횟수 (이보다 길면 잘라서 비교)
+MAX_REPEAT = 2
+
+_CODE_SPACE = 0x110000
+
+# 단어 경계 단위. 비문자(U+10FFFF)라 사전 단어에는 나오지 않으므로 매칭이 끊긴다.
+GAP_UNIT = _CODE_SPACE - 1
+
+SNAPSHOT_NAME = "moderation_automaton"
+SNAPSHOT_MAGIC = b"MODAC001"
+
+# ============================================================
+# 1. 정규화
+# ============================================================
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = "ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+# 조합형 자모(U+1100~) → 호환 자모(U+3131~). 초성/종성 ㄱ 을 같은 단위로 본다.
+_CONJOINING_TO_COMPAT: Dict[str, str] = {}
+for _i, _c in enumerate(_CHOSEONG):
+    _CONJOINING_TO_COMPAT[chr(0x1100 + _i)] = _c
+for _i, _c in enumerate(_JUNGSEONG):
+    _CONJOINING_TO_COMPAT[chr(0x1161 + _i)] = _c
+for _i, _c in enumerate(_JONGSEONG):
+    _CONJOINING_TO_COMPAT[chr(0x11A8 + _i)] = _c
+
+_UNIT_CACHE_MAX = 100_000
+_unit_cache: Dict[str, Tuple[int, ...]] = {}
+
+
+def _compute_units(ch: str) -> Tuple[int, ...]:
+    units: List[int] = []
+    for c in unicodedata.normalize("NFKC", ch).casefold():
+        if not c.isalnum():
+            continue
+        code = ord(c)
+        if 0xAC00 <= code <= 0xD7A3:
+            s = code - 0xAC00
+            units.append(ord(_CHOSEONG[s // 588]))
+            units.append(ord(_JUNGSEONG[(s % 588) // 28]))
+            if s % 28:
+                units.append(ord(_JONGSEONG[s % 28 - 1]))
+        else:
+            units.append(ord(_CONJOINING_TO_COMPAT.get(c, c)))
+    return tuple(units)
+
+
+def char_units(ch: str) -> Tuple[int, ...]:
+    """문자 하나 → 비교 단위(코드포인트) 튜플. 기호/공백이면 빈 튜플."""
+    units = _unit_cache.get(ch)
+    if units is None:
+        units = _compute_units(ch)
+        if len(_unit_cache) < _UNIT_CACHE_MAX:
+            _unit_cache[ch] = units
+    return units
+
+
+def _split_words(text: str) -> List[List[Tuple[int, Tuple[int, ...]]]]:
+    """text → 기호/공백으로 나뉜 단어 목록. 단어는 (원문 위치, 단위) 목록."""
+    words: List[List[Tuple[int, Tuple[int, ...]]]] = []
+    word: List[Tuple[int, Tuple[int, ...]]] = []
+    for position, ch in enumerate(text):
+        char = char_units(ch)
+        if char:
+            word.append((position, char))
+        elif word:
+            words.append(word)
+            word = []
+    if word:
+        words.append(word)
+    return words
+
+
+def normalize(text: str, gaps: bool = True) -> Tuple[List[int], List[int]]:
+    """
+    text → (단위 목록, 단위별 원문 문자 위치).
+    기호/공백은 빠지고, 같은 문자가 3번 이상 연속되면 2번까지만 남는다.
+    기호/공백은 양옆이 모두 한 글자일 때만 잇는다("시 발", "바.보").
+    그 밖의 단어 사이에는 GAP_UNIT 을 넣어 "하시 발표" 가 "시발" 에 걸리지 않게 한다.
+    gaps=False 면 단어를 모두 이어 붙인다 (사전 단어 컴파일용).
+    """
+    units: List[int] = []
+    origins: List[int] = []
+    previous: Tuple[int, ...] = ()
+    repeated = 0
+    last_size = 0
+    for word in _split_words(text):
+        if gaps and units and not (last_size == 1 and len(word) == 1):
+            units.append(GAP_UNIT)
+            origins.append(word[0][0])
+            previous, repeated = (), 0
+        last_size = len(word)
+        for position, char in word:
+            if char == previous:
+                repeated += 1
+                if repeated >= MAX_REPEAT:
+                    continue
+            else:
+                previous, repeated = char, 0
+            units.extend(char)
+            origins.extend([position] * len(char))
+    return units, origins
+
+
+# ============================================================
+# 2. 오토마톤
+# ============================================================
+
+
+@dataclass(frozen=True)
+class Match:
+    term: str
+    category: str
+    start: int  # 원문 문자 위치 [start, end)
+    end: int
+    text: str  # 원문에서 매칭된 부분 (기호/반복 포함)
+
+
+class Automaton:
+    def __init__(self, terms: Iterable[Tuple[str, str]]) -> None:
+        """terms: (단어, 분류) 목록. 정규화 후 비어 있는 단어는 무시."""
+        self.terms: List[Tuple[str, str]] = []
+        self._transitions: Dict[int, int] = {}
+        children: List[List[int]] = [[]]
+        outputs: Dict[int, List[Tuple[int, int]]] = {}
+
+        for term, category in terms:
+            units, _ = normalize(term, gaps=False)
+            if not units:
+                continue
+            state = 0
+            for unit in units:
+                key = state * _CODE_SPACE + unit
+                nxt = self._transitions.get(key)
+                if nxt is None:
+                    nxt = len(children)
+                    children.append([])
+                    self._transitions[key] = nxt
+                    children[state].append(unit)
+                state = nxt
+            term_id = len(self.terms)
+            self.terms.append((term, category))
+            outputs.setdefault(state, []).append((term_id, len(units)))
+
+        # 실패 링크 (BFS). 출력은 실패 링크를 따라 합쳐 둔다.
+        self._fail = [0] * len(children)
+        queue = deque()
+        for unit in children[0]:
+            queue.append(self._transitions[unit])
+        while queue:
+            state = queue.popleft()
+            inherited = outputs.get(self._fail[state])
+            if inherited:
+                outputs[state] = outputs.get(state, []) + inherited
+            for unit in children[state]:
+                child = self._transitions[state * _CODE_SPACE + unit]
+                fallback = self._fail[state]
+                while True:
+                    target = self._transitions.get(fallback * _CODE_SPACE + unit)
+                    if target is not None or fallback == 0:
+                        break
+                    fallback = self._fail[fallback]
+                self._fail[child] = target if target is not None else 0
+                queue.append(child)
+
+        self._outputs: Dict[int, Tuple[Tuple[int, int], ...]] = {
+            state: tuple(found) for state, found in outputs.items()
+        }
+        self.n_states = len(children)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def scan(self, text: str) -> List[Match]:
+        """본문의 모든 매칭 구간 (겹치는 매칭 포함, 끝 위치 순)"""
+        units, origins = normalize(text)
+        transitions = self._transitions
+        fail = self._fail
+        outputs = self._outputs
+
+        matches: List[Match] = []
+        state = 0
+        for i, unit in enumerate(units):
+            while True:
+                nxt = transitions.get(state * _CODE_SPACE + unit)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            found = outputs.get(state)
+            if found:
+                end = origins[i] + 1
+                for term_id, length in found:
+                    start = origins[i - length + 1]
+                    term, category = self.terms[term_id]
+                    matches.append(Match(term, category, start, end, text[start:end]))
+        return matches
+
+
+def write_automaton_snapshot(automaton: Automaton, path: str) -> None:
+    """
+    오토마톤 → CSR 스냅샷.
+    전이 key(state * _CODE_SPACE + unit) 를 정렬하면 상태 순 → 단위 순이 되므로
+    state_offsets[state]:state_offsets[state + 1] 이 그 상태의 전이 구간이다.
+    """
+    keys = np.array(sorted(automaton._transitions), dtype=np.int64)
+    states = keys // _CODE_SPACE
+    arrays = {
+        "state_offsets": np.searchsorted(
+            states, np.arange(automaton.n_states + 1, dtype=np.int64)
+        ).astype(np.int64),
+        "edge_units": (keys % _CODE_SPACE).astype(np.int32),
+        "edge_targets": np.array(
+            [automaton._transitions[int(key)] for key in keys], dtype=np.int32
+        ),
+        "fail": np.array(automaton._fail, dtype=np.int32),
+    }
+    output_offsets = np.zeros(automaton.n_states + 1, dtype=np.int64)
+    output_terms: List[int] = []
+    output_lengths: List[int] = []
+    for state in range(automaton.n_states):
+        for term_id, length in automaton._outputs.get(state, ()):
+            output_terms.append(term_id)
+            output_lengths.append(length)
+        output_offsets[state + 1] = len(output_terms)
+    arrays["output_offsets"] = output_offsets
+    arrays["output_terms"] = np.array(output_terms, dtype=np.int32)
+    arrays["output_lengths"] = np.array(output_lengths, dtype=np.int32)
+    arrays["term_blob"], arrays["term_offsets"] = shared_snapshot.encode_strings(
+        term for term, _ in automaton.terms
+    )
+    arrays["category_blob"], arrays["category_offsets"] = (
+        shared_snapshot.encode_strings(category for _, category in automaton.terms)
+    )
+    shared_snapshot.write(
+        path, SNAPSHOT_MAGIC, arrays, {"n_states": automaton.n_states}
+    )
+
+
+class MappedAutomaton:
+    """스냅샷 파일의 오토마톤. Automaton 과 같은 scan 결과"""
+
+    def __init__(self, path: str) -> None:
+        snapshot = shared_snapshot.Snapshot(path, SNAPSHOT_MAGIC)
+        self.snapshot = snapshot
+        self.n_states = snapshot.meta["n_states"]
+        self._state_offsets = snapshot.view("state_offsets")
+        self._edge_units = snapshot.view("edge_units")
+        self._edge_targets = snapshot.view("edge_targets")
+        self._fail = snapshot.view("fail")
+        self._output_offsets = snapshot.view("output_offsets")
+        self._output_terms = snapshot.view("output_terms")
+        self._output_lengths = snapshot.view("output_lengths")
+        self._terms = snapshot.strings("term")
+        self._categories = snapshot.strings("category")
+        # 루트 전이는 거의 모든 단위에서 보므로 작은 dict 로 (자식 수 = 첫 자모 종류 수)
+        root_end = self._state_offsets[1] if self.n_states else 0
+        self._root = {
+            self._edge_units[j]: self._edge_targets[j] for j in range(root_end)
+        }
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def scan(self, text: str) -> List[Match]:
+        units, origins = normalize(text)
+        offsets = self._state_offsets
+        edge_units = self._edge_units
+        edge_targets = self._edge_targets
+        fail = self._fail
+        output_offsets = self._output_offsets
+
+        matches: List[Match] = []
+        root = self._root
+        state = 0
+        for i, unit in enumerate(units):
+            while True:
+                if state == 0:
+                    state = root.get(unit, 0)
+                    break
+                lo, hi = offsets[state], offsets[state + 1]
+                j = bisect.bisect_left(edge_units, unit, lo, hi)
+                if j < hi and edge_units[j] == unit:
+                    state = edge_targets[j]
+                    break
+                state = fail[state]
+            first, last = output_offsets[state], output_offsets[state + 1]
+            if first != last:
+                end = origins[i] + 1
+                for k in range(first, last):
+                    term_id = self._output_terms[k]
+                    start = origins[i - self._output_lengths[k] + 1]
+                    matches.append(
+                        Match(
+                            self._terms[term_id],
+                            self._categories[term_id],
+                            start,
+                            end,
+                            text[start:end],
+                        )
+                    )
+        return matches
+
+
+# ============================================================
+# 3. 사전 파일 / 교체
+# ============================================================
+
+
+def parse_dictionary(lines: Iterable[str]) -> List[Tuple[str, str]]:
+    terms = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        term, _, category = line.partition("\t")
+        terms.append((term.strip(), category.strip() or DEFAULT_CATEGORY))
+    return terms
+
+
+def load_automaton(path: str) -> Automaton:
+    with open(path, encoding="utf-8") as f:
+        return Automaton(parse_dictionary(f))
+
+
+class ModerationEngine:
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or DICTIONARY_PATH
+        self._automaton = Automaton([])
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._reload_lock = threading.Lock()
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def automaton(self) -> Automaton:
+        mapped = _automaton_snapshot.get()
+        if mapped is not None:
+            return mapped
+        if self.loaded_at is None:
+            self._load_initial()
+        now = time.monotonic()
+        if now - self._checked_at >= RELOAD_CHECK_SECONDS:
+            self._checked_at = now
+            self.reload_if_changed()
+        return self._automaton
+
+    def _load_initial(self) -> None:
+        """
+        첫 사용: 사전을 다 읽을 때까지 기다린다 (다른 스레드가 읽는 중이면 그 결과를 쓴다).
+        사전 파일이 없거나 읽을 수 없으면 예외 — 빈 사전으로 모든 글을 통과시키지 않는다.
+        """
+        with self._reload_lock:
+            if self.loaded_at is not None:
+                return
+            try:
+                mtime = os.stat(self.path).st_mtime
+                automaton = load_automaton(self.path)
+            except (OSError, UnicodeDecodeError):
+                logger.error("[moderation] 사전을 읽을 수 없음: %s", self.path)
+                raise
+            self._automaton = automaton
+            self._mtime = mtime
+            self._checked_at = time.monotonic()
+            self.loaded_at = self._checked_at
+        logger.info(
+            "[moderation] 사전 로드: 단어 %d개, state %d개",
+            len(automaton),
+            automaton.n_states,
+        )
+
+    def reload_if_changed(self) -> bool:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            if self._mtime is not None:
+                logger.warning(
+                    "[moderation] 사전 파일 없음, 기존 사전 유지: %s", self.path
+                )
+                self._mtime = None
+            return False
+        if mtime == self._mtime:
+            return False
+
+        # 다른 스레드가 이미 빌드 중이면 기존 오토마톤으로 계속 검사한다
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            started = time.perf_counter()
+            try:
+                automaton = load_automaton(self.path)
+            except (OSError, UnicodeDecodeError):
+                logger.exception(
+                    "[moderation] 사전 로드 실패, 기존 사전 유지: %s", self.path
+                )
+                self._mtime = mtime
+                return False
+
+            # 참조 한 번 대입으로 교체 (검사 중인 요청은 이전 오토마톤을 계속 사용)
+            self._automaton = automaton
+            self._mtime = mtime
+            self.loaded_at = time.monotonic()
+        finally:
+            self._reload_lock.release()
+
+        logger.info(
+            "[moderation] 사전 교체: 단어 %d개, state %d개 (%.0fms)",
+            len(automaton),
+            automaton.n_states,
+            (time.perf_counter() - started) * 1000,
+        )
+        return True
+
+    def scan(self, text: str) -> List[Match]:
+        return self.automaton.scan(text)
+
+
+_automaton_snapshot = shared_snapshot.SnapshotHandle(SNAPSHOT_NAME, MappedAutomaton)
+
+
+def build_automaton_snapshot(path: str, dictionary_path: Optional[str] = None) -> int:
+    """사전 파일을 컴파일해서 스냅샷으로 쓴다. 반환값: 단어 수"""
+    automaton = load_automaton(dictionary_path or DICTIONARY_PATH)
+    write_automaton_snapshot(automaton, path)
+    return len(automaton)
+
+
+moderation_engine = ModerationEngine()
+
+
+def scan(text: str) -> List[Match]:
+    return moderation_engine.scan(text)
+
+
+def dictionary_version() -> Automaton:
+    """지금 쓰는 오토마톤. 사전이 교체되면 다른 객체가 된다 (판정 캐시 무효화용)"""
+    return moderation_engine.automaton
@@ -0,0 +1,293 @@
+# path: moderation_worker.py
+"""
+게시글 비동기 심사 워커.
+
+- 게시글은 status='pending' 으로 바로 저장되고 (작성자에게만 보임),
+  이 워커가 대기열(ix_community_posts_pending)에서 오래된 순으로 batch 만큼 가져와
+  분류기(ai_service.load_classifier)에 한 번에 넣은 뒤 active / hidden 으로 바꾼다.
+- 마이크로 배치: 대기 글이 batch 크기만큼 모이거나,
+  가장 오래된 글이 --max-wait-ms 만큼 기다렸으면 그때 처리한다.
+- FOR UPDATE SKIP LOCKED 로 가져오므로 워커를 여러 개 띄워도 같은 글을 두 번 심사하지 않는다.
+- 배치 분류가 실패하면 같은 배치를 한 글씩 다시 심사한다.
+  실패한 글만 moderation_attempts 를 올리고 pending 으로 남기며,
+  MODERATION_MAX_ATTEMPTS 번 실패한 글은 status='review' (운영자 확인 대기) 로 빼서
+  대기열 맨 앞의 글 하나가 워커를 계속 멈추지 않게 한다.
+  한 글씩도 전부 실패하면 분류기 장애로 보고 롤백한 뒤, --loop 에서는
+  MODERATION_BACKOFF_MAX_SECONDS 까지 늘어나는 간격으로 쉬었다가 다시 시도한다.
+- 배치마다 moderation_batches 에 한 줄 기록한다
+  (batch_size, classified_count = 실제 분류기 호출 건수(판정 캐시 미스),
+   hidden_count, review_count). MODERATION_BATCH_RETENTION_DAYS 가 지난 기록은 지운다.
+  지연(작성 → 판정), 배치 크기, 배치 처리 시간(started_at → finished_at)은
+  GET /moderation/stats 에서 확인.
+
+사용법:
+    python moderation_worker.py                    # 대기열이 빌 때까지 처리
+    python moderation_worker.py --loop             # 계속 대기하며 처리
+    MODERATION_CLASSIFIER=pkg.module:Classifier python moderation_worker.py --loop
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import ai_service
+import tracing
+import models
+from database import SessionLocal
+
+# 한 글에서 분류기가 이만큼 실패하면 review 로 뺀다
+MAX_ATTEMPTS = int(os.getenv("MODERATION_MAX_ATTEMPTS", "3"))
+# 분류기 장애 시 재시도 간격 (1초부터 두 배씩, 최대값)
+BACKOFF_MAX_SECONDS = float(os.getenv("MODERATION_BACKOFF_MAX_SECONDS", "60"))
+# moderation_batches 보관 기간 / 정리 주기
+BATCH_RETENTION_DAYS = int(os.getenv("MODERATION_BATCH_RETENTION_DAYS", "7"))
+PRUNE_INTERVAL_SECONDS = 3600.0
+
+_PENDING_SQL = text(
+    """
+    SELECT COUNT(*), COALESCE(EXTRACT(EPOCH FROM now() - MIN(created_at)), 0)
+    FROM (
+        SELECT created_at
+        FROM community_posts
+        WHERE status = 'pending'
+        ORDER BY created_at
+        LIMIT :limit
+    ) head
+    """
+)
+
+_CLAIM_SQL = text(
+    """
+    SELECT id, content, EXTRACT(EPOCH FROM now() - created_at) AS waited
+    FROM community_posts
+    WHERE status = 'pending'
+    ORDER BY created_at
+    LIMIT :limit
+    FOR UPDATE SKIP LOCKED
+    """
+)
+
+# 심사 결과 반영 + 해당 커뮤니티 게시글 목록 버전(ETag) 올리기
+_APPLY_SQL = text(
+    """
+    WITH applied AS (
+        UPDATE community_posts p
+        SET status = v.status, moderated_at = now()
+        FROM unnest(CAST(:ids AS BIGINT[]), CAST(:statuses AS VARCHAR[])) AS v(id, status)
+        WHERE p.id = v.id
+          AND p.status = 'pending'  -- 그 사이 신고로 숨겨진 글은 그대로
+        RETURNING p.community_id
+    )
+    UPDATE communities c
+    SET posts_version = posts_version + 1
+    WHERE c.id IN (SELECT community_id FROM applied)
+    """
+)
+
+# 분류기가 실패한 글: 시도 횟수를 올리고, 한도에 닿으면 review 로
+_FAILED_SQL = text(
+    """
+    UPDATE community_posts
+    SET moderation_attempts = moderation_attempts + 1,
+        status = CASE
+            WHEN moderation_attempts + 1 >= :max_attempts THEN 'review'
+            ELSE status
+        END
+    WHERE id = ANY(CAST(:ids AS BIGINT[]))
+      AND status = 'pending'
+    RETURNING status
+    """
+)
+
+_PRUNE_SQL = text(
+    """
+    DELETE FROM moderation_batches
+    WHERE started_at < now() - make_interval(days => :days)
+    """
+)
+
+
+def wait_for_batch(
+    batch_size: int, max_wait: float, poll_interval: float, loop: bool
+) -> bool:
+    """
+    대기 글이 batch_size 개 모이거나 가장 오래된 글이 max_wait 초를 넘길 때까지 기다린다.
+    대기 글이 하나도 없고 loop 가 아니면 False.
+    """
+    while True:
+        db: Session = SessionLocal()
+        try:
+            pending, oldest_wait = db.execute(_PENDING_SQL, {"limit": batch_size}).one()
+        finally:
+            db.close()
+
+        if pending >= batch_size or (pending and oldest_wait >= max_wait):
+            return True
+        if not pending and not loop:
+            return False
+        if pending:
+            time.sleep(min(poll_interval, max_wait - float(oldest_wait)))
+        else:
+            time.sleep(poll_interval)
+
+
+def _classify_each(
+    classifier: ai_service.TextClassifier, contents: Sequence[str]
+) -> Tuple[List[Optional[str]], int]:
+    """
+    배치 분류가 실패했을 때 한 글씩 다시 심사.
+    반환값: (글별 상태, 실패한 글은 None), 분류기 호출 건수
+    """
+    statuses: List[Optional[str]] = []
+    classified = 0
+    for content in contents:
+        try:
+            (verdict,) = classifier.classify_batch([content])
+        except Exception:
+            statuses.append(None)
+            continue
+        classified += getattr(classifier, "last_classified", 1)
+        statuses.append("active" if verdict.is_safe else "hidden")
+    return statuses, classified
+
+
+def _record_batch(db: Session, started_at: datetime, **fields) -> None:
+    db.add(
+        models.ModerationBatch(
+            started_at=started_at, finished_at=datetime.now(timezone.utc), **fields
+        )
+    )
+    db.commit()
+
+
+def run_batch(classifier: ai_service.TextClassifier, batch_size: int) -> int:
+    """
+    대기 글 batch_size 개를 심사하고 moderation_batches 에 기록. 반환값: 처리한 글 수.
+    분류기 장애(한 글씩도 전부 실패)면 롤백 후 예외를 그대로 올린다.
+    """
+    db: Session = SessionLocal()
+    try:
+        rows = db.execute(_CLAIM_SQL, {"limit": batch_size}).all()
+        if not rows:
+            db.rollback()
+            return 0
+
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        contents = [row.content for row in rows]
+        error = None
+        try:
+            verdicts = classifier.classify_batch(contents)
+            statuses = ["active" if v.is_safe else "hidden" for v in verdicts]
+            classified = getattr(classifier, "last_classified", len(rows))
+        except Exception as e:
+            error = repr(e)
+            # 잠금은 그대로 쥔 채 한 글씩 다시 (다른 워커가 가져가지 않는다)
+            statuses, classified = _classify_each(classifier, contents)
+            if len(rows) > 1 and all(status is None for status in statuses):
+                db.rollback()
+                _record_batch(
+                    db,
+                    started_at,
+                    status="failed",
+                    batch_size=len(rows),
+                    error_message=error,
+                )
+                raise
+
+        failed_ids = [row.id for row, s in zip(rows, statuses) if s is None]
+        reviewed = 0
+        if failed_ids:
+            parked = db.execute(
+                _FAILED_SQL, {"ids": failed_ids, "max_attempts": MAX_ATTEMPTS}
+            ).scalars()
+            reviewed = sum(1 for status in parked if status == "review")
+        done = [(row.id, s) for row, s in zip(rows, statuses) if s is not None]
+        if done:
+            db.execute(
+                _APPLY_SQL,
+                {"ids": [i for i, _ in done], "statuses": [s for _, s in done]},
+            )
+        hidden = statuses.count("hidden")
+        _record_batch(
+            db,
+            started_at,
+            status="partial" if failed_ids else "success",
+            batch_size=len(rows),
+            classified_count=classified,
+            hidden_count=hidden,
+            review_count=reviewed,
+            error_message=error,
+        )
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"[moderation_worker] {classifier.name}: {len(rows)}건 "
+            f"(숨김 {hidden}, 분류기 호출 {classified}"
+            + (f", 실패 {len(failed_ids)}, review {reviewed}" if failed_ids else "")
+            + f") {elapsed * 1000:.0f}ms, 최대 대기 {float(rows[0].waited):.2f}s"
+        )
+        return len(rows)
+    finally:
+        db.close()
+
+
+def prune_batches(retention_days: int = BATCH_RETENTION_DAYS) -> int:
+    """보관 기간이 지난 moderation_batches 기록 삭제. 반환값: 지운 행 수"""
+    db: Session = SessionLocal()
+    try:
+        deleted = db.execute(_PRUNE_SQL, {"days": retention_days}).rowcount
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="게시글 비동기 심사")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument(
+        "--max-wait-ms",
+        type=int,
+        default=200,
+        help="배치를 채우려고 기다리는 최대 시간",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.2, help="대기열 확인 간격(초)"
+    )
+    parser.add_argument("--loop", action="store_true", help="대기열을 계속 감시")
+    parser.add_argument("--classifier", help="기본값: MODERATION_CLASSIFIER 환경 변수")
+    args = parser.parse_args()
+
+    tracing.init()
+    classifier = ai_service.load_classifier(args.classifier)
+    max_wait = args.max_wait_ms / 1000
+    failures = 0
+    pruned_at = 0.0
+    while wait_for_batch(args.batch_size, max_wait, args.interval, args.loop):
+        if time.monotonic() - pruned_at >= PRUNE_INTERVAL_SECONDS:
+            prune_batches()
+            pruned_at = time.monotonic()
+        try:
+            with tracing.transaction("task", "moderation_worker.run_batch"):
+                run_batch(classifier, args.batch_size)
+        except Exception as e:
+            if not args.loop:
+                raise
+            failures += 1
+            delay = min(BACKOFF_MAX_SECONDS, 2.0 ** (failures - 1))
+            print(f"[moderation_worker] 분류기 실패 {failures}회: {e!r} ({delay:.0f}s 후 재시도)")
+            time.sleep(delay)
+            continue
+        failures = 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# path: partition_maintenance.py
+"""
+파티션 정기 작업 (partitions.py). cron 등으로 하루 한 번 정도 실행.
+
+1) 이번 달 ~ MONTHS_AHEAD 개월 뒤 파티션 미리 만들기
+2) 중간에 끊긴 DETACH ... CONCURRENTLY 마무리
+3) 보관 기간이 지난 달 파티션을 DETACH ... CONCURRENTLY 로 떼어내서
+   archive 스키마로 옮기기 (--drop 이면 삭제)
+   - 행을 지우지 않고 파티션을 통째로 떼어내므로 메타데이터 작업이다
+   - institution_raw 는 미처리(processed = false) 행이 남은 달은 건너뛴다
+   - community_posts 는 기본으로 떼어내지 않고 (POST_RETENTION_MONTHS=0),
+     켜더라도 살아 있는 글(삭제 안 됨 + active / pending)이 남은 달은 건너뛴다
+
+사용법:
+    python partition_maintenance.py [--dry-run] [--drop]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import partitions
+from database import engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="파티션 생성 / 보관 기간 정리")
+    parser.add_argument("--dry-run", action="store_true", help="떼어낼 파티션만 출력")
+    parser.add_argument("--drop", action="store_true", help="archive 대신 삭제")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        for name in partitions.ensure_upcoming(conn):
+            print(f"[partition_maintenance] 생성 {name}")
+
+    # DETACH ... CONCURRENTLY 는 트랜잭션 밖에서만 된다
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if not args.dry_run:
+            for target in partitions.finalize_pending_detaches(conn, args.drop):
+                print(f"[partition_maintenance] DETACH 마무리 → {target}")
+
+        for table in partitions.PARTITIONED_TABLES:
+            if not partitions.is_partitioned(conn, table):
+                print(
+                    f"[partition_maintenance] {table}: 파티션 테이블이 아님 "
+                    "(python migrate_partitions.py 필요)"
+                )
+                continue
+            for name in partitions.expired_partitions(conn, table):
+                if partitions.has_rows_to_keep(conn, table, name):
+                    print(f"[partition_maintenance] 건너뜀 {name} (남길 행 있음)")
+                    continue
+                if args.dry_run:
+                    print(f"[partition_maintenance] (dry-run) 떼어낼 파티션 {name}")
+                    continue
+                target = partitions.detach_partition(conn, table, name, args.drop)
+                print(f"[partition_maintenance] {name} → {target}")
+
+
+if __name__ == "__main__":
+    main()
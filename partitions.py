@@ -0,0 +1,238 @@
+# path: partitions.py
+"""
+월 단위 range 파티션 관리: community_posts(created_at), institution_raw(received_at).
+
+- 두 테이블은 계속 쌓이기만 한다 (삭제된 글 / 처리 끝난 원본도 그대로 남음).
+  파티션 테이블로 만들어서 오래된 달은 DETACH(메타데이터 작업) 로 떼어낸다.
+  큰 DELETE + VACUUM 이 필요 없다.
+- 파티션 이름: <테이블>_pYYYYMM, 범위 [그 달 1일 00:00 UTC, 다음 달 1일)
+  - 기본(DEFAULT) 파티션은 두지 않는다 (새 파티션을 만들 때마다 기본 파티션을 훑어야 하고,
+    피드 쿼리의 순서 있는 Append 도 막는다). 범위 밖 시각은 INSERT 오류가 된다.
+  - 그래서 미래 파티션을 MONTHS_AHEAD 개월 미리 만든다.
+    (CREATE TABLE ... PARTITION OF 는 부모 테이블을 잠깐 배타 잠금하므로 요청 경로가 아니라
+    서버 시작 / partition_maintenance.py 에서 만든다)
+- 피드 (community_id = ? ORDER BY created_at DESC LIMIT n) 는 ix_community_posts_feed 로
+  최신 파티션부터 순서대로 읽다가 n 개를 채우면 멈춘다 (오래된 파티션은 실행되지 않음).
+- PK 에 파티션 키가 들어가야 해서 (id, created_at) / (id, received_at) 이다.
+  id 유니크는 시퀀스가 보장한다. 같은 이유로 community_comments.post_id 는 FK 가 없다.
+- 보관 기간 (달, 0 이면 보관만 하고 떼어내지 않음)
+    POST_RETENTION_MONTHS=0              (기본 꺼짐. 켜도 살아 있는 글
+                                          (삭제 안 됨 + active / pending) 이 남은 달은 떼어내지 않는다)
+    INSTITUTION_RAW_RETENTION_MONTHS=3   (미처리 원본이 남은 달은 떼어내지 않는다)
+  떼어낸 파티션은 PARTITION_ARCHIVE_SCHEMA (기본 archive) 스키마로 옮겨 둔다.
+- 서버 워커 여러 개 / 정기 작업이 동시에 ensure_upcoming 을 불러도 되도록
+  advisory lock 으로 한 번에 하나만 만들고, CREATE TABLE IF NOT EXISTS 로 만든다.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+ARCHIVE_SCHEMA = os.getenv("PARTITION_ARCHIVE_SCHEMA", "archive")
+
+# ensure_upcoming 직렬화용 pg_advisory_xact_lock 키
+_ENSURE_LOCK_KEY = "partitions.ensure_upcoming"
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    column: str
+    retention_months: int
+    # 이 조건에 맞는 행이 남은 파티션은 떼어내지 않는다
+    keep_if: Optional[str] = None
+
+
+PARTITIONED_TABLES: Dict[str, PartitionSpec] = {
+    "community_posts": PartitionSpec(
+        "created_at",
+        int(os.getenv("POST_RETENTION_MONTHS", "0")),
+        keep_if="NOT is_deleted AND status IN ('active', 'pending', 'review')",
+    ),
+    "institution_raw": PartitionSpec(
+        "received_at",
+        int(os.getenv("INSTITUTION_RAW_RETENTION_MONTHS", "3")),
+        keep_if="NOT processed",
+    ),
+}
+
+_IS_PARTITIONED_SQL = text(
+    """
+    SELECT EXISTS (
+        SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)
+    )
+    """
+)
+
+_PARTITIONS_SQL = text(
+    """
+    SELECT c.relname, i.inhdetachpending
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = to_regclass(:table)
+    ORDER BY c.relname
+    """
+)
+
+
+# ============================================================
+# 달 계산
+# ============================================================
+
+
+def month_floor(value: datetime) -> datetime:
+    value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def _partition_month(table: str, name: str) -> Optional[datetime]:
+    """관리 대상 파티션 이름 → 그 달. 규칙에 안 맞으면 None"""
+    matched = re.fullmatch(rf"{re.escape(table)}_p(\d{{4}})(\d{{2}})", name)
+    if not matched:
+        return None
+    return datetime(int(matched[1]), int(matched[2]), 1, tzinfo=timezone.utc)
+
+
+# ============================================================
+# 조회 / 생성
+# ============================================================
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    return bool(conn.execute(_IS_PARTITIONED_SQL, {"table": table}).scalar())
+
+
+def list_partitions(conn: Connection, table: str) -> List[Tuple[str, datetime, bool]]:
+    """(파티션 이름, 달, DETACH 진행 중 여부) — 달 순서"""
+    partitions = []
+    for name, detach_pending in conn.execute(_PARTITIONS_SQL, {"table": table}):
+        month = _partition_month(table, name)
+        if month is not None:
+            partitions.append((name, month, detach_pending))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def ensure_partitions(
+    conn: Connection, table: str, start: datetime, end: datetime
+) -> List[str]:
+    """start ~ end 가 들어가는 달 파티션을 빠짐없이 만든다. 반환값: 새로 만든 파티션"""
+    existing = {name for name, _, _ in list_partitions(conn, table)}
+    created = []
+    month, last = month_floor(start), month_floor(end)
+    while month <= last:
+        name = partition_name(table, month)
+        if name not in existing:
+            conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') "
+                    f"TO ('{add_months(month, 1).isoformat()}')"
+                )
+            )
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+def ensure_upcoming(conn: Connection, now: Optional[datetime] = None) -> List[str]:
+    """
+    이번 달 ~ MONTHS_AHEAD 개월 뒤 파티션을 만든다 (서버 시작 / 정기 작업).
+    아직 파티션 테이블이 아닌 (migrate_partitions.py 전) 테이블은 건너뛴다.
+    동시에 여러 프로세스가 불러도 트랜잭션 advisory lock 으로 차례로 돈다
+    (conn 은 트랜잭션 안이어야 한다. 커밋 / 롤백 때 풀린다).
+    """
+    now = now or datetime.now(timezone.utc)
+    conn.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+        {"key": _ENSURE_LOCK_KEY},
+    )
+    created = []
+    for table in PARTITIONED_TABLES:
+        if is_partitioned(conn, table):
+            created += ensure_partitions(
+                conn, table, now, add_months(month_floor(now), MONTHS_AHEAD)
+            )
+    return created
+
+
+# ============================================================
+# 보관 기간 지난 파티션 떼어내기
+# ============================================================
+
+
+def expired_partitions(
+    conn: Connection, table: str, now: Optional[datetime] = None
+) -> List[str]:
+    """범위 끝이 (이번 달 - 보관 기간) 이전인 파티션"""
+    spec = PARTITIONED_TABLES[table]
+    if spec.retention_months <= 0:
+        return []
+    cutoff = add_months(
+        month_floor(now or datetime.now(timezone.utc)), -spec.retention_months
+    )
+    return [
+        name
+        for name, month, _ in list_partitions(conn, table)
+        if add_months(month, 1) <= cutoff
+    ]
+
+
+def has_rows_to_keep(conn: Connection, table: str, partition: str) -> bool:
+    keep_if = PARTITIONED_TABLES[table].keep_if
+    if not keep_if:
+        return False
+    return bool(
+        conn.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {partition} WHERE {keep_if})")
+        ).scalar()
+    )
+
+
+def archive_partition(conn: Connection, partition: str, drop: bool = False) -> str:
+    """떼어낸 파티션을 ARCHIVE_SCHEMA 로 옮기거나 (drop=True 면) 지운다. 반환값: 옮긴 위치"""
+    if drop:
+        conn.execute(text(f"DROP TABLE {partition}"))
+        return "dropped"
+    conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    conn.execute(text(f"ALTER TABLE {partition} SET SCHEMA {ARCHIVE_SCHEMA}"))
+    return f"{ARCHIVE_SCHEMA}.{partition}"
+
+
+def detach_partition(
+    conn: Connection, table: str, partition: str, drop: bool = False
+) -> str:
+    """
+    DETACH ... CONCURRENTLY (읽기 / 쓰기를 막지 않음) 후 archive_partition.
+    트랜잭션 밖에서만 되므로 conn 은 AUTOCOMMIT 이어야 한다.
+    """
+    conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition} CONCURRENTLY"))
+    return archive_partition(conn, partition, drop)
+
+
+def finalize_pending_detaches(conn: Connection, drop: bool = False) -> List[str]:
+    """중간에 끊긴 DETACH ... CONCURRENTLY 를 마무리하고 archive_partition"""
+    finalized = []
+    for table in PARTITIONED_TABLES:
+        for name, _, detach_pending in list_partitions(conn, table):
+            if detach_pending:
+                conn.execute(
+                    text(f"ALTER TABLE {table} DETACH PARTITION {name} FINALIZE")
+                )
+                finalized.append(archive_partition(conn, name, drop))
+    return finalized
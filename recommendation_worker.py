@@ -0,0 +1,173 @@
+# path: recommendation_worker.py
+"""
+추천 후보 top-K 미리 계산 워커.
+
+- user_recommendations 에서 dirty_at 이 찍힌 유저를 오래된 순으로 batch 만큼 가져와
+  프로세스 풀로 나눠 matching.find_matches 를 돌리고, 결과를 한 번에 UPSERT 한다.
+- 계산 도중 다시 dirty 가 된 유저는 dirty 를 유지한다: 가져올 때 dirty_seq 를 같이 읽고,
+  저장할 때 dirty_seq 가 그대로인 행만 dirty 를 지운다. (dirty 표시하는 쪽이 아직 커밋 전이면
+  저장 UPSERT 가 행 잠금에서 기다렸다가 커밋된 새 dirty_seq 를 보고 dirty 를 남긴다)
+  dirty_at 은 처음 dirty 가 된 시각(대기열 순서)이라 이미 dirty 인 유저는 바뀌지 않는다.
+- 배치마다 sync_jobs 에 external_source='recommendations' 로 처리량을 기록한다.
+  (GET /recommendations/stats 에서 확인)
+
+사용법:
+    python recommendation_worker.py            # 대기열이 빌 때까지 처리
+    python recommendation_worker.py --full     # 전체 유저를 dirty 로 표시 후 처리
+    python recommendation_worker.py --loop     # 계속 대기하며 처리
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+import keyword_affinity
+import matching
+import models
+from database import SessionLocal, engine
+
+TOP_K = 50
+
+_CLAIM_SQL = text("""
+    SELECT user_id, dirty_seq
+    FROM user_recommendations
+    WHERE dirty_at IS NOT NULL
+    ORDER BY dirty_at
+    LIMIT :limit
+    """)
+
+_MARK_ALL_DIRTY_SQL = text("""
+    INSERT INTO user_recommendations (user_id, dirty_at, dirty_seq)
+    SELECT id, now(), 1 FROM users WHERE is_deleted = false
+    ON CONFLICT (user_id) DO UPDATE
+    SET dirty_at = COALESCE(user_recommendations.dirty_at, EXCLUDED.dirty_at),
+        dirty_seq = user_recommendations.dirty_seq + 1
+    """)
+
+
+def _init_process() -> None:
+    # fork 로 물려받은 커넥션 풀은 부모와 공유되면 안 된다 → 새 풀로 시작
+    engine.dispose(close=False)
+
+
+def compute_chunk(claims: List[Tuple[int, int]]) -> int:
+    """
+    claims: (user_id, 가져올 때의 dirty_seq).
+    top-K 를 계산해서 한 번의 UPSERT 로 저장한다.
+    """
+    user_ids = [user_id for user_id, _ in claims]
+    db: Session = SessionLocal()
+    try:
+        # 이번에 바뀐 유저의 키워드 벡터는 DB 에서 다시 읽는다
+        # (프로세스 인덱스는 다른 프로세스의 키워드 추가를 늦게 본다)
+        keyword_affinity.get_index(db).refresh_users(db, user_ids)
+        rows = [
+            {
+                "user_id": user_id,
+                "matches": orjson.dumps(
+                    matching.find_matches(db, user_id=user_id, limit=TOP_K)
+                ).decode(),
+                "computed_at": datetime.now(timezone.utc),
+                "dirty_seq": dirty_seq,
+            }
+            for user_id, dirty_seq in claims
+        ]
+        table = models.UserRecommendation.__table__
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={
+                "matches": stmt.excluded.matches,
+                "computed_at": stmt.excluded.computed_at,
+                # 가져온 뒤에 다시 바뀐 유저는 dirty 유지 (dirty_seq 는 그대로 둔다)
+                "dirty_at": text(
+                    "CASE WHEN user_recommendations.dirty_seq = excluded.dirty_seq "
+                    "THEN NULL ELSE user_recommendations.dirty_at END"
+                ),
+            },
+        )
+        db.execute(stmt)
+        db.commit()
+        return len(rows)
+    finally:
+        db.close()
+
+
+def run_batch(pool: ProcessPoolExecutor, batch_size: int, processes: int) -> int:
+    """dirty 유저 batch_size 명을 처리하고 sync_jobs 에 기록. 반환값: 처리한 유저 수"""
+    db: Session = SessionLocal()
+    try:
+        claims = [tuple(row) for row in db.execute(_CLAIM_SQL, {"limit": batch_size})]
+        if not claims:
+            return 0
+
+        job = models.SyncJob(external_source="recommendations", status="running")
+        job.fetched_count = len(claims)
+        db.add(job)
+        db.commit()
+
+        started = time.perf_counter()
+        chunk_size = -(-len(claims) // processes)
+        chunks = [claims[i : i + chunk_size] for i in range(0, len(claims), chunk_size)]
+        try:
+            done = sum(pool.map(compute_chunk, chunks))
+        except Exception as e:
+            job.status = "failed"
+            job.error_message = repr(e)
+            job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+            raise
+
+        elapsed = time.perf_counter() - started
+        job.status = "success"
+        job.upserted_count = done
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        print(
+            f"[recommendation_worker] {done}명 처리 {elapsed:.2f}s "
+            f"({done / max(elapsed, 1e-9):.0f} users/s)"
+        )
+        return done
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="추천 후보 top-K 미리 계산")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--full", action="store_true", help="전체 유저 재계산")
+    parser.add_argument("--loop", action="store_true", help="대기열을 계속 감시")
+    parser.add_argument(
+        "--interval", type=float, default=2.0, help="--loop 대기 간격(초)"
+    )
+    args = parser.parse_args()
+
+    if args.full:
+        with engine.begin() as conn:
+            conn.execute(_MARK_ALL_DIRTY_SQL)
+
+    with ProcessPoolExecutor(
+        max_workers=args.processes, initializer=_init_process
+    ) as pool:
+        while True:
+            done = run_batch(pool, args.batch_size, args.processes)
+            if done:
+                continue
+            if not args.loop:
+                break
+            time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# path: refresh_keyword_counts.py
+"""
+keywords.user_count (키워드별 보유 유저 수) 갱신 스크립트.
+
+- 자동완성(/keywords/autocomplete)의 인기순 정렬에 쓰인다.
+- 값이 바뀐 키워드 행만 UPDATE 한다. cron 등으로 주기 실행.
+
+사용법:
+    python refresh_keyword_counts.py
+"""
+
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+import crud
+from database import SessionLocal
+
+
+def main() -> None:
+    db: Session | None = None
+    try:
+        db = SessionLocal()
+        changed = crud.refresh_keyword_counts(db)
+        print(f"[refresh_keyword_counts] 키워드 {changed}개 갱신")
+    except Exception as e:
+        if db is not None:
+            db.rollback()
+        print("[refresh_keyword_counts] 오류 발생:", repr(e))
+        raise
+    finally:
+        if db is not None:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from sqlalchemy import text
 
 from database import engine
 import models  # noqa: F401  (Base 에 테이블 등록용)
+import partitions
 
 
 def main():
@@ -14,11 +15,14 @@ def main():
         community_posts,
         community_members,
         communities,
+        report_targets,
         reports,
         user_keywords,
+        keywords,
         user_school_histories,
         user_school_anchors,
         user_profiles,
+        user_recommendations,
         user_blocks,
         user_friendships,
         institution_raw,
@@ -33,6 +37,8 @@ def main():
         print("[reset] 기존 테이블 DROP 완료.")
         models.Base.metadata.create_all(bind=conn)
         print("[reset] 새 스키마 CREATE_ALL 완료.")
+        created = partitions.ensure_upcoming(conn)
+        print(f"[reset] 파티션 {len(created)}개 생성 완료.")
 
     print("[reset] 완료!")
 
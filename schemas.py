@@ -1,5 +1,6 @@
 # path: schemas.py
-from typing import Optional, List
+from datetime import datetime
+from typing import Literal, Optional, List
 
 from pydantic import BaseModel, EmailStr, ConfigDict
 
@@ -36,6 +37,41 @@ class Token(BaseModel):
     token_type: str
 
 
+class UserBlockCreate(BaseModel):
+    reason: Optional[str] = None
+
+
+class UserBlock(BaseModel):
+    blocked_user_id: int
+    reason: Optional[str] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class Friendship(BaseModel):
+    id: int
+    user_id: int  # 요청 보낸 유저
+    friend_user_id: int  # 요청 받은 유저
+    status: str  # 'pending','accepted'
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class Friend(BaseModel):
+    user_id: int
+    nickname: str
+
+
+class FriendSuggestion(Friend):
+    mutual_friend_count: int
+
+
+class MutualFriends(BaseModel):
+    user_id: int
+    mutual_friend_count: int
+
+
 # ============================================================
 # 2. 프로필 / 학교
 # ============================================================
@@ -77,6 +113,41 @@ class UserSchoolAnchor(UserSchoolAnchorBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserSchoolAnchorDetail(UserSchoolAnchor):
+    institution_name: str
+
+
+class UserSchoolHistoryBase(BaseModel):
+    institution_id: int
+    school_level: str  # 'elementary','middle','high'
+    start_year: Optional[int] = None  # 해당 학년도
+    end_year: Optional[int] = None
+    grade: Optional[int] = None
+    class_group: Optional[str] = None
+    homeroom_teacher: Optional[str] = None
+    club_name: Optional[str] = None
+    nickname_in_class: Optional[str] = None
+    is_transfer: Optional[bool] = False
+    notes: Optional[str] = None
+
+
+class UserSchoolHistoryCreate(UserSchoolHistoryBase):
+    pass
+
+
+class UserSchoolHistory(UserSchoolHistoryBase):
+    id: int
+    user_id: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class Classmate(BaseModel):
+    user_id: int
+    nickname: str
+    reasons: List[str]  # 'class','homeroom','club'
+
+
 class UserKeywordBase(BaseModel):
     keyword: str
     weight: Optional[int] = None
@@ -89,10 +160,97 @@ class UserKeywordCreate(UserKeywordBase):
 class UserKeyword(UserKeywordBase):
     id: int
     user_id: int
+    keyword_id: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class KeywordSuggestion(BaseModel):
+    id: int
+    keyword: str
+    user_count: int
+
+
+class Match(BaseModel):
+    user_id: int
+    nickname: str
+    score: float
+    anchor_overlap: int  # 겹치는 학교 앵커 수
+    keyword_overlap: int  # 공유 키워드 수
+    keyword_affinity: float  # 키워드 TF-IDF 코사인 유사도 (0~1)
+    same_residence: bool
+
+
+class Recommendations(BaseModel):
+    user_id: int
+    computed_at: Optional[datetime] = None
+    is_stale: bool  # 재계산 대기 중이면 true
+    stale_seconds: float  # 재계산이 필요해진 뒤 지난 시간 (최신이면 0)
+    matches: List[Match]
+
+
+class RecommendationStats(BaseModel):
+    pending_users: int  # 재계산 대기 유저 수
+    oldest_pending_seconds: float
+    last_batch_users: int
+    last_batch_seconds: float
+    last_batch_users_per_second: float
+
+
+class ModerationStats(BaseModel):
+    pending_posts: int  # 심사 대기 게시글 수
+    oldest_pending_seconds: float
+    review_posts: int  # 분류기가 반복해서 실패해 운영자 확인을 기다리는 글
+    # 최근 1시간 (작성 → 판정)
+    moderated_posts: int
+    lag_p50_seconds: float
+    lag_p95_seconds: float
+    lag_max_seconds: float
+    batches: int
+    failed_batches: int  # 분류기 장애로 롤백된 배치
+    avg_batch_size: float
+    max_batch_size: int
+    avg_batch_seconds: float  # 배치 처리 시간 (가져오기 → 판정 반영)
+    max_batch_seconds: float
+    cache_hit_ratio: float  # 판정 캐시로 분류기를 건너뛴 비율
+
+
+class ReportCreate(BaseModel):
+    target_type: Literal["post", "comment"]
+    target_id: int
+    reason_category: Optional[str] = None
+    reason_text: Optional[str] = None
+
+
+class ReportResult(BaseModel):
+    target_type: str
+    target_id: int
+    report_count: int  # 대상 누적 신고 수
+    hidden: bool  # 임계값 도달로 숨김 처리됨
+    duplicate: bool  # 이미 신고한 대상 (카운트 증가 없음)
+
+
+class ReportQueueItem(BaseModel):
+    target_type: str
+    target_id: int
+    report_count: int
+    first_reported_at: datetime
+    last_reported_at: datetime
+    hidden_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class ReportResolve(BaseModel):
+    restore: bool = False  # True 면 숨김 해제
+
+
+class SimilarProfile(BaseModel):
+    user_id: int
+    nickname: str
+    similarity: float  # 임베딩 코사인 유사도 (근사)
+
+
 # ============================================================
 # 3. 기관(학교)
 # ============================================================
@@ -149,5 +307,21 @@ class CommunityPostCreate(CommunityPostBase):
 class CommunityPost(CommunityPostBase):
     id: int
     author_user_id: int
+    status: str  # pending(심사 대기) / active / hidden
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ============================================================
+# 5. 앱 시작용 묶음 응답 (/users/me/bootstrap)
+# ============================================================
+
+
+class UserBootstrap(BaseModel):
+    user: User
+    profile: Optional[UserProfile] = None
+    school_anchors: List[UserSchoolAnchorDetail]
+    keywords: List[UserKeyword]
+    communities: List[Community]
 
     model_config = ConfigDict(from_attributes=True)
@@ -4,6 +4,9 @@ from jose import JWTError, jwt # '출입증(JWT)' 도구
 from dotenv import load_dotenv # '비밀 쪽지' 도구
 import os
 
+import metrics # argon2 구간 시간 계측
+import tracing # 해싱 / JWT 스팬
+
 load_dotenv()  # '.env' 파일에서 '비밀 쪽지'를 읽어오기
 
 SECRET_KEY = os.getenv("SECRET_KEY")
@@ -14,16 +17,21 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
 # 2. 비밀번호가 맞는지 확인하는 '확인기'
+@tracing.traced("security.argon2")
 def verify_password(plain_password, hashed_password):
     """손님이 입력한 '원본 비번'과 창고의 '암호화된 비번'을 비교합니다."""
-    return pwd_context.verify(plain_password, hashed_password)
+    with metrics.timed("argon2"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 # 3. 비밀번호를 암호화하는 '암호화기'
+@tracing.traced("security.argon2")
 def get_password_hash(password):
     """손님이 입력한 '원본 비번'을 '암호화된 비번'으로 바꿉니다."""
-    return pwd_context.hash(password)
+    with metrics.timed("argon2"):
+        return pwd_context.hash(password)
 
 # 4. '출입증(JWT)' 생성기
+@tracing.traced("security.jwt")
 def create_access_token(data: dict):
     """'출입증(JWT)'을 생성합니다."""
     
@@ -43,6 +51,7 @@ def create_access_token(data: dict):
     # 5. '암호화된 출입증'을 반환합니다.
     return encoded_jwt
 
+@tracing.traced("security.jwt")
 def verify_token(token: str, credentials_exception):
     """
     '출입증'이 위조되지 않았는지, 만료되진 않았는지 검사합니다.
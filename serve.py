@@ -0,0 +1,392 @@
+# path: serve.py
+"""
+운영용 멀티 워커 서버 (pre-fork).
+
+`uvicorn main:app --workers N` 은 워커마다 프로세스를 새로 띄워서 main.py 를 따로 import 하고
+(create_all 도 N 번), 자동완성 목록 같은 읽기 전용 데이터를 워커마다 한 벌씩 만든다.
+이 스크립트는 마스터가 한 번만 준비하고 fork 한다.
+
+1) 마스터 (fork 전)
+   - 공유 스냅샷(shared_snapshot) 빌드 → SNAPSHOT_DIR (기본 snapshots/)
+     학교 코드북 / 키워드 자동완성 / 금칙어 오토마톤 (build_snapshots.py 와 같은 함수)
+   - main.py import (create_all, 라우트 / 모듈 초기화) 와 스냅샷 열기를 한 번만
+     → 워커는 fork 로 물려받아 copy-on-write 로 같은 페이지를 쓴다.
+   - engine.dispose() 로 마스터 커넥션을 닫고 나서 fork (워커에 소켓을 물려주지 않는다)
+   - 리슨 소켓을 마스터가 열고 모든 워커가 같이 accept 한다.
+
+2) 워커 (fork 후)
+   - engine.dispose(close=False): 물려받은 풀을 버리고 워커 전용 풀로 새로 시작
+     (SQLAlchemy 권장 방식, recommendation_worker 와 같음)
+   - uvicorn.Server 로 서빙. SIGTERM 이면 받은 요청을 끝내고 종료한다.
+
+3) 갱신
+   - 스냅샷: --refresh-seconds 마다 DB 에서 다시 빌드, 금칙어 사전 파일이 바뀌면 오토마톤 재빌드.
+     내용이 같으면 파일을 건드리지 않고, 바뀌었으면 워커들이 mtime 을 보고 새 파일을 연다
+     (재시작 없음, 처리 중인 요청은 이전 판을 끝까지 쓴다).
+   - SIGHUP: 워커 순차 교체 (새 워커를 먼저 띄우고 이전 워커에 SIGTERM → 처리 중인 요청은 마저 끝남)
+   - 워커가 죽으면 다시 띄운다. SIGTERM / SIGINT: 전체 정상 종료.
+
+4) 메모리
+   - SIGUSR1 또는 --memory-interval 마다 워커별 RSS / PSS / USS 를 로그로 남긴다.
+     (PSS = 공유 페이지를 공유한 프로세스 수로 나눈 값. 워커 N 개 합계는 PSS 합으로 본다)
+   - 비교 측정: python -m benchmarks.bench_serve_memory
+
+사용법:
+    python serve.py --workers 4 --port 8000
+    python serve.py --workers 4 --no-snapshots     # 스냅샷 없이 (워커마다 메모리 / DB 조회)
+    kill -HUP <마스터 pid>                          # 워커 순차 교체
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Dict, Optional, Set
+
+import build_snapshots
+import institution_codebook
+import keyword_dictionary
+import moderation
+import shared_snapshot
+from database import engine
+
+logger = logging.getLogger("serve")
+
+# 시작 직후 죽는 워커를 계속 띄우지 않도록
+RESPAWN_BACKOFF_SECONDS = 1.0
+# 순차 교체 때 새 워커가 accept 를 시작할 시간
+ROLLING_START_SECONDS = 1.0
+
+# --refresh-seconds 마다 다시 빌드하는 스냅샷 (오토마톤은 사전 파일이 바뀔 때만)
+DB_SNAPSHOTS = (institution_codebook.SNAPSHOT_NAME, keyword_dictionary.SNAPSHOT_NAME)
+
+
+def refresh_snapshots(names=None) -> None:
+    try:
+        results = build_snapshots.build_all(shared_snapshot.SNAPSHOT_DIR, names)
+    except Exception:
+        logger.exception("[serve] 스냅샷 갱신 실패, 기존 판 유지")
+        return
+    finally:
+        engine.dispose()  # 마스터 커넥션은 다음 fork 에 물려주지 않는다
+    for name, (count, seconds) in results.items():
+        logger.info("[serve] 스냅샷 %s: %d개 (%.2fs)", name, count, seconds)
+
+
+# ============================================================
+# 1. 메모리 측정
+# ============================================================
+
+
+def process_memory(pid: int) -> Dict[str, int]:
+    """/proc/<pid>/smaps_rollup → rss / pss / uss / shared (KB)"""
+    fields: Dict[str, int] = {}
+    with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+    }
+
+
+def format_memory(memory: Dict[str, int]) -> str:
+    return " ".join(
+        f"{key.upper()} {value / 1024:.1f}MB" for key, value in memory.items()
+    )
+
+
+# ============================================================
+# 2. 워커
+# ============================================================
+
+
+def _run_worker(app, sock: socket.socket, args: argparse.Namespace) -> None:
+    import uvicorn
+
+    for sig in (signal.SIGHUP, signal.SIGUSR1, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    # fork 로 물려받은 커넥션 풀은 부모와 공유되면 안 된다 → 워커 전용 새 풀
+    engine.dispose(close=False)
+
+    config = uvicorn.Config(
+        app,
+        log_level=args.log_level,
+        access_log=False,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+# ============================================================
+# 3. 마스터
+# ============================================================
+
+
+class Master:
+    def __init__(self, app, sock: socket.socket, args: argparse.Namespace) -> None:
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.workers: Dict[int, float] = {}  # pid → 시작 시각
+        self.retiring: Set[int] = set()  # SIGTERM 을 보낸 이전 워커
+        self.stopping = False
+        self.reload_requested = False
+        self.report_requested = False
+        self._dictionary_mtime = self._moderation_dictionary_mtime()
+
+    # ---- 워커 관리 ----
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(self.app, self.sock, self.args)
+            except BaseException:
+                logger.exception("[serve] 워커 비정상 종료")
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers[pid] = time.monotonic()
+        logger.info("[serve] 워커 시작 pid=%d", pid)
+        return pid
+
+    def reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid in self.retiring:
+                self.retiring.discard(pid)
+                logger.info("[serve] 이전 워커 종료 pid=%d", pid)
+                continue
+            started = self.workers.pop(pid, None)
+            if started is None:
+                continue
+            logger.warning(
+                "[serve] 워커 종료 pid=%d (%s)", pid, _describe_status(status)
+            )
+            if not self.stopping:
+                if time.monotonic() - started < RESPAWN_BACKOFF_SECONDS:
+                    time.sleep(RESPAWN_BACKOFF_SECONDS)
+                self.spawn()
+
+    def rolling_restart(self) -> None:
+        """새 워커를 먼저 띄우고 이전 워커를 하나씩 정상 종료 (처리 용량 유지)"""
+        logger.info("[serve] 워커 순차 교체 %d개", len(self.workers))
+        for old_pid in list(self.workers):
+            self.spawn()
+            time.sleep(ROLLING_START_SECONDS)
+            self.workers.pop(old_pid, None)
+            self.retiring.add(old_pid)
+            _signal(old_pid, signal.SIGTERM)
+            self.reap()
+
+    def shutdown(self) -> None:
+        pids = set(self.workers) | self.retiring
+        logger.info("[serve] 종료: 워커 %d개에 SIGTERM", len(pids))
+        for pid in pids:
+            _signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.args.graceful_timeout + 5
+        while pids and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                pids.discard(pid)
+            else:
+                time.sleep(0.1)
+        for pid in pids:
+            logger.warning("[serve] 제한 시간 초과, SIGKILL pid=%d", pid)
+            _signal(pid, signal.SIGKILL)
+
+    # ---- 스냅샷 갱신 ----
+
+    @staticmethod
+    def _moderation_dictionary_mtime() -> Optional[float]:
+        try:
+            return os.stat(moderation.DICTIONARY_PATH).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def refresh_snapshots(self, names=DB_SNAPSHOTS) -> None:
+        refresh_snapshots(names)
+
+    def check_moderation_dictionary(self) -> None:
+        mtime = self._moderation_dictionary_mtime()
+        if mtime is not None and mtime != self._dictionary_mtime:
+            self._dictionary_mtime = mtime
+            self.refresh_snapshots([moderation.SNAPSHOT_NAME])
+
+    # ---- 메모리 ----
+
+    def report_memory(self) -> None:
+        total = {"rss": 0, "pss": 0, "uss": 0, "shared": 0}
+        for pid in sorted(self.workers):
+            try:
+                memory = process_memory(pid)
+            except FileNotFoundError:
+                continue
+            for key, value in memory.items():
+                total[key] += value
+            logger.info("[serve] 워커 pid=%d %s", pid, format_memory(memory))
+        logger.info(
+            "[serve] 마스터 %s / 워커 %d개 합계 %s",
+            format_memory(process_memory(os.getpid())),
+            len(self.workers),
+            format_memory(total),
+        )
+
+    # ---- 메인 루프 ----
+
+    def _on_signal(self, signum, frame) -> None:
+        if signum in (signal.SIGTERM, signal.SIGINT):
+            self.stopping = True
+        elif signum == signal.SIGHUP:
+            self.reload_requested = True
+        elif signum == signal.SIGUSR1:
+            self.report_requested = True
+
+    def run(self) -> None:
+        for sig in (
+            signal.SIGTERM,
+            signal.SIGINT,
+            signal.SIGHUP,
+            signal.SIGUSR1,
+            signal.SIGCHLD,
+        ):
+            signal.signal(sig, self._on_signal)
+
+        for _ in range(self.args.workers):
+            self.spawn()
+
+        now = time.monotonic()
+        next_refresh = now + self.args.refresh_seconds
+        next_report = now + self.args.memory_interval
+        snapshots = shared_snapshot.SNAPSHOT_DIR is not None
+        while not self.stopping:
+            self.reap()
+            now = time.monotonic()
+            if self.reload_requested:
+                self.reload_requested = False
+                self.rolling_restart()
+            if snapshots and self.args.refresh_seconds and now >= next_refresh:
+                next_refresh = now + self.args.refresh_seconds
+                self.refresh_snapshots(
+                    [
+                        n
+                        for n in build_snapshots.SNAPSHOTS
+                        if n != "moderation_automaton"
+                    ]
+                )
+            if snapshots:
+                self.check_moderation_dictionary()
+            if self.report_requested or (
+                self.args.memory_interval and now >= next_report
+            ):
+                self.report_requested = False
+                next_report = now + self.args.memory_interval
+                self.report_memory()
+            time.sleep(0.5)  # 시그널이 오면 바로 깬다
+        self.shutdown()
+
+
+def _signal(pid: int, sig: int) -> None:
+    try:
+        os.kill(pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+def _describe_status(status: int) -> str:
+    if os.WIFSIGNALED(status):
+        return f"signal {os.WTERMSIG(status)}"
+    return f"exit {os.waitstatus_to_exitcode(status)}"
+
+
+# ============================================================
+# 4. 실행
+# ============================================================
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="pre-fork 멀티 워커 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "0")) or None
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        default=shared_snapshot.SNAPSHOT_DIR or build_snapshots.DEFAULT_DIR,
+    )
+    parser.add_argument(
+        "--no-snapshots", action="store_true", help="공유 스냅샷 없이 (기존 방식)"
+    )
+    parser.add_argument(
+        "--refresh-seconds",
+        type=float,
+        default=300.0,
+        help="DB 스냅샷(코드북 / 자동완성) 재빌드 주기, 0 이면 끔",
+    )
+    parser.add_argument("--graceful-timeout", type=int, default=30)
+    parser.add_argument(
+        "--memory-interval",
+        type=float,
+        default=0.0,
+        help="워커 메모리 로그 주기(초), 0 이면 SIGUSR1 때만",
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+    args.workers = args.workers or os.cpu_count() or 1
+
+    logging.basicConfig(
+        level=args.log_level.upper(),
+        format="%(asctime)s %(levelname)s [%(process)d] %(message)s",
+    )
+
+    # 1) 스냅샷 (워커는 fork 로 설정과 열린 매핑을 물려받는다)
+    if args.no_snapshots:
+        shared_snapshot.SNAPSHOT_DIR = None
+    else:
+        shared_snapshot.SNAPSHOT_DIR = args.snapshot_dir
+        os.environ["SNAPSHOT_DIR"] = args.snapshot_dir
+
+    # 2) 앱 미리 로드 (create_all / 모듈 초기화를 마스터에서 한 번) → 스냅샷 빌드 / 열기
+    app = importlib.import_module("main").app
+    if not args.no_snapshots:
+        refresh_snapshots()
+        institution_codebook.get_codebook()
+        keyword_dictionary.get_autocomplete_snapshot()
+    moderation.moderation_engine.automaton  # 스냅샷 또는 사전 파일로 한 번 빌드
+    engine.dispose()
+
+    # 3) 리슨 소켓 → fork
+    sock = socket.create_server((args.host, args.port), backlog=2048)
+    sock.set_inheritable(True)
+    logger.info(
+        "[serve] http://%s:%d 워커 %d개 (스냅샷 %s)",
+        args.host,
+        args.port,
+        args.workers,
+        shared_snapshot.SNAPSHOT_DIR or "끔",
+    )
+    Master(app, sock, args).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# path: shared_snapshot.py
+"""
+읽기 전용 데이터의 공유 스냅샷 파일 (여러 워커 프로세스가 한 벌을 같이 쓴다).
+
+1) 포맷 (embedding_index 스냅샷과 같은 구조)
+   - magic(8바이트) + 헤더 길이 + 헤더(JSON) + 64바이트 정렬된 배열들
+   - 헤더: 배열별 dtype / shape / offset + "meta" (작은 값: 코드표, 빌드 시각 등)
+   - 문자열 목록은 UTF-8 바이트를 이어 붙인 blob(uint8) + 시작 위치 offsets(int64, N+1)
+
+2) 읽기
+   - 파일 전체를 mmap(ACCESS_READ) 하고 배열은 그 위의 np.frombuffer view 로 만든다.
+     → 페이지는 OS 페이지 캐시에 한 벌만 있고 같은 서버의 모든 워커가 공유한다
+       (워커 수만큼 파이썬 객체를 만들지 않는다).
+   - 새 파일은 임시 파일에 쓴 뒤 os.replace 로 원자적으로 교체한다.
+     SnapshotHandle 이 mtime 변경을 보고 다시 연다 (재시작 불필요).
+     이미 연 매핑은 이전 inode 를 계속 가리키므로 검색 중인 요청은 끝까지 이전 판을 본다.
+
+3) 켜기
+   - SNAPSHOT_DIR 이 설정돼 있을 때만 쓴다 (serve.py 가 기본으로 켠다).
+     비어 있으면 각 모듈은 기존 방식(DB 조회 / 프로세스 안 사전)으로 동작한다.
+"""
+
+from __future__ import annotations
+
+import filecmp
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from typing import Callable, Dict, Generic, Iterable, Optional, Tuple, TypeVar
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR") or None
+
+# 파일 변경 확인 주기 (요청마다 stat 하지 않도록)
+RELOAD_CHECK_SECONDS = 2.0
+
+_ALIGN = 64
+
+T = TypeVar("T")
+
+
+def snapshot_path(name: str) -> Optional[str]:
+    """SNAPSHOT_DIR 아래 스냅샷 경로. 스냅샷을 쓰지 않으면 None"""
+    if not SNAPSHOT_DIR:
+        return None
+    return os.path.join(SNAPSHOT_DIR, f"{name}.snapshot")
+
+
+# ============================================================
+# 1. 쓰기
+# ============================================================
+
+
+def encode_strings(values: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """문자열 목록 → (UTF-8 blob uint8, offsets int64 N+1)"""
+    encoded = [value.encode() for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded], dtype=np.int64)
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return blob, offsets
+
+
+def write(
+    path: str, magic: bytes, arrays: Dict[str, np.ndarray], meta: Optional[dict] = None
+) -> bool:
+    """배열들을 스냅샷 파일로 쓴다. 기존 파일과 내용이 같으면 교체하지 않고 False"""
+    header = {"meta": meta or {}, "arrays": {}}
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset += -(-array.nbytes // _ALIGN) * _ALIGN
+    header_bytes = json.dumps(header, ensure_ascii=False).encode()
+    data_start = -(-(len(magic) + 8 + len(header_bytes)) // _ALIGN) * _ALIGN
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(magic)
+        f.write(len(header_bytes).to_bytes(8, "little"))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + header["arrays"][name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(data_start + offset)
+    # 내용이 같으면 mtime 을 건드리지 않는다 (워커들이 괜히 다시 열지 않도록)
+    if os.path.exists(path) and filecmp.cmp(tmp_path, path, shallow=False):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+
+# ============================================================
+# 2. 읽기
+# ============================================================
+
+
+class Snapshot:
+    def __init__(self, path: str, magic: bytes) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(magic)) != magic:
+                raise ValueError(f"스냅샷 형식이 다릅니다 ({magic!r}): {path}")
+            header_len = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(header_len))
+            self.mtime = os.fstat(f.fileno()).st_mtime
+            # 파일 전체를 읽기 전용 공유 매핑 하나로 (배열들은 이 위의 view)
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data_start = -(-(len(magic) + 8 + header_len) // _ALIGN) * _ALIGN
+
+        self.meta: dict = header["meta"]
+        self.arrays: Dict[str, np.ndarray] = {}
+        self.ranges: Dict[str, Tuple[int, int]] = {}
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            shape = tuple(spec["shape"])
+            start = data_start + spec["offset"]
+            count = int(np.prod(shape))
+            self.ranges[name] = (start, start + count * dtype.itemsize)
+            if count == 0:
+                self.arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+            self.arrays[name] = np.frombuffer(
+                self.mmap, dtype=dtype, count=count, offset=start
+            ).reshape(shape)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def view(self, name: str) -> memoryview:
+        """
+        1차원 정수 배열 → 네이티브 memoryview.
+        원소 하나씩 읽을 때 numpy 스칼라보다 훨씬 싸다 (bisect 에도 그대로 쓸 수 있다).
+        """
+        array = self.arrays[name]
+        return memoryview(array).cast("B").cast(array.dtype.char)
+
+    def find(self, name: str, needle: bytes, start: int = 0) -> int:
+        """바이트 배열 name 안의 needle 위치 (없으면 -1). 복사 없이 mmap 위에서 찾는다"""
+        begin, end = self.ranges[name]
+        position = self.mmap.find(needle, begin + start, end)
+        return position - begin if position != -1 else -1
+
+    def strings(self, name: str) -> "StringColumn":
+        return StringColumn(self.arrays[f"{name}_blob"], self.view(f"{name}_offsets"))
+
+
+class StringColumn:
+    """blob + offsets 문자열 목록. 인덱스로 꺼낼 때만 디코딩한다 (bisect 가능)"""
+
+    def __init__(self, blob: np.ndarray, offsets: memoryview) -> None:
+        self.blob = memoryview(blob)
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return bytes(self.blob[self.offsets[index] : self.offsets[index + 1]]).decode()
+
+
+class SnapshotHandle(Generic[T]):
+    """
+    스냅샷 파일 → 로더 객체. 파일 mtime 이 바뀌면 (RELOAD_CHECK_SECONDS 간격으로 확인)
+    새로 연다. 파일이 없거나 깨져 있으면 None / 기존 객체.
+    """
+
+    def __init__(self, name: str, loader: Callable[[str], T]) -> None:
+        self.name = name
+        self.loader = loader
+        self._value: Optional[T] = None
+        self._path: Optional[str] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[T]:
+        path = snapshot_path(self.name)
+        if path is None:
+            return None
+        now = time.monotonic()
+        if path != self._path or now - self._checked_at >= RELOAD_CHECK_SECONDS:
+            self._checked_at = now
+            self._reload_if_changed(path)
+        return self._value if path == self._path else None
+
+    def _reload_if_changed(self, path: str) -> None:
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return
+        if path == self._path and mtime == self._mtime:
+            return
+        with self._lock:
+            if path == self._path and mtime == self._mtime:
+                return
+            try:
+                value = self.loader(path)
+            except (OSError, ValueError):
+                logger.exception("[snapshot] %s 열기 실패, 기존 판 유지", path)
+                self._mtime = mtime
+                return
+            self._value, self._path, self._mtime = value, path, mtime
+        logger.info("[snapshot] %s 열기 (mtime %.0f)", path, mtime)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._value = self._path = self._mtime = None
+            self._checked_at = 0.0
@@ -0,0 +1,67 @@
+# path: text_normalize.py
+"""
+자유 입력 텍스트 → 비교용 정규화 키.
+
+- NFKC 정규화 (전각/반각, 호환 문자 통일) + casefold
+- 공백 / 기호 제거
+- 필드별로 의미 없는 접미사 제거 ("3반" == "3", "김철수 선생님" == "김철수")
+- 관심사 키워드는 normalize_keyword 를 쓴다 (기호가 뜻을 가르므로 지우지 않음)
+
+정규화 키는 DB 에 별도 컬럼으로 저장해서 LIKE 없이 등호(인덱스 seek)로 비교한다.
+"""
+
+import re
+import unicodedata
+from typing import Optional
+
+_NON_WORD = re.compile(r"[\W_]+")
+_WHITESPACE = re.compile(r"\s+")
+_GRADE_PREFIX = re.compile(r"^\d+학년")
+_CLASS_SUFFIX = re.compile(r"반$")
+_TEACHER_SUFFIX = re.compile(r"(선생님|선생|쌤|교사)$")
+_CLUB_SUFFIX = re.compile(r"(동아리|클럽)$")
+
+
+def normalize_key(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    key = _NON_WORD.sub("", unicodedata.normalize("NFKC", value).casefold())
+    return key or None
+
+
+def normalize_keyword(value: Optional[str]) -> Optional[str]:
+    """
+    관심사 키워드용: NFKC + casefold + 공백 정리(앞뒤 제거, 연속 공백은 하나로)만.
+    기호는 남긴다 — 'C++' / 'C#' / 'C', 'R&B' / 'RB', '.NET' / 'NET' 은 다른 키워드.
+    ('Ｃ＋＋' == 'c++', '  힙합   댄스 ' == '힙합 댄스')
+    """
+    if not value:
+        return None
+    key = unicodedata.normalize("NFKC", value).casefold()
+    key = _WHITESPACE.sub(" ", key).strip()
+    return key or None
+
+
+def normalize_class_group(value: Optional[str]) -> Optional[str]:
+    """'3학년 2반', '2 반', '２반' → '2'"""
+    key = normalize_key(value)
+    if key is None:
+        return None
+    key = _CLASS_SUFFIX.sub("", _GRADE_PREFIX.sub("", key))
+    return key or None
+
+
+def normalize_teacher(value: Optional[str]) -> Optional[str]:
+    """'김철수 선생님', '김철수쌤' → '김철수'"""
+    key = normalize_key(value)
+    if key is None:
+        return None
+    return _TEACHER_SUFFIX.sub("", key) or None
+
+
+def normalize_club(value: Optional[str]) -> Optional[str]:
+    """'방송 동아리', '방송동아리' → '방송'"""
+    key = normalize_key(value)
+    if key is None:
+        return None
+    return _CLUB_SUFFIX.sub("", key) or None
@@ -0,0 +1,132 @@
+# path: trace_report.py
+"""
+tracing.JsonlTraceExporter 가 남긴 JSONL 로 라우트별 임계 경로(critical path)를 요약한다.
+
+- 트랜잭션(요청)마다 스팬 트리를 만들고, 끝에서부터 거슬러 올라가며
+  "이 스팬이 끝나야 부모가 끝날 수 있는" 자식들을 고른다.
+  (자식을 끝나는 시각 역순으로 보면서, 지금 커서보다 먼저 끝난 자식을 경로에 넣고
+   커서를 그 자식의 시작 시각으로 옮긴다)
+- 경로 위 스팬마다 자식에게 덮이지 않은 자기 시간(self)을 (op, 이름) 별로 더한다.
+  트랜잭션 자체의 self 는 스팬 밖 코드(직렬화, 프레임워크 등)로 '(요청 자체)' 에 쌓인다.
+- 라우트별로 요청 수, 지연 p50/p95, 임계 경로 항목별 요청당 평균 ms / 비율을 출력한다.
+  SQL 스팬 이름은 metrics.redact_sql 로 줄여서 묶는다.
+
+사용법:
+    python trace_report.py traces.jsonl
+    python trace_report.py traces.jsonl --route /users/me/bootstrap --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+import orjson
+
+from metrics import redact_sql
+
+SELF_NAME = "(요청 자체)"
+
+
+def load(path: str) -> Iterable[dict]:
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+def _span_key(span: dict) -> Tuple[str, str]:
+    op = span.get("op") or "?"
+    name = span.get("name") or op
+    if op == "db":
+        name = redact_sql(name)[:90]
+    return op, name
+
+
+def critical_path(trace: dict) -> Dict[Tuple[str, str], float]:
+    """트랜잭션 하나의 임계 경로 → {(op, 이름): self ms}"""
+    root = {
+        "id": trace["span_id"],
+        "start_ms": 0.0,
+        "duration_ms": trace["duration_ms"],
+    }
+    children: Dict[str, List[dict]] = defaultdict(list)
+    for span in trace["spans"]:
+        children[span["parent"]].append(span)
+
+    result: Dict[Tuple[str, str], float] = defaultdict(float)
+
+    def walk(span: dict, key: Tuple[str, str]) -> None:
+        start = span["start_ms"]
+        cursor = start + span["duration_ms"]
+        covered = 0.0
+        for child in sorted(
+            children.get(span["id"], ()),
+            key=lambda c: c["start_ms"] + c["duration_ms"],
+            reverse=True,
+        ):
+            child_start = max(child["start_ms"], start)
+            child_end = min(child["start_ms"] + child["duration_ms"], cursor)
+            if child_end <= child_start:
+                continue
+            walk(child, _span_key(child))
+            covered += child_end - child_start
+            cursor = child_start
+        result[key] += max(span["duration_ms"] - covered, 0.0)
+
+    walk(root, (trace.get("op") or "?", SELF_NAME))
+    return result
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+def summarize(traces: Iterable[dict], route: str | None = None) -> dict:
+    routes: Dict[str, dict] = {}
+    for trace in traces:
+        name = trace.get("name") or "?"
+        if route and name != route:
+            continue
+        entry = routes.setdefault(name, {"durations": [], "path": defaultdict(float)})
+        entry["durations"].append(trace["duration_ms"])
+        for key, ms in critical_path(trace).items():
+            entry["path"][key] += ms
+    return routes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="트레이스 JSONL 라우트별 임계 경로 요약"
+    )
+    parser.add_argument("path", nargs="?", default="traces.jsonl")
+    parser.add_argument("--route", help="이 라우트만 (예: /users/me/bootstrap)")
+    parser.add_argument("--top", type=int, default=8, help="라우트별 항목 수")
+    args = parser.parse_args()
+
+    routes = summarize(load(args.path), args.route)
+    if not routes:
+        print(f"[trace_report] {args.path}: 트랜잭션이 없습니다.")
+        return
+
+    ordered = sorted(routes.items(), key=lambda item: -sum(item[1]["durations"]))
+    for name, entry in ordered:
+        durations = entry["durations"]
+        count = len(durations)
+        total = sum(durations)
+        print(
+            f"{name}  요청 {count}건  p50 {_percentile(durations, 50):.1f}ms  "
+            f"p95 {_percentile(durations, 95):.1f}ms  평균 {total / count:.1f}ms"
+        )
+        path = sorted(entry["path"].items(), key=lambda item: -item[1])
+        for (op, span_name), ms in path[: args.top]:
+            print(f"  {ms / count:8.2f}ms {ms / total:6.1%}  {op:18s} {span_name}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
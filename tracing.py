@@ -0,0 +1,230 @@
+# path: tracing.py
+"""
+요청 수명 주기 트레이싱 (sentry-sdk).
+
+- init(): sentry_sdk 를 켠다. FastAPI/Starlette 요청마다 트랜잭션(이름 = 라우트 템플릿),
+  SQLAlchemy 통합이 SQL 실행마다 'db' 스팬을 만든다. (미들웨어 스팬은 끈다)
+- traced(op) 데코레이터 / span(op, name): 현재 트랜잭션이 샘플링된 경우에만 스팬을 연다.
+  샘플링 안 된 요청에서는 get_current_span() 확인 한 번으로 끝난다.
+- trace_functions(crud, op="crud"): 모듈의 공개 함수를 모두 스팬으로 감싼다.
+  (crud 안에서 서로 부르는 것도 모듈 전역 이름을 거치므로 중첩 스팬이 된다)
+- 샘플링: TRACES_SAMPLE_RATE (0 이면 꺼짐). /health*, /metrics 는 샘플링하지 않는다.
+- 내보내기: SENTRY_DSN 이 없으면 JsonlTraceExporter 가 트랜잭션 하나를 한 줄로
+  TRACES_EXPORT_PATH 에 붙여 쓴다. 외부 서비스 없이 trace_report.py 로 분석한다.
+  SQL 스팬 이름은 자리표시자만 있는 문장이고, 스팬 data(파라미터 등)는 쓰지 않는다.
+
+JSONL 한 줄:
+    {"trace_id", "name"(라우트), "op", "status", "start"(epoch 초), "duration_ms",
+     "spans": [{"id", "parent", "op", "name", "start_ms"(트랜잭션 시작 기준), "duration_ms"}]}
+
+환경 변수:
+    TRACES_SAMPLE_RATE=0       (0.0 ~ 1.0)
+    TRACES_EXPORT_PATH=traces.jsonl
+    SENTRY_DSN=                (있으면 파일 대신 Sentry 로 보낸다)
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import os
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+import orjson
+import sentry_sdk
+from sentry_sdk.transport import Transport
+
+SAMPLE_RATE = float(os.getenv("TRACES_SAMPLE_RATE", "0"))
+EXPORT_PATH = os.getenv("TRACES_EXPORT_PATH", "traces.jsonl")
+SENTRY_DSN = os.getenv("SENTRY_DSN") or None
+
+# 샘플링하지 않는 경로 (헬스체크 / 스크레이프)
+_UNSAMPLED_PREFIXES = ("/health", "/metrics")
+
+_initialized = False
+
+
+# ============================================================
+# JSONL 내보내기
+# ============================================================
+
+
+def _epoch(timestamp: str) -> float:
+    return datetime.fromisoformat(timestamp).timestamp()
+
+
+def transaction_record(event: dict) -> dict:
+    """sentry 트랜잭션 이벤트 → JSONL 한 줄 (스팬 data / 요청 정보는 버린다)"""
+    trace = event["contexts"]["trace"]
+    start = _epoch(event["start_timestamp"])
+    spans = [
+        {
+            "id": span["span_id"],
+            "parent": span.get("parent_span_id"),
+            "op": span.get("op"),
+            "name": span.get("description"),
+            "start_ms": round((_epoch(span["start_timestamp"]) - start) * 1000, 3),
+            "duration_ms": round(
+                (_epoch(span["timestamp"]) - _epoch(span["start_timestamp"])) * 1000, 3
+            ),
+        }
+        for span in event.get("spans", [])
+        if span.get("timestamp")
+    ]
+    return {
+        "trace_id": trace["trace_id"],
+        "span_id": trace["span_id"],
+        "name": event.get("transaction"),
+        "op": trace.get("op"),
+        "status": event.get("contexts", {}).get("response", {}).get("status_code"),
+        "start": start,
+        "duration_ms": round((_epoch(event["timestamp"]) - start) * 1000, 3),
+        "spans": spans,
+    }
+
+
+class JsonlTraceExporter(Transport):
+    """트랜잭션 이벤트만 골라 JSONL 파일에 한 줄씩 붙여 쓰는 sentry 전송기"""
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+
+    def capture_envelope(self, envelope) -> None:
+        lines = []
+        for item in envelope:
+            if item.type != "transaction":
+                continue
+            event = item.payload.json
+            if event:
+                lines.append(orjson.dumps(transaction_record(event)) + b"\n")
+        if lines:
+            with self._lock:
+                self._file.write(b"".join(lines))
+                self._file.flush()
+
+    def kill(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+# ============================================================
+# 초기화 / 샘플링
+# ============================================================
+
+
+def _sampler(sampling_context: dict) -> float:
+    scope = sampling_context.get("asgi_scope") or {}
+    if scope.get("path", "").startswith(_UNSAMPLED_PREFIXES):
+        return 0.0
+    parent_sampled = sampling_context.get("parent_sampled")
+    if parent_sampled is not None:
+        return float(parent_sampled)
+    return SAMPLE_RATE
+
+
+def init(
+    sample_rate: Optional[float] = None, export_path: Optional[str] = None
+) -> bool:
+    """FastAPI 앱을 만들기 전에 부른다. 샘플링 비율이 0 이면 아무것도 하지 않는다."""
+    global SAMPLE_RATE, _initialized
+    if sample_rate is not None:
+        SAMPLE_RATE = sample_rate
+    if _initialized or SAMPLE_RATE <= 0:
+        return _initialized
+
+    from sentry_sdk.integrations.fastapi import FastApiIntegration
+    from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+    from sentry_sdk.integrations.starlette import StarletteIntegration
+
+    options: dict[str, Any] = {}
+    if SENTRY_DSN and export_path is None:
+        options["dsn"] = SENTRY_DSN
+    else:
+        options["transport"] = JsonlTraceExporter(export_path or EXPORT_PATH)
+
+    sentry_sdk.init(
+        traces_sampler=_sampler,
+        send_default_pii=False,
+        integrations=[
+            StarletteIntegration(transaction_style="url", middleware_spans=False),
+            FastApiIntegration(transaction_style="url", middleware_spans=False),
+            SqlalchemyIntegration(),
+        ],
+        **options,
+    )
+    _initialized = True
+    return True
+
+
+def enabled() -> bool:
+    return _initialized
+
+
+# ============================================================
+# 스팬
+# ============================================================
+
+
+def _sampled_parent():
+    if not _initialized:
+        return None
+    parent = sentry_sdk.get_current_span()
+    if parent is None or not parent.sampled:
+        return None
+    return parent
+
+
+def span(op: str, name: Optional[str] = None):
+    """with span("auth", "get_current_user"): ... (샘플링 안 된 요청이면 nullcontext)"""
+    parent = _sampled_parent()
+    if parent is None:
+        return nullcontext()
+    return parent.start_child(op=op, name=name or op)
+
+
+def traced(op: str, name: Optional[str] = None) -> Callable:
+    """함수 호출 하나를 스팬으로 감싸는 데코레이터 (FastAPI 의존성 시그니처는 그대로 보인다)"""
+
+    def decorate(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parent = _sampled_parent()
+            if parent is None:
+                return func(*args, **kwargs)
+            with parent.start_child(op=op, name=span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def trace_functions(module, op: str) -> int:
+    """module 에 정의된 공개 함수를 traced(op) 로 바꿔 끼운다. 반환값: 감싼 함수 수"""
+    wrapped = 0
+    for attr, value in list(vars(module).items()):
+        if (
+            attr.startswith("_")
+            or not inspect.isfunction(value)
+            or value.__module__ != module.__name__
+            or hasattr(value, "__wrapped__")
+        ):
+            continue
+        setattr(module, attr, traced(op)(value))
+        wrapped += 1
+    return wrapped
+
+
+def transaction(op: str, name: str):
+    """요청 밖 작업(워커 배치 등)을 트랜잭션으로 묶는다"""
+    if not _initialized:
+        return nullcontext()
+    return sentry_sdk.start_transaction(op=op, name=name)
@@ -0,0 +1,242 @@
+# path: verdict_cache.py
+"""
+게시글 심사 결과(verdict) 캐시.
+
+- 1단계 키: 원문 그대로의 blake2b 해시. 똑같은 글이면 정규화 없이 바로 찾는다.
+- 2단계 키: moderation.normalize 로 정규화한 단위열의 blake2b 해시
+  → 공백/기호/반복/전각만 다른 복사글은 같은 키가 된다.
+  2단계에서 찾거나 새로 넣은 글은 원문 해시도 같은 항목을 가리키게 해 둔다.
+- 크기 제한 LRU + TTL.
+- version (선택): 판정을 만든 사전/모델의 현재 판을 돌려주는 함수.
+  값이 바뀌면 (사전 교체) 캐시를 비워서, 교체 전 판정이 TTL 동안 남지 않게 한다.
+- 선택: MinHash 근사 중복 인덱스 (near_duplicates=True)
+  - 단위 3-gram 집합의 MinHash 서명(64개)을 만들고, 추정 자카드 유사도가
+    min_similarity 이상이면 같은 글로 본다.
+  - LSH: 서명을 4개씩 16구간으로 나눠 구간별 dict 에 넣고, 한 구간이라도 같은 글만 비교한다.
+    (자카드 0.7 이면 후보가 될 확률 약 99%, 0.3 이면 약 12%)
+  - 살짝 고친 글에 금칙어를 끼워 넣을 수 있으므로, 근사 중복은 '차단' 판정만 재사용한다.
+- hits / near_hits / misses 를 세고 hit_ratio 로 노출한다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+import moderation
+
+CACHE_MAX_ENTRIES = 100_000
+CACHE_TTL_SECONDS = 600.0
+
+NEAR_DUPLICATE_MIN_SIMILARITY = 0.7
+_NUM_PERM = 64
+_BANDS = 16
+_ROWS = _NUM_PERM // _BANDS
+_SEEDS = np.random.default_rng(20240601).integers(
+    1, 2**63, size=(_NUM_PERM, 1), dtype=np.uint64
+)
+
+# (정규화 해시, MinHash 서명 또는 None, 원문 해시)
+Fingerprint = Tuple[bytes, Optional[np.ndarray], bytes]
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 마무리 단계 (uint64 곱셈은 자리 넘침을 그대로 버린다)"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def minhash(units: List[int]) -> np.ndarray:
+    """단위 3-gram 집합의 MinHash 서명 (uint64 x _NUM_PERM)"""
+    u = np.asarray(units, dtype=np.uint64)
+    if len(u) >= 3:
+        shingles = (u[:-2] << np.uint64(42)) ^ (u[1:-1] << np.uint64(21)) ^ u[2:]
+    elif len(u):
+        shingles = u
+    else:
+        return np.zeros(_NUM_PERM, dtype=np.uint64)
+    return _mix64(np.unique(shingles)[None, :] ^ _SEEDS).min(axis=1)
+
+
+def _band_keys(signature: np.ndarray) -> List[bytes]:
+    return [
+        signature[band * _ROWS : (band + 1) * _ROWS].tobytes() for band in range(_BANDS)
+    ]
+
+
+class VerdictCache:
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+        near_duplicates: bool = False,
+        min_similarity: float = NEAR_DUPLICATE_MIN_SIMILARITY,
+        version: Optional[Callable[[], object]] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.near_duplicates = near_duplicates
+        self.min_similarity = min_similarity
+        self.version = version
+        self._version: object = None
+        self._lock = threading.Lock()
+        # 키 → (저장 시각, verdict, MinHash 서명)
+        self._entries: "OrderedDict[bytes, Tuple[float, Any, Optional[np.ndarray]]]" = (
+            OrderedDict()
+        )
+        # 원문 해시 → 키
+        self._raw: "OrderedDict[bytes, bytes]" = OrderedDict()
+        # 구간 번호별 {구간 값: 키 집합} (차단 판정만 넣는다)
+        self._bands: List[Dict[bytes, Set[bytes]]] = [{} for _ in range(_BANDS)]
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def raw_key(text: str) -> bytes:
+        return hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+
+    def fingerprint(self, text: str, raw: Optional[bytes] = None) -> Fingerprint:
+        units, _ = moderation.normalize(text)
+        key = hashlib.blake2b(
+            np.asarray(units, dtype=np.uint32).tobytes(), digest_size=16
+        ).digest()
+        return (
+            key,
+            minhash(units) if self.near_duplicates else None,
+            raw if raw is not None else self.raw_key(text),
+        )
+
+    def check_version(self) -> None:
+        """version() 이 바뀌었으면 (사전 교체) 캐시를 비운다"""
+        if self.version is None:
+            return
+        current = self.version()
+        if current is not self._version:
+            with self._lock:
+                self._clear_locked()
+                self._version = current
+
+    def lookup(self, text: str) -> Tuple[Optional[Any], Optional[Fingerprint]]:
+        """
+        원문 해시 → 정규화 키 순으로 찾는다.
+        반환값: (verdict 또는 None, 원문 해시로 찾았으면 None / 아니면 fingerprint)
+        """
+        raw = self.raw_key(text)
+        now = time.monotonic()
+        with self._lock:
+            key = self._raw.get(raw)
+            if key is not None:
+                entry = self._entries.get(key)
+                if entry is not None and now - entry[0] < self.ttl_seconds:
+                    self._raw.move_to_end(raw)
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], None
+                del self._raw[raw]
+
+        fingerprint = self.fingerprint(text, raw)
+        verdict = self.get(fingerprint)
+        if verdict is not None:
+            with self._lock:
+                if fingerprint[0] in self._entries:
+                    self._alias_locked(raw, fingerprint[0])
+        return verdict, fingerprint
+
+    def get(self, fingerprint: Fingerprint) -> Optional[Any]:
+        key, signature, _ = fingerprint
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self._remove_locked(key)
+
+            if signature is not None:
+                verdict = self._near_locked(signature, now)
+                if verdict is not None:
+                    self.near_hits += 1
+                    return verdict
+
+            self.misses += 1
+            return None
+
+    def _near_locked(self, signature: np.ndarray, now: float) -> Optional[Any]:
+        checked: Set[bytes] = set()
+        for band, value in enumerate(_band_keys(signature)):
+            for key in self._bands[band].get(value, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                stored_at, verdict, other = self._entries[key]
+                similarity = float(np.mean(signature == other))
+                if (
+                    now - stored_at < self.ttl_seconds
+                    and similarity >= self.min_similarity
+                ):
+                    return verdict
+        return None
+
+    def put(self, fingerprint: Fingerprint, verdict: Any) -> None:
+        key, signature, raw = fingerprint
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            # 근사 중복 인덱스에는 차단 판정만
+            if getattr(verdict, "is_safe", True):
+                signature = None
+            self._entries[key] = (time.monotonic(), verdict, signature)
+            if signature is not None:
+                for band, value in enumerate(_band_keys(signature)):
+                    self._bands[band].setdefault(value, set()).add(key)
+            self._alias_locked(raw, key)
+            while len(self._entries) > self.max_entries:
+                self._remove_locked(next(iter(self._entries)))
+
+    def _alias_locked(self, raw: bytes, key: bytes) -> None:
+        self._raw[raw] = key
+        self._raw.move_to_end(raw)
+        # 지워진 항목을 가리키는 원문 해시는 찾을 때 버리므로 개수만 맞춘다
+        while len(self._raw) > self.max_entries:
+            self._raw.popitem(last=False)
+
+    def _remove_locked(self, key: bytes) -> None:
+        _, _, signature = self._entries.pop(key)
+        if signature is None:
+            return
+        for band, value in enumerate(_band_keys(signature)):
+            keys = self._bands[band].get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._bands[band][value]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear_locked()
+
+    def _clear_locked(self) -> None:
+        self._entries.clear()
+        self._raw.clear()
+        self._bands = [{} for _ in range(_BANDS)]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.near_hits) / lookups if lookups else 0.0,
+        }